@@ -105,8 +105,16 @@ class SharedNumpyArrayHelper:
             shared_array[:] = data[:]
 
     def apply_local_data(self, data: np.ndarray, operation: Callable) -> None:
+        """Combines data into the shared array using operation
+
+        If operation is a numpy ufunc, such as np.add, the shared array is
+        updated in place without creating a temporary array.
+        """
         with self._lock:
             shared_array = self.get_shared_array()
+            if isinstance(operation, np.ufunc):
+                operation(shared_array, data, out=shared_array)
+                return
             temp = operation(shared_array, data)
             shared_array[:] = temp[:]
 
@@ -126,4 +134,4 @@ class SharedNumpyArrayHelper:
     def reset_value(self, fill_value) -> None:
         with self._lock:
             shared_array = self.get_shared_array()
-            shared_array[:] = np.full_like(shared_array, fill_value=fill_value)
+            shared_array.fill(fill_value)
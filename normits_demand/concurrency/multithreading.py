@@ -35,6 +35,10 @@ import tqdm
 from normits_demand.utils import general as du
 
 
+# How often blocking queue reads wake up to check for a stop event
+_STOP_CHECK_INTERVAL = 0.5
+
+
 class MultithreadingError(Exception):
     """
     Custom Error Wrapper to throw in this module
@@ -359,34 +363,24 @@ def get_data_from_queue(
         If total_timeout is exceeded while waiting to get data from q.
     """
     # Init
-    start_time = time.time()
-    got_data = False
-    data = copy.copy(default_return_val)
+    end_time = time.time() + total_timeout
 
     if stop_event is None:
         stop_event = threading.Event()
 
-    # Loop while waiting for data
-    while not got_data:
-        # Wait for a little bit to avoid intensive looping
-        time.sleep(0.01)
-
-        # If told to stop, just return what we have so far
-        if stop_event.is_set():
-            return data
-
-        # Check if we've ran out of time
-        if (time.time() - start_time) > total_timeout:
+    # Block on the queue, waking periodically to check the stop event
+    while not stop_event.is_set():
+        remaining = end_time - time.time()
+        if remaining <= 0:
             raise TimeoutError("Ran out of time while waiting to retrieve data from queue.")
 
-        # Try get the data, catch the error if not available
         try:
-            data = q.get_nowait()
-            got_data = True
+            return q.get(timeout=min(remaining, _STOP_CHECK_INTERVAL))
         except queue.Empty:
             pass
 
-    return data
+    # Told to stop before any data arrived
+    return copy.copy(default_return_val)
 
 
 def get_data_from_queue_list(
@@ -428,47 +422,29 @@ def get_data_from_queue_list(
         If total_timeout is exceeded while waiting to get data from q_list.
     """
     # Init
-    got_all_results = False
     results = [default_return_val] * len(q_list)
-    start_time = time.time()
+    end_time = time.time() + total_timeout
 
     if stop_event is None:
         stop_event = threading.Event()
 
-    # Add index to save original order
-    idx_qs = list(enumerate(q_list))
-
-    # Now try get all the results
-    while not got_all_results:
-        # Wait for a little bit to avoid intensive looping
-        time.sleep(0.05)
-
-        # If told to stop, just return what we have so far
-        if stop_event.is_set():
-            return results
+    # Block on each queue in turn. Total wait is bounded by the slowest queue
+    for idx, q in enumerate(q_list):
+        while True:
+            # If told to stop, just return what we have so far
+            if stop_event.is_set():
+                return results
 
-        # Check if we've ran out of time
-        if (time.time() - start_time) > total_timeout:
-            raise TimeoutError("Ran out of time while waiting for results.")
+            remaining = end_time - time.time()
+            if remaining <= 0:
+                raise TimeoutError("Ran out of time while waiting for results.")
 
-        # Check if any results are ready
-        done_threads = list()
-        for cur_idx, (orig_idx, q) in enumerate(idx_qs):
-            # Try get the data, catch the error if not available
             try:
-                results[orig_idx] = q.get_nowait()
-                done_threads.append(cur_idx)
+                results[idx] = q.get(timeout=min(remaining, _STOP_CHECK_INTERVAL))
+                break
             except queue.Empty:
                 pass
 
-        # Remove results we've got
-        for i in sorted(done_threads, reverse=True):
-            del idx_qs[i]
-
-        # Check if we have all results
-        if len(idx_qs) == 0:
-            got_all_results = True
-
     return results
 
 
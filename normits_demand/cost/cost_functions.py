@@ -16,8 +16,10 @@ import inspect
 
 from typing import Any
 from typing import Dict
+from typing import List
 from typing import Tuple
 from typing import Callable
+from typing import Optional
 
 # Third Party
 import numpy as np
@@ -34,16 +36,21 @@ class BuiltInCostFunction(enum.Enum):
     LOG_NORMAL = "log_normal"
 
     def get_cost_function(self):
+        batch_function = None
+        jacobian_function = None
 
         if self == BuiltInCostFunction.TANNER:
             params = {"alpha": [-5, 5], "beta": [-5, 5]}
             default = {"alpha": 1, "beta": 1}
             function = tanner
+            jacobian_function = tanner_jacobian
 
         elif self == BuiltInCostFunction.LOG_NORMAL:
             params = {"sigma": [0, 5], "mu": [0, 10]}
             default = {"sigma": 1, "mu": 2}
             function = log_normal
+            batch_function = log_normal_batch
+            jacobian_function = log_normal_jacobian
 
         else:
             raise nd.NormitsDemandError(
@@ -51,7 +58,12 @@ class BuiltInCostFunction(enum.Enum):
             )
 
         return CostFunction(
-            name=self.name, params=params, function=function, default_params=default,
+            name=self.name,
+            params=params,
+            function=function,
+            default_params=default,
+            batch_function=batch_function,
+            jacobian_function=jacobian_function,
         )
 
 
@@ -70,12 +82,17 @@ class CostFunction:
         params: Dict[str, Tuple[float, float]],
         function: Callable,
         default_params: Dict[str, float] = None,
+        batch_function: Optional[Callable] = None,
+        jacobian_function: Optional[Callable] = None,
     ):
         self.name = name
         self.function = function
+        self.batch_function = batch_function
+        self.jacobian_function = jacobian_function
 
         # Split params
         self.param_names = list(params.keys())
+        self.param_names_set = frozenset(self.param_names)
         self.param_min = {k: min(v) for k, v in params.items()}
         self.param_max = {k: max(v) for k, v in params.items()}
 
@@ -87,6 +104,12 @@ class CostFunction:
         self.kw_order = list(inspect.signature(self.function).parameters.keys())[1:]
         self.kw_order.remove("min_return_val")
 
+        # Functions that can write into a preallocated output array
+        self.function_takes_out = "out" in self.kw_order
+        if self.function_takes_out:
+            self.kw_order.remove("out")
+        self.kw_index = {name: i for i, name in enumerate(self.kw_order)}
+
         # Validate the params and cost function
         try:
             self.function(np.array(1e-2), **self.param_max)
@@ -138,7 +161,8 @@ class CostFunction:
             min_val = self.param_min[name]
             max_val = self.param_max[name]
 
-            if value < min_val or value > max_val:
+            # Written this way round so NaN values are also rejected
+            if not min_val <= value <= max_val:
                 raise ValueError(
                     "Parameter '%s' falls outside the acceptable range of "
                     "values. Value must be between %s and %s. Got %s."
@@ -148,7 +172,12 @@ class CostFunction:
             if value > self.param_max[name]:
                 raise ValueError()
 
-    def calculate(self, base_cost: np.ndarray, **kwargs) -> np.ndarray:
+    def calculate(
+        self,
+        base_cost: np.ndarray,
+        out: Optional[np.ndarray] = None,
+        **kwargs,
+    ) -> np.ndarray:
         """
         Calculates the actual cost using self.function
 
@@ -162,13 +191,20 @@ class CostFunction:
         base_cost:
             Array of the base costs.
 
+        out:
+            A float array, the same shape as `base_cost`, to write the
+            output into. If self.function accepts an `out` argument the
+            output is calculated directly into it, otherwise the output
+            is copied into it. If left as None, a new array is returned.
+
         kwargs:
         Parameters of the cost function to pass to self.function.
 
         Returns
         -------
         costs:
-            Output from self.function, same shape as `base_cost`.
+            Output from self.function, same shape as `base_cost`. This is
+            `out`, if given.
 
         Raises
         ------
@@ -177,11 +213,169 @@ class CostFunction:
             for this class.
         """
         self.validate_params(kwargs)
-        return self.function(base_cost, **kwargs)
+        if out is None:
+            return self.function(base_cost, **kwargs)
+        if self.function_takes_out:
+            return self.function(base_cost, out=out, **kwargs)
+        np.copyto(out, self.function(base_cost, **kwargs))
+        return out
+
+    def calculate_symmetric(
+        self,
+        base_cost: np.ndarray,
+        out: Optional[np.ndarray] = None,
+        block_size: int = 256,
+        **kwargs,
+    ) -> np.ndarray:
+        """
+        Calculates the actual cost of a symmetric base_cost matrix
+
+        Gives the same results as `self.calculate()` when `base_cost` is
+        symmetric. The cost function is only called on the blocks on and
+        above the diagonal, and the transpose of those outputs is copied
+        below the diagonal. This roughly halves the cost function work.
+        `base_cost` is not checked for symmetry. If it is not symmetric,
+        the output below the diagonal will be wrong.
+
+        Parameters
+        ----------
+        base_cost:
+            A square, symmetric array of the base costs.
+
+        out:
+            A float array, the same shape as `base_cost`, to write the
+            output into. If left as None, a new array is returned.
+
+        block_size:
+            The number of rows in each block passed to self.function.
+
+        kwargs:
+        Parameters of the cost function to pass to self.function.
+
+        Returns
+        -------
+        costs:
+            Output from self.function, same shape as `base_cost`. This is
+            `out`, if given.
+
+        Raises
+        ------
+        ValueError:
+            If `base_cost` is not a square matrix, or if the given cost
+            function params are outside the min/max range for this class.
+        """
+        if base_cost.ndim != 2 or base_cost.shape[0] != base_cost.shape[1]:
+            raise ValueError(
+                "base_cost must be a square matrix to be symmetric. Got "
+                "shape %s." % str(base_cost.shape)
+            )
+
+        self.validate_params(kwargs)
+        if out is None:
+            out = np.empty(base_cost.shape, dtype=float)
+
+        n_rows = base_cost.shape[0]
+        for start in range(0, n_rows, block_size):
+            end = start + block_size
+            if self.function_takes_out:
+                self.function(base_cost[start:end, start:], out=out[start:end, start:], **kwargs)
+            else:
+                out[start:end, start:] = self.function(base_cost[start:end, start:], **kwargs)
+
+            # Everything left of this block's diagonal has been done already
+            out[end:, start:end] = out[start:end, end:].T
+
+        return out
+
+    def calculate_batch(
+        self,
+        base_cost: np.ndarray,
+        params_list: List[Dict[str, Any]],
+    ) -> List[np.ndarray]:
+        """
+        Calculates the actual cost for multiple sets of cost function params
+
+        Gives the same results as calling `self.calculate()` once for each
+        set of params. If a `batch_function` was given when creating this
+        object, it is used to share any work that does not depend on the
+        params between each set of params.
+
+        Parameters
+        ----------
+        base_cost:
+            Array of the base costs.
+
+        params_list:
+            A list of cost function parameter dictionaries. Each should be
+            in the same format as the kwargs passed to `self.calculate()`.
+
+        Returns
+        -------
+        costs:
+            A list of outputs from self.function, one for each set of params
+            in `params_list`, in the same order. Each is the same shape
+            as `base_cost`.
+
+        Raises
+        ------
+        ValueError:
+            If any of the given cost function params are outside the
+            min/max range for this class.
+        """
+        for kwargs in params_list:
+            self.validate_params(kwargs)
+
+        if self.batch_function is None:
+            return [self.function(base_cost, **kwargs) for kwargs in params_list]
+        return self.batch_function(base_cost, params_list)
+
+    def calculate_jacobian(self, base_cost: np.ndarray, **kwargs) -> Dict[str, np.ndarray]:
+        """
+        Calculates the partial derivatives of self.function for each param
+
+        Uses the `jacobian_function` given when creating this object.
+        Before calling it, the given cost function params will be checked
+        that they are within the min and max values passed in when
+        creating the object.
+
+        Parameters
+        ----------
+        base_cost:
+            Array of the base costs.
+
+        kwargs:
+        Parameters of the cost function to pass to self.jacobian_function.
+
+        Returns
+        -------
+        derivatives:
+            A dictionary of {param_name: derivative}. Each derivative is
+            the partial derivative of the output of `self.function` with
+            respect to param_name, and is the same shape as `base_cost`.
+
+        Raises
+        ------
+        ValueError:
+            If no `jacobian_function` has been defined for this object, or
+            if the given cost function params are outside the min/max range
+            for this class.
+        """
+        if self.jacobian_function is None:
+            raise ValueError(
+                "No jacobian_function has been defined for CostFunction %s"
+                % self.name
+            )
+
+        self.validate_params(kwargs)
+        return self.jacobian_function(base_cost, **kwargs)
 
 
 def tanner(
-    base_cost: np.ndarray, alpha: float, beta: float, min_return_val: float = 1e-150,
+    base_cost: np.ndarray,
+    alpha: float,
+    beta: float,
+    min_return_val: float = 1e-150,
+    out: Optional[np.ndarray] = None,
 ) -> np.ndarray:
     r"""Implementation of the tanner cost function.
 
@@ -197,6 +391,10 @@ def tanner(
         The minimum value allowed in the return. Avoid return arrays with values
         such as 1e-300 which lead to overflow errors when divisions are made.
 
+    out: np.ndarray, optional
+        A float array, the same shape as `base_cost`, to write the output
+        into. If left as None, a new array is allocated.
+
     Returns
     -------
     tanner_costs:
@@ -215,19 +413,80 @@ def tanner(
     """
     math_utils.check_numeric({"alpha": alpha, "beta": beta})
 
+    if out is None:
+        out = np.zeros_like(base_cost, dtype=float)
+    else:
+        out.fill(0)
+
     # Don't do 0 to the power in case alpha is negative
     # 0^x where x is anything (other than 0) is always 0
-    power = np.float_power(
-        base_cost, alpha, out=np.zeros_like(base_cost, dtype=float), where=base_cost != 0,
-    )
-    exp = np.exp(beta * base_cost)
+    power = np.float_power(base_cost, alpha, out=out, where=base_cost != 0)
+    exp = np.asarray(np.multiply(beta, base_cost, dtype=float))
+    np.exp(exp, out=exp)
+    np.multiply(power, exp, out=power)
 
-    # Clip the min values to the min_val
-    return math_utils.clip_small_non_zero(power * exp, min_return_val)
+    # Clip the min values to the min_val, in place to avoid allocating
+    # another cost sized array
+    np.copyto(power, min_return_val, where=(power < min_return_val) & (power > 0))
+    return power
+
+
+def tanner_jacobian(
+    base_cost: np.ndarray, alpha: float, beta: float, min_return_val: float = 1e-150,
+) -> Dict[str, np.ndarray]:
+    r"""Partial derivatives of the tanner cost function.
+
+    Parameters
+    ----------
+    base_cost : np.ndarray
+        Array of the base costs.
+
+    alpha, beta : float
+        Parameters of the tanner cost function, see `tanner()`.
+
+    min_return_val: float
+        The minimum value allowed in the return of `tanner()`. Cells
+        clipped to this value have a derivative of 0.
+
+    Returns
+    -------
+    tanner_derivatives:
+        A dictionary with keys "alpha" and "beta". Each value is the partial
+        derivative of `tanner()` with respect to that parameter, same shape
+        as `base_cost`.
+
+    Notes
+    -----
+    Formulas used for this function are:
+
+    .. math::
+
+        \frac{\partial f}{\partial \alpha} = f(C_{ij}) \cdot \ln C_{ij}
+
+        \frac{\partial f}{\partial \beta} = f(C_{ij}) \cdot C_{ij}
+
+    See Also
+    --------
+    `tanner()`
+    """
+    costs = tanner(base_cost, alpha, beta, min_return_val)
+    clipped = costs <= min_return_val
+
+    log_cost = np.log(base_cost, where=base_cost != 0, out=np.zeros_like(base_cost, dtype=float))
+    d_alpha = np.multiply(costs, log_cost, out=log_cost)
+    d_alpha[clipped] = 0
+    d_beta = np.multiply(costs, base_cost, dtype=float)
+    d_beta[clipped] = 0
+
+    return {"alpha": d_alpha, "beta": d_beta}
 
 
 def log_normal(
-    base_cost: np.ndarray, sigma: float, mu: float, min_return_val: float = 1e-150,
+    base_cost: np.ndarray,
+    sigma: float,
+    mu: float,
+    min_return_val: float = 1e-150,
+    out: Optional[np.ndarray] = None,
 ) -> np.ndarray:
     r"""Implementation of the log normal cost function.
 
@@ -244,6 +503,10 @@ def log_normal(
         The minimum value allowed in the return. Avoid return arrays with values
         such as 1e-300 which lead to overflow errors when divisions are made.
 
+    out: np.ndarray, optional
+        A float array, the same shape as `base_cost`, to write the output
+        into. If left as None, a new array is allocated.
+
     Returns
     -------
     log_normal_costs:
@@ -263,22 +526,144 @@ def log_normal(
     - :math:`C_{ij}`: cost from i to j.
     - :math:`\sigma, \mu`: calibration parameters.
     """
+    # We need to be careful to avoid 0 in costs
+    log_cost = np.log(base_cost, where=base_cost != 0, out=np.zeros_like(base_cost).astype(float),)
+    return _log_normal_from_log(base_cost, log_cost, sigma, mu, min_return_val, out=out)
+
+
+def log_normal_batch(
+    base_cost: np.ndarray,
+    params_list: List[Dict[str, float]],
+    min_return_val: float = 1e-150,
+) -> List[np.ndarray]:
+    """Calculates the log normal cost function for multiple sets of params
+
+    The log of `base_cost` is calculated once and shared between each set
+    of params. Results are identical to calling `log_normal()` for each.
+
+    Parameters
+    ----------
+    base_cost : np.ndarray
+        Array of the base costs.
+
+    params_list : List[Dict[str, float]]
+        A list of dictionaries containing the `sigma` and `mu` params of the
+        log normal cost function.
+
+    min_return_val: float
+        The minimum value allowed in the return. Avoid return arrays with values
+        such as 1e-300 which lead to overflow errors when divisions are made.
+
+    Returns
+    -------
+    log_normal_costs:
+        A list of outputs from the log normal equation, one for each set of
+        params in `params_list`. Each is the same shape as `base_cost`.
+
+    See Also
+    --------
+    `log_normal()`
+    """
+    log_cost = np.log(base_cost, where=base_cost != 0, out=np.zeros_like(base_cost).astype(float),)
+    return [
+        _log_normal_from_log(base_cost, log_cost, min_return_val=min_return_val, **params)
+        for params in params_list
+    ]
+
+
+def log_normal_jacobian(
+    base_cost: np.ndarray, sigma: float, mu: float, min_return_val: float = 1e-150,
+) -> Dict[str, np.ndarray]:
+    r"""Partial derivatives of the log normal cost function.
+
+    Parameters
+    ----------
+    base_cost : np.ndarray
+        Array of the base costs.
+
+    sigma, mu : float
+        Parameters of the log normal cost function, see `log_normal()`.
+
+    min_return_val: float
+        The minimum value allowed in the return of `log_normal()`. Cells
+        clipped to this value have a derivative of 0.
+
+    Returns
+    -------
+    log_normal_derivatives:
+        A dictionary with keys "sigma" and "mu". Each value is the partial
+        derivative of `log_normal()` with respect to that parameter, same
+        shape as `base_cost`.
+
+    Notes
+    -----
+    Formulas used for this function are:
+
+    .. math::
+
+        \frac{\partial f}{\partial \sigma} = f(C_{ij}) \cdot
+        \left(\frac{(\ln C_{ij}-\mu)^2}{\sigma^3} - \frac{1}{\sigma}\right)
+
+        \frac{\partial f}{\partial \mu} = f(C_{ij}) \cdot
+        \frac{\ln C_{ij}-\mu}{\sigma^2}
+
+    See Also
+    --------
+    `log_normal()`
+    """
+    log_cost = np.log(base_cost, where=base_cost != 0, out=np.zeros_like(base_cost).astype(float),)
+    costs = _log_normal_from_log(base_cost, log_cost, sigma, mu, min_return_val)
+    clipped = costs <= min_return_val
+    sigma = float(sigma)
+    mu = float(mu)
+
+    # log_cost is no longer needed, reuse it for the log difference
+    log_diff = np.subtract(log_cost, mu, out=log_cost)
+    d_mu = log_diff * costs
+    d_mu /= sigma ** 2
+
+    d_sigma = np.square(log_diff, out=log_diff)
+    d_sigma /= sigma ** 3
+    d_sigma -= 1 / sigma
+    d_sigma *= costs
+
+    d_mu[clipped] = 0
+    d_sigma[clipped] = 0
+    return {"sigma": d_sigma, "mu": d_mu}
+
+
+def _log_normal_from_log(
+    base_cost: np.ndarray,
+    log_cost: np.ndarray,
+    sigma: float,
+    mu: float,
+    min_return_val: float = 1e-150,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Internal function of log_normal(), given the log of base_cost"""
     # Init
     math_utils.check_numeric({"sigma": sigma, "mu": mu})
     sigma = float(sigma)
     mu = float(mu)
 
+    # Intermediate arrays are updated in place where possible, to avoid
+    # allocating a new cost sized array for every operation
+
     # We need to be careful to avoid 0 in costs
-    # First calculate the fraction
-    frac_denominator = base_cost * sigma * np.sqrt(2 * np.pi)
-    frac = np.divide(
-        1, frac_denominator, where=frac_denominator != 0, out=np.zeros_like(frac_denominator),
-    )
+    # First calculate the fraction, 0 denominators are left as 0
+    frac = np.asarray(np.multiply(base_cost, sigma, out=out))
+    frac *= np.sqrt(2 * np.pi)
+    np.divide(1, frac, where=frac != 0, out=frac)
 
     # Now calculate the exponential
-    log = np.log(base_cost, where=base_cost != 0, out=np.zeros_like(base_cost).astype(float),)
-    exp_numerator = (log - mu) ** 2
+    exp = np.asarray(log_cost - mu)
+    np.square(exp, out=exp)
     exp_denominator = 2 * sigma ** 2
-    exp = np.exp(-exp_numerator / exp_denominator)
-
-    return np.maximum(frac * exp, min_return_val)
+    np.divide(exp, -exp_denominator, out=exp)
+    np.exp(exp, out=exp)
+
+    # Without out, the result takes the float64 dtype of log_cost, even
+    # for float32 costs, matching the dtype of the old `frac * exp`
+    result = exp if out is None else frac
+    np.multiply(frac, exp, out=result)
+    return np.maximum(result, min_return_val, out=result)
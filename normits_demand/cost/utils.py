@@ -10,6 +10,8 @@ Other updates made by:
 File purpose:
 
 """
+from __future__ import annotations
+
 # Built-Ins
 import os
 import dataclasses
@@ -33,6 +35,15 @@ import normits_demand as nd
 
 sns.set_theme(style="darkgrid")
 
+# Below this many bin edges, searching is as quick as calculating indexes
+_MIN_EDGES_TO_CALCULATE_INDEX = 32
+
+# Up to this many bin edges, comparing against every edge beats searching
+_MAX_EDGES_TO_COMPARE = 32
+
+# Number of cells to bin at once. Keeps temporary arrays within the CPU cache
+_BIN_INDEX_CHUNK_SIZE = 2 ** 16
+
 
 @dataclasses.dataclass
 class DistributionReportCols:
@@ -82,16 +93,143 @@ class PlotData:
     label: str
 
 
+@dataclasses.dataclass(frozen=True)
+class CostBinding:
+    """Caches which cost band each cell of a cost matrix falls into
+
+    Sorting a cost matrix into bands is the most expensive part of
+    calculating a cost distribution. When the same cost matrix and bands
+    are used repeatedly, such as when calibrating a gravity model, build a
+    CostBinding once and pass it into the cost distribution functions to
+    skip the sort on every call.
+
+    Use `CostBinding.from_bounds()` or `CostBinding.from_bin_edges()` to
+    build a new object.
+
+    Weights passed to `CostBinding.sum()` are accumulated in float64.
+    Keeping weights as C-contiguous float64 arrays is fastest, as
+    anything else is converted on every call.
+    """
+    bin_index: np.ndarray
+    n_bins: int
+
+    @staticmethod
+    def from_bounds(
+        cost_matrix: np.ndarray,
+        min_bounds: np.ndarray,
+        max_bounds: np.ndarray,
+    ) -> CostBinding:
+        """Bins cost_matrix into bands, where `min_bound <= cost < max_bound`
+
+        Matches the banding used by `cells_in_bounds()` and
+        `calculate_average_cost_in_bounds()`.
+        """
+        band_index, in_band = _band_index(min_bounds, max_bounds, cost_matrix)
+        n_bins = len(min_bounds)
+        return CostBinding(
+            bin_index=np.where(in_band, band_index, n_bins),
+            n_bins=n_bins,
+        )
+
+    @staticmethod
+    def from_bin_edges(
+        cost_matrix: np.ndarray,
+        bin_edges: Union[List[float], np.ndarray],
+    ) -> CostBinding:
+        """Bins cost_matrix into bands, in the same way as `numpy.histogram`
+
+        Matches the banding used by `cost_distribution()`.
+        """
+        return CostBinding(
+            bin_index=cost_bin_index(cost_matrix, bin_edges),
+            n_bins=len(bin_edges) - 1,
+        )
+
+    def count(self) -> np.ndarray:
+        """Counts the number of cells in each band"""
+        return np.bincount(self.bin_index, minlength=self.n_bins + 1)[:self.n_bins]
+
+    def sum(self, weights: np.ndarray) -> np.ndarray:
+        """Sums weights, the same shape as the binned cost matrix, by band"""
+        return binned_sum(self.bin_index, weights, self.n_bins)
+
+
+def _band_index(
+    min_bounds: np.ndarray,
+    max_bounds: np.ndarray,
+    cost: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the index of the band each cell of cost falls into
+
+    A cell falls into band `i` when
+    `min_bounds[i] <= cost < max_bounds[i]`. Bands are assumed to be sorted
+    in ascending order and not to overlap, though gaps between bands
+    are allowed.
+
+    Parameters
+    ----------
+    min_bounds:
+        The minimum bounds for each cost band. Corresponds to max_bounds.
+
+    max_bounds:
+        The maximum bounds for each cost band. Corresponds to min_bounds.
+
+    cost:
+        The costs to sort into bands.
+
+    Returns
+    -------
+    band_index:
+        A flat array, the same size as cost, of the band index that each
+        cell falls into. Only valid where `in_band` is True.
+
+    in_band:
+        A flat boolean array, the same size as cost, marking which cells
+        fall into one of the bands.
+    """
+    min_bounds = np.asarray(min_bounds)
+    max_bounds = np.asarray(max_bounds)
+    cost = np.ravel(cost)
+
+    # Find the last band that starts at or before each cost.
+    # Cells before the first band get -1, which safely indexes max_bounds
+    # below as they are excluded by the first check anyway
+    band_index = np.searchsorted(min_bounds, cost, side="right") - 1
+    in_band = (band_index >= 0) & (cost < max_bounds[band_index])
+    return band_index, in_band
+
+
 def cells_in_bounds(
     min_bounds: np.ndarray,
     max_bounds: np.ndarray,
     cost: np.ndarray,
+    cost_binding: CostBinding = None,
 ) -> np.ndarray:
-    cell_counts = list()
-    for min_val, max_val in zip(min_bounds, max_bounds):
-        band_mask = (cost >= min_val) & (cost < max_val)
-        cell_counts.append(band_mask.sum())
-    return np.array(cell_counts)
+    """Counts the number of cells of cost within each bounds pair
+
+    Parameters
+    ----------
+    min_bounds:
+        The minimum bounds for each cost band. Corresponds to max_bounds.
+
+    max_bounds:
+        The maximum bounds for each cost band. Corresponds to min_bounds.
+
+    cost:
+        A matrix of costs to count.
+
+    cost_binding:
+        A pre-calculated CostBinding of cost into min_bounds and
+        max_bounds. If left as None, one is calculated.
+
+    Returns
+    -------
+    cell_counts:
+        An array of the number of cells in cost within each bounds pair
+    """
+    if cost_binding is None:
+        cost_binding = CostBinding.from_bounds(cost, min_bounds, max_bounds)
+    return cost_binding.count()
 
 
 def iz_infill_costs(
@@ -121,19 +259,20 @@ def iz_infill_costs(
         cost, but with the diagonal infilled.
     """
     # Init
-    infilled_cost = cost.values.copy()
+    values = cost.to_numpy(dtype=float)
 
-    # Set to inf so we don't pick up 0s or diagonal in min
-    infilled_cost = np.where(infilled_cost == 0, np.inf, infilled_cost)
-    np.fill_diagonal(infilled_cost, np.inf)
+    # Mask out 0s and the diagonal so we don't pick them up in the min
+    min_mask = values != 0
+    np.fill_diagonal(min_mask, False)
 
-    # Find the min an do infill
-    min_vals = infilled_cost.min(axis=min_axis)
+    # Find the min and do infill. Anything without a valid min is inf
+    min_vals = np.min(values, axis=min_axis, where=min_mask, initial=np.inf)
     infill = min_vals * iz_infill
-    np.fill_diagonal(infilled_cost, infill)
+    infill[infill == np.inf] = 0
 
-    # Flip all inf back to 0
-    infilled_cost = np.where(infilled_cost == np.inf, 0, infilled_cost)
+    # Infinite costs are returned as 0
+    infilled_cost = np.where(values == np.inf, 0, values)
+    np.fill_diagonal(infilled_cost, infill)
 
     return pd.DataFrame(
         data=infilled_cost,
@@ -148,6 +287,7 @@ def normalised_cost_distribution(
     min_bounds: Union[List[float], np.ndarray] = None,
     max_bounds: Union[List[float], np.ndarray] = None,
     bin_edges: Union[List[float], np.ndarray] = None,
+    cost_binding: CostBinding = None,
 ) -> Tuple[np.ndarray, np.ndarray]:
     """
     Calculates the normalised distribution of costs across a matrix.
@@ -156,7 +296,8 @@ def normalised_cost_distribution(
     ----------
     matrix:
         The matrix to calculate the cost distribution for. This matrix
-        should be the same shape as cost_matrix
+        should be the same shape as cost_matrix. For repeated calls, make
+        this C-contiguous to avoid a copy when it is flattened.
 
     cost_matrix:
         A matrix of cost relating to matrix. This matrix
@@ -172,8 +313,12 @@ def normalised_cost_distribution(
 
     bin_edges:
         Defines a monotonically increasing array of bin edges, including the
-        rightmost edge, allowing for non-uniform bin widths. This argument
-        is passed straight into `numpy.histogram`
+        rightmost edge, allowing for non-uniform bin widths. Bins are
+        treated the same as the `bins` argument of `numpy.histogram`
+
+    cost_binding:
+        A pre-calculated CostBinding of cost_matrix. If set, the bounds
+        and bin_edges are ignored.
 
     Returns
     -------
@@ -195,6 +340,7 @@ def normalised_cost_distribution(
         min_bounds=min_bounds,
         max_bounds=max_bounds,
         bin_edges=bin_edges,
+        cost_binding=cost_binding,
     )
 
     # Normalise
@@ -212,6 +358,7 @@ def cost_distribution(
     min_bounds: Union[List[float], np.ndarray] = None,
     max_bounds: Union[List[float], np.ndarray] = None,
     bin_edges: Union[List[float], np.ndarray] = None,
+    cost_binding: CostBinding = None,
 ) -> np.ndarray:
     """
     Calculates the distribution of costs across a matrix.
@@ -220,7 +367,8 @@ def cost_distribution(
     ----------
     matrix:
         The matrix to calculate the cost distribution for. This matrix
-        should be the same shape as cost_matrix
+        should be the same shape as cost_matrix. For repeated calls, make
+        this C-contiguous to avoid a copy when it is flattened.
 
     cost_matrix:
         A matrix of cost relating to matrix. This matrix
@@ -236,8 +384,12 @@ def cost_distribution(
 
     bin_edges:
         Defines a monotonically increasing array of bin edges, including the
-        rightmost edge, allowing for non-uniform bin widths. This argument
-        is passed straight into `numpy.histogram`
+        rightmost edge, allowing for non-uniform bin widths. Bins are
+        treated the same as the `bins` argument of `numpy.histogram`
+
+    cost_binding:
+        A pre-calculated CostBinding of cost_matrix. If set, the bounds
+        and bin_edges are ignored.
 
     Returns
     -------
@@ -252,6 +404,9 @@ def cost_distribution(
     --------
     `numpy.histogram`
     """
+    if cost_binding is not None:
+        return cost_binding.sum(matrix)
+
     # Use bounds to calculate bin edges
     if bin_edges is None:
         if min_bounds is None or max_bounds is None:
@@ -262,14 +417,140 @@ def cost_distribution(
 
         bin_edges = [min_bounds[0]] + list(max_bounds)
 
-    # Sort into bins
-    distribution, _ = np.histogram(
-        a=cost_matrix,
-        bins=bin_edges,
-        weights=matrix,
+    return CostBinding.from_bin_edges(cost_matrix, bin_edges).sum(matrix)
+
+
+def _is_evenly_spaced(bin_edges: np.ndarray) -> bool:
+    """Checks if there are enough evenly spaced bin_edges to calculate indexes"""
+    widths = np.diff(bin_edges)
+    return bool(
+        len(bin_edges) > _MIN_EDGES_TO_CALCULATE_INDEX
+        and np.all(np.isfinite(bin_edges))
+        and np.allclose(widths, widths[0])
     )
 
-    return distribution
+
+def _search_bin_edges(
+    bin_edges: np.ndarray,
+    costs: np.ndarray,
+    evenly_spaced: bool,
+) -> np.ndarray:
+    """Finds the number of bin_edges less than or equal to each cost
+
+    Equivalent to `np.searchsorted(bin_edges, costs, side="right")`. When
+    there are lots of evenly spaced bin_edges, each index is calculated
+    directly from the bin width instead of searching, which is quicker.
+    See `_is_evenly_spaced()`. When there are only a few bin_edges, costs
+    are compared against each edge in turn, which avoids the branching of
+    a binary search.
+    """
+    if len(bin_edges) <= _MAX_EDGES_TO_COMPARE:
+        # Count the edges each cost is not below. NaNs are never below an
+        # edge, so are sorted after all edges, to match searchsorted
+        index = np.zeros(costs.shape, dtype=np.uint8)
+        for edge in bin_edges:
+            index += ~(costs < edge)
+        return index.astype(np.intp)
+
+    if not evenly_spaced:
+        return np.searchsorted(bin_edges, costs, side="right")
+
+    # Estimate the index, then correct for any rounding errors at the edges.
+    # NaNs are sorted after all edges, to match searchsorted
+    n_edges = len(bin_edges)
+    with np.errstate(invalid="ignore"):
+        estimate = np.floor((costs - bin_edges[0]) / (bin_edges[1] - bin_edges[0])) + 1
+    estimate = np.nan_to_num(estimate, nan=n_edges, posinf=n_edges, neginf=0)
+    index = np.clip(estimate, 0, n_edges).astype(np.intp)
+
+    index -= (index > 0) & (costs < bin_edges[index - 1])
+    index += (index < n_edges) & (costs >= bin_edges[np.minimum(index, n_edges - 1)])
+    return index
+
+
+def cost_bin_index(
+    cost_matrix: np.ndarray,
+    bin_edges: Union[List[float], np.ndarray],
+) -> np.ndarray:
+    """Calculates the bin that each cell of cost_matrix falls into
+
+    The result can be cached and handed to `binned_sum()` to repeatedly
+    calculate distributions across the same cost_matrix, without needing
+    to sort the costs into bins every time. See `CostBinding`.
+
+    Parameters
+    ----------
+    cost_matrix:
+        A matrix of costs to sort into bins.
+
+    bin_edges:
+        Defines a monotonically increasing array of bin edges, including the
+        rightmost edge, allowing for non-uniform bin widths. Bins are
+        treated the same as the `bins` argument of `numpy.histogram`
+
+    Returns
+    -------
+    bin_index:
+        A flat array, the same size as cost_matrix, of the bin index that
+        each cell falls into. Cells outside of all the bins are given
+        an index of `len(bin_edges) - 1`, one past the final bin.
+    """
+    bin_edges = np.asarray(bin_edges, dtype=float)
+    n_bins = len(bin_edges) - 1
+    evenly_spaced = _is_evenly_spaced(bin_edges)
+    costs = np.ravel(cost_matrix)
+
+    # Work through costs in cache sized chunks, keeping the temporary
+    # arrays small and the bin edges in cache
+    bin_index = np.empty(costs.shape, dtype=np.intp)
+    for start in range(0, costs.size, _BIN_INDEX_CHUNK_SIZE):
+        chunk = slice(start, start + _BIN_INDEX_CHUNK_SIZE)
+        chunk_costs = costs[chunk]
+        chunk_index = _search_bin_edges(bin_edges, chunk_costs, evenly_spaced) - 1
+
+        # Like `numpy.histogram`, the final bin includes its right edge
+        chunk_index[chunk_costs == bin_edges[-1]] = n_bins - 1
+        chunk_index[chunk_index < 0] = n_bins
+        bin_index[chunk] = chunk_index
+
+    return bin_index
+
+
+def binned_sum(
+    bin_index: np.ndarray,
+    weights: np.ndarray,
+    n_bins: int,
+) -> np.ndarray:
+    """Sums weights into the bins defined by bin_index
+
+    Parameters
+    ----------
+    bin_index:
+        The bin index of each cell in weights, as returned by
+        `cost_bin_index()`.
+
+    weights:
+        The values to sum into each bin. Must be the same size as bin_index.
+        Sums are always accumulated in float64, so a C-contiguous float64
+        array avoids an internal conversion copy on each call. Any other
+        memory layout, such as the Fortran ordered arrays often returned
+        by `pandas.DataFrame.values`, is copied when flattened.
+
+    n_bins:
+        The number of bins defined in bin_index.
+
+    Returns
+    -------
+    binned_sum:
+        An array of length n_bins of the sum of weights in each bin.
+
+    See Also
+    --------
+    `cost_bin_index()`
+    """
+    # Anything out of bounds is collected in one extra bin, then dropped
+    summed = np.bincount(bin_index, weights=np.ravel(weights), minlength=n_bins + 1)
+    return summed[:n_bins]
 
 
 def _get_cutoff_idx(lst: np.ndarray, cutoff: float) -> int:
@@ -281,13 +562,12 @@ def _get_cutoff_idx(lst: np.ndarray, cutoff: float) -> int:
     If no values are less then the cutoff then the index of the final
     value in lst is returned
     """
-    # Init
-    i = 0
-
-    # Loop until we pass the cutoff
-    for i, item in enumerate(reversed(lst)):  # type: ignore
-        if item > cutoff:
-            break
+    # Find how far from the end the last value above the cutoff is
+    above_cutoff = np.flatnonzero(np.asarray(lst) > cutoff)
+    if above_cutoff.size > 0:
+        i = len(lst) - 1 - above_cutoff[-1]
+    else:
+        i = max(len(lst) - 1, 0)
 
     # Be careful when flipping edges
     if i == 0:
@@ -300,6 +580,28 @@ def _get_cutoff_idx(lst: np.ndarray, cutoff: float) -> int:
     return -i
 
 
+def _get_upper_x_lim(
+    plot_data: List[PlotData],
+    band_share_cutoff: float,
+) -> Union[float, None]:
+    """Get the x-axis point where all plot_data has passed band_share_cutoff
+
+    Returns None if no cutoff point can be found.
+    """
+    if band_share_cutoff <= 0:
+        return None
+
+    cutoff_vals = list()
+    for data in plot_data:
+        cutoff_idx = _get_cutoff_idx(data.y_values, band_share_cutoff)
+        cutoff_vals.append(data.x_values[cutoff_idx + 1])
+
+    upper_x_lim = max(cutoff_vals)
+    if np.isnan(upper_x_lim) or np.isinf(upper_x_lim):
+        return None
+    return upper_x_lim
+
+
 def plot_cost_distributions(
     plot_data: Union[PlotData, List[PlotData]],
     plot_title: str,
@@ -338,7 +640,8 @@ def plot_cost_distributions(
 
     close_plot:
         Whether to close the plot before returning. If True,
-        `matplotlib.pyplot.close()` is called.
+        `matplotlib.pyplot.close()` is called. If True and path is None,
+        the plot would be discarded unseen, so nothing is plotted.
 
     x_axis_label:
         The label to give to the x axis in the output graph
@@ -363,29 +666,17 @@ def plot_cost_distributions(
     `matplotlib.pyplot.savefig`
     """
     # Init
-    plt.clf()
     plot_data = [plot_data] if isinstance(plot_data, PlotData) else plot_data
 
-    if len(plot_data) < 0:
+    # Nothing to do if the plot would be thrown away without being saved
+    if len(plot_data) == 0 or (path is None and close_plot):
         return
-    
+
     # Plot each data chunk in turn
-    cutoff_vals = list()
+    plt.clf()
     for data in plot_data:
-        # Plot data
         axis = sns.lineplot(x=data.x_values, y=data.y_values, label=data.label)
-
-        # Figure out graph cutoff
-        if band_share_cutoff > 0:
-            cutoff_idx = _get_cutoff_idx(data.y_values, band_share_cutoff)
-            cutoff_vals.append(data.x_values[cutoff_idx + 1])
-        else:
-            cutoff_vals.append(np.nan)
-
-    # Finalise cutoff point
-    upper_x_lim = max(cutoff_vals)
-    if np.isnan(upper_x_lim) or np.isinf(upper_x_lim):
-        upper_x_lim = None      # type: ignore
+    upper_x_lim = _get_upper_x_lim(plot_data, band_share_cutoff)
 
     # Label the plot
     if x_axis_label is not None:
@@ -427,6 +718,7 @@ def calculate_average_cost_in_bounds(
     max_bounds: np.ndarray,
     cost_matrix: np.ndarray,
     trips: np.ndarray,
+    cost_binding: CostBinding = None,
 ) -> np.ndarray:
     """Calculates the average cost between each bounds pair
 
@@ -445,25 +737,29 @@ def calculate_average_cost_in_bounds(
         A matrix of trip counts from each point to point. Corresponds to
         cost_matrix.
 
+    cost_binding:
+        A pre-calculated CostBinding of cost_matrix into min_bounds and
+        max_bounds. If left as None, one is calculated.
+
     Returns
     -------
     average_costs:
          An array of the average cost between each bounds pair
     """
-    average_costs = list()
-    for min_val, max_val in zip(min_bounds, max_bounds):
-        band_mask = (cost_matrix >= min_val) & (cost_matrix < max_val)
-        band_distance = (trips * band_mask * cost_matrix).sum()
-        band_trips = (trips * band_mask).sum()
-
-        if band_trips == 0:
-            band_average = min_val
-        else:
-            band_average = band_distance / band_trips
-
-        average_costs.append(band_average)
-
-    return np.array(average_costs)
+    if cost_binding is None:
+        cost_binding = CostBinding.from_bounds(cost_matrix, min_bounds, max_bounds)
+
+    # Cells outside all bands (such as infinite costs) are dropped by
+    # the binding, so any invalid products here can be ignored
+    with np.errstate(invalid="ignore"):
+        band_distance = cost_binding.sum(trips * cost_matrix)
+    band_trips = cost_binding.sum(trips)
+
+    # Default to the band minimum where there are no trips
+    average_costs = np.array(min_bounds, dtype=float)
+    has_trips = band_trips != 0
+    average_costs[has_trips] = band_distance[has_trips] / band_trips[has_trips]
+    return average_costs
 
 
 def get_band_mid_points(
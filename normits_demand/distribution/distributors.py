@@ -378,12 +378,14 @@ class AbstractDistributor(abc.ABC, DistributorExportPaths):
             report_cols = cost_utils.DistributionReportCols(cost_units=self.cost_units)
 
         # Calculate remaining achieved values
+        cost_binding = cost_utils.CostBinding.from_bounds(cost_matrix, min_bounds, max_bounds)
         achieved_band_count = achieved_band_share * achieved_distribution.sum()
         achieved_ave_cost = cost_utils.calculate_average_cost_in_bounds(
             min_bounds=min_bounds,
             max_bounds=max_bounds,
             cost_matrix=cost_matrix,
             trips=achieved_distribution,
+            cost_binding=cost_binding,
         )
 
         # Calculate cost distributions
@@ -391,6 +393,7 @@ class AbstractDistributor(abc.ABC, DistributorExportPaths):
             min_bounds=min_bounds,
             max_bounds=max_bounds,
             cost=cost_matrix,
+            cost_binding=cost_binding,
         )
         cell_proportions = cell_count / cell_count.sum()
 
@@ -12,16 +12,19 @@ Module of all distribution functions for EFS
 import os
 import operator
 import warnings
+import collections
 
 import pandas as pd
 import numpy as np
 from numpy.testing import assert_approx_equal
+from scipy.sparse import linalg as sparse_linalg
 
 from typing import Any
 from typing import Dict
 from typing import List
 from typing import Tuple
 from typing import Callable
+from typing import Optional
 
 # self imports
 import normits_demand as nd
@@ -87,10 +90,13 @@ class Furness3D:
         # Set attributes
         self.row_targets = row_targets
         self.col_targets = col_targets
-        self.cost_matrix = cost_matrix
-        self.base_matrix = base_matrix
+        # Area matrices take the layout of the calibration matrix masks.
+        # Keep everything C-contiguous so the band share CostBinding.sum()
+        # calls ravel each area matrix without a copy
+        self.cost_matrix = np.ascontiguousarray(cost_matrix)
+        self.base_matrix = np.ascontiguousarray(base_matrix)
         self.calibration_keys = calib_keys
-        self.calibration_matrix = calibration_matrix
+        self.calibration_matrix = np.ascontiguousarray(calibration_matrix)
         self.target_cost_distributions = target_cost_distributions
         self.calibration_naming = calibration_naming
         self.calibration_ignore_val = calibration_ignore_val
@@ -100,6 +106,27 @@ class Furness3D:
 
         self.target_convergence = target_convergence
 
+        # The cost bands don't change between iterations, so bin them once.
+        # Cells outside an area are zeroed before these are used, so the
+        # full cost matrix can be binned
+        self._band_cost_bindings = {
+            calib_key: cost_utils.CostBinding.from_bounds(
+                cost_matrix=self.cost_matrix,
+                min_bounds=tcd['min'].to_numpy(dtype=float),
+                max_bounds=tcd['max'].to_numpy(dtype=float),
+            )
+            for calib_key, tcd in target_cost_distributions.items()
+            if calib_key in calib_keys
+        }
+        self._tcd_cost_bindings = {
+            calib_key: cost_utils.CostBinding.from_bin_edges(
+                cost_matrix=self.cost_matrix,
+                bin_edges=np.concatenate([tcd['min'].to_numpy()[:1], tcd['max'].to_numpy()]),
+            )
+            for calib_key, tcd in target_cost_distributions.items()
+            if calib_key in calib_keys
+        }
+
         # Additional attributes
         self.initial_convergences = None
         self.achieved_band_shares = None
@@ -126,38 +153,31 @@ class Furness3D:
 
             area_matrix_values = matrix * area_mask
             area_total = area_matrix_values.sum()
-            area_cost = self.cost_matrix * area_mask
-
-            # Adjust bands one at a time
-            for _, row in area_tcd.iterrows():
-                # Get proportion of all trips that should be in this band
-                target_band_share = row['band_share']
-                min_val = float(row['min'])
-                max_val = float(row['max'])
-
-                # Get proportion of all trips that are in this band
-                distance_mask = (area_cost >= min_val) & (area_cost < max_val)
-                band_trips = area_matrix_values * distance_mask
-
-                # Figure out the target and achieved
-                target_band_total = area_total * target_band_share
-                ach_band_total = band_trips.sum()
-
-                # We can't adjust if there are no trips in this band
-                if ach_band_total <= 0:
-                    adj_mat = band_trips
-
-                elif target_band_total <= 0:
-                    # Set to a really small value so furness can use still
-                    adj_mat = np.where(band_trips != 0, 1e-7, 0)
+            cost_binding = self._band_cost_bindings[calib_key]
+
+            # Figure out the target and achieved totals in each band
+            target_band_totals = area_total * area_tcd['band_share'].to_numpy()
+            ach_band_totals = cost_binding.sum(area_matrix_values)
+
+            # Adjust each band towards its target. We can't adjust if there
+            # are no trips in a band, and cells outside all bands are dropped
+            can_adjust = ach_band_totals > 0
+            band_factors = np.ones(cost_binding.n_bins + 1)
+            band_factors[-1] = 0
+            band_factors[:-1][can_adjust] = (
+                target_band_totals[can_adjust] / ach_band_totals[can_adjust]
+            )
+            cell_factors = band_factors[cost_binding.bin_index].reshape(matrix.shape)
+            adj_mat = area_matrix_values * cell_factors
 
-                else:
-                    # Adjust the matrix towards target
-                    adjustment = target_band_total / ach_band_total
-                    adj_mat = band_trips * adjustment
+            # Where there should be no trips, set to a really small value so
+            # furness can use still
+            zero_target = np.append(can_adjust & (target_band_totals <= 0), False)
+            zero_cells = zero_target[cost_binding.bin_index].reshape(matrix.shape)
+            adj_mat[zero_cells & (area_matrix_values != 0)] = 1e-7
 
-                # Add into the return matrix
-                out_matrix += adj_mat
+            # Add into the return matrix
+            out_matrix += adj_mat
 
         return out_matrix
 
@@ -209,14 +229,12 @@ class Furness3D:
                 area_tcd = self.target_cost_distributions[calib_key]
 
                 area_matrix_values = matrix * area_mask
-                area_cost = self.cost_matrix * area_mask
 
                 # Calculate the convergence of this area
                 _, achieved_band_shares = cost_utils.normalised_cost_distribution(
                     matrix=area_matrix_values,
-                    cost_matrix=area_cost,
-                    min_bounds=area_tcd['min'].tolist(),
-                    max_bounds=area_tcd['max'].tolist(),
+                    cost_matrix=self.cost_matrix,
+                    cost_binding=self._tcd_cost_bindings[calib_key],
                 )
                 area_convergence = math_utils.curve_convergence(
                     area_tcd['band_share'].values,
@@ -260,6 +278,7 @@ def doubly_constrained_furness(seed_vals: np.ndarray,
                                tol: float = 1e-9,
                                max_iters: int = 5000,
                                warning: bool = True,
+                               inplace: bool = False,
                                ) -> Tuple[np.ndarray, int, float]:
     """
     Performs a doubly constrained furness for max_iters or until tol is met
@@ -292,6 +311,11 @@ def doubly_constrained_furness(seed_vals: np.ndarray,
         Whether to print a warning or not when the tol cannot be met before
         max_iters.
 
+    inplace:
+        Whether to furness `seed_vals` in place, rather than a copy of it.
+        Saves allocating a second matrix when the caller has no further
+        use for the seed values.
+
     Returns
     -------
     furnessed_matrix:
@@ -302,6 +326,104 @@ def doubly_constrained_furness(seed_vals: np.ndarray,
 
     achieved_rmse:
         The Root Mean Squared Error difference achieved before exiting
+
+    See Also
+    --------
+    `doubly_constrained_furness_with_factors()`
+    """
+    furnessed_mat, iter_num, cur_rmse, *_ = doubly_constrained_furness_with_factors(
+        seed_vals=seed_vals,
+        row_targets=row_targets,
+        col_targets=col_targets,
+        tol=tol,
+        max_iters=max_iters,
+        warning=warning,
+        inplace=inplace,
+    )
+    return furnessed_mat, iter_num, cur_rmse
+
+
+def doubly_constrained_furness_with_factors(
+    seed_vals: np.ndarray,
+    row_targets: np.ndarray,
+    col_targets: np.ndarray,
+    tol: float = 1e-9,
+    max_iters: int = 5000,
+    warning: bool = True,
+    init_row_factors: Optional[np.ndarray] = None,
+    init_col_factors: Optional[np.ndarray] = None,
+    inplace: bool = False,
+) -> Tuple[np.ndarray, int, float, np.ndarray, np.ndarray]:
+    """
+    Performs a doubly constrained furness, returning the factors applied
+
+    The furnessed matrix is always `seed_vals` scaled by a factor per row
+    and a factor per column. Those factors are returned, and can be given
+    back as `init_row_factors` and `init_col_factors` to warm start a
+    furness of a similar seed matrix towards the same targets. A good
+    warm start reduces the number of iterations needed to meet `tol`.
+
+    Controls numpy warnings to warn of any overflow errors encountered
+
+    Parameters
+    ----------
+    seed_vals:
+        Initial values for the furness. Must be of shape
+        (len(n_rows), len(n_cols)).
+
+    row_targets:
+        The target values for the sum of each row.
+        i.e np.sum(matrix, axis=1)
+
+    col_targets:
+        The target values for the sum of each column
+        i.e np.sum(matrix, axis=0)
+
+    tol:
+        The maximum difference between the achieved and the target values
+        to tolerate before exiting early. R^2 is used to calculate the
+        difference.
+
+    max_iters:
+        The maximum number of iterations to complete before exiting.
+
+    warning:
+        Whether to print a warning or not when the tol cannot be met before
+        max_iters.
+
+    init_row_factors:
+        Factors to apply to each row of `seed_vals` before starting the
+        furness. Usually the `row_factors` returned by a previous call.
+        If left as None, no initial row factors are applied.
+
+    init_col_factors:
+        Factors to apply to each column of `seed_vals` before starting the
+        furness. Usually the `col_factors` returned by a previous call.
+        If left as None, no initial column factors are applied.
+
+    inplace:
+        Whether to furness `seed_vals` in place, rather than a copy of it.
+        Saves allocating a second matrix when the caller has no further
+        use for the seed values.
+
+    Returns
+    -------
+    furnessed_matrix:
+        The final furnessed matrix
+
+    completed_iters:
+        The number of completed iterations before exiting
+
+    achieved_rmse:
+        The Root Mean Squared Error difference achieved before exiting
+
+    row_factors:
+        The total factor applied to each row of `seed_vals`, including
+        `init_row_factors`.
+
+    col_factors:
+        The total factor applied to each column of `seed_vals`, including
+        `init_col_factors`.
     """
     # Error check
     if seed_vals.shape != (len(row_targets), len(col_targets)):
@@ -312,50 +434,78 @@ def doubly_constrained_furness(seed_vals: np.ndarray,
         )
 
     # Init
-    furnessed_mat = seed_vals.copy()
+    furnessed_mat = seed_vals if inplace else seed_vals.copy()
+    # Factors match the precision of the inputs, avoiding a cast on every
+    # update of a lower precision matrix
+    factor_dtype = np.result_type(seed_vals, row_targets, col_targets, np.float32)
     early_exit = False
     cur_rmse = np.inf
     iter_num = 0
     n_vals = len(row_targets)
 
+    row_factors = np.ones(len(row_targets))
+    col_factors = np.ones(len(col_targets))
+    if init_row_factors is not None:
+        row_factors[:] = init_row_factors
+        furnessed_mat *= row_factors[:, np.newaxis]
+    if init_col_factors is not None:
+        col_factors[:] = init_col_factors
+        furnessed_mat *= col_factors
+
     # Can return early if all 0 - probably shouldn't happen!
     if row_targets.sum() == 0 or col_targets.sum() == 0:
         warnings.warn("Furness given targets of 0. Returning all 0's")
-        return np.zeros(seed_vals.shape), iter_num, cur_rmse
+        furnessed_mat[:] = 0
+        return (
+            furnessed_mat,
+            iter_num,
+            cur_rmse,
+            np.ones(len(row_targets)),
+            np.ones(len(col_targets)),
+        )
 
     # Set up numpy overflow errors
     with np.errstate(over='raise'):
+        # Buffers are allocated once and reused on every iteration
+        row_ach = np.empty(len(row_targets), dtype=furnessed_mat.dtype)
+        col_ach = np.empty(len(col_targets), dtype=furnessed_mat.dtype)
+        row_diff_factor = np.empty(len(row_targets), dtype=factor_dtype)
+        col_diff_factor = np.empty(len(col_targets), dtype=factor_dtype)
+        row_diff_dtype = np.result_type(row_targets, row_diff_factor)
+        row_diff = np.empty(len(row_targets), dtype=row_diff_dtype)
+        col_diff = np.empty(len(col_targets), dtype=np.result_type(col_targets, col_ach))
+
+        # Column totals are carried over between iterations, saving a pass
+        np.sum(furnessed_mat, axis=0, out=col_ach)
 
         for iter_num in range(max_iters):
             # ## COL CONSTRAIN ## #
             # Calculate difference factor
-            col_ach = np.sum(furnessed_mat, axis=0)
-            diff_factor = np.divide(
-                col_targets,
-                col_ach,
-                where=col_ach != 0,
-                out=np.ones_like(col_targets, dtype=float),
-            )
+            col_diff_factor.fill(1)
+            np.divide(col_targets, col_ach, where=col_ach != 0, out=col_diff_factor)
 
             # adjust cols
-            furnessed_mat *= diff_factor
+            furnessed_mat *= col_diff_factor
+            col_factors *= col_diff_factor
 
             # ## ROW CONSTRAIN ## #
             # Calculate difference factor
-            row_ach = np.sum(furnessed_mat, axis=1)
-            diff_factor = np.divide(
-                row_targets,
-                row_ach,
-                where=row_ach != 0,
-                out=np.ones_like(row_targets, dtype=float),
-            )
+            np.sum(furnessed_mat, axis=1, out=row_ach)
+            row_diff_factor.fill(1)
+            np.divide(row_targets, row_ach, where=row_ach != 0, out=row_diff_factor)
 
             # adjust rows
-            furnessed_mat *= np.atleast_2d(diff_factor).T
-
-            # Calculate the diff - leave early if met
-            row_diff = (row_targets - np.sum(furnessed_mat, axis=1)) ** 2
-            col_diff = (col_targets - np.sum(furnessed_mat, axis=0)) ** 2
+            furnessed_mat *= row_diff_factor[:, np.newaxis]
+            row_factors *= row_diff_factor
+
+            # Calculate the diff - leave early if met.
+            # Adjusted row totals follow directly from the row factors
+            np.sum(furnessed_mat, axis=0, out=col_ach)
+            np.multiply(row_ach, row_diff_factor, out=row_diff)
+            np.subtract(row_targets, row_diff, out=row_diff)
+            np.square(row_diff, out=row_diff)
+            np.subtract(col_targets, col_ach, out=col_diff)
+            np.square(col_diff, out=col_diff)
             cur_rmse = (np.sum(row_diff + col_diff) / n_vals) ** 0.5
             if cur_rmse < tol:
                 early_exit = True
@@ -363,7 +513,14 @@ def doubly_constrained_furness(seed_vals: np.ndarray,
 
             # We got a NaN! Make sure to point out we didn't converge
             if np.isnan(cur_rmse):
-                return np.zeros(furnessed_mat.shape), iter_num, np.inf
+                furnessed_mat[:] = 0
+                return (
+                    furnessed_mat,
+                    iter_num,
+                    np.inf,
+                    np.ones(len(row_targets)),
+                    np.ones(len(col_targets)),
+                )
 
     # Warn the user if we exhausted our number of loops
     if not early_exit and warning:
@@ -372,7 +529,261 @@ def doubly_constrained_furness(seed_vals: np.ndarray,
               "%f. The values returned may not be accurate."
               % (max_iters, cur_rmse))
 
-    return furnessed_mat, iter_num + 1, cur_rmse
+    return furnessed_mat, iter_num + 1, cur_rmse, row_factors, col_factors
+
+
+_NewtonState = collections.namedtuple(
+    "_NewtonState",
+    ["log_r", "log_c", "mat", "row_res", "col_res", "rmse"],
+)
+
+
+def _newton_state(seed: np.ndarray,
+                  log_r: np.ndarray,
+                  log_c: np.ndarray,
+                  row_targets: np.ndarray,
+                  col_targets: np.ndarray,
+                  n_vals: int,
+                  ) -> _NewtonState:
+    """Scales seed by the log row and col factors, and measures the fit
+
+    The rmse is calculated in the same way as `doubly_constrained_furness()`.
+    """
+    with np.errstate(over='ignore'):
+        mat = np.exp(log_r)[:, np.newaxis] * seed * np.exp(log_c)
+    row_res = mat.sum(axis=1) - row_targets
+    col_res = mat.sum(axis=0) - col_targets
+    rmse = ((np.sum(row_res ** 2) + np.sum(col_res ** 2)) / n_vals) ** 0.5
+    return _NewtonState(log_r, log_c, mat, row_res, col_res, rmse)
+
+
+def _newton_step(mat: np.ndarray,
+                 row_res: np.ndarray,
+                 col_res: np.ndarray,
+                 row_targets: np.ndarray,
+                 col_targets: np.ndarray,
+                 cg_max_iters: int,
+                 ) -> np.ndarray:
+    """Solves for the Newton step of the log row and col factors
+
+    The Jacobian of the residuals w.r.t. the log factors is
+    [[diag(row_ach), mat], [mat.T, diag(col_ach)]]. It's singular in
+    one direction (all rows up, all cols down), so a small ridge is added.
+    The step is solved approximately using a diagonally preconditioned
+    conjugate gradient.
+    """
+    n_rows = len(row_res)
+    diag = np.concatenate([row_res + row_targets, col_res + col_targets])
+    diag += diag.max() * 1e-12
+
+    def jac_dot(x: np.ndarray) -> np.ndarray:
+        out = diag * x
+        out[:n_rows] += mat @ x[n_rows:]
+        out[n_rows:] += mat.T @ x[:n_rows]
+        return out
+
+    size = len(diag)
+    jacobian = sparse_linalg.LinearOperator((size, size), matvec=jac_dot)
+    precondition = sparse_linalg.LinearOperator((size, size), matvec=lambda x: x / diag)
+    step, _ = sparse_linalg.cg(
+        jacobian,
+        -np.concatenate([row_res, col_res]),
+        M=precondition,
+        maxiter=cg_max_iters,
+    )
+    return step
+
+
+def _newton_line_search(seed: np.ndarray,
+                        state: _NewtonState,
+                        step: np.ndarray,
+                        row_targets: np.ndarray,
+                        col_targets: np.ndarray,
+                        n_vals: int,
+                        ) -> _NewtonState:
+    """Backtracks along step until it improves on the rmse of state"""
+    n_rows = len(row_targets)
+    step_size = 1.0
+    while True:
+        new_state = _newton_state(
+            seed=seed,
+            log_r=state.log_r + step_size * step[:n_rows],
+            log_c=state.log_c + step_size * step[n_rows:],
+            row_targets=row_targets,
+            col_targets=col_targets,
+            n_vals=n_vals,
+        )
+        if new_state.rmse < state.rmse or step_size < 1e-4:
+            return new_state
+        step_size /= 2
+
+
+def _newton_solve(seed: np.ndarray,
+                  row_targets: np.ndarray,
+                  col_targets: np.ndarray,
+                  n_vals: int,
+                  tol: float,
+                  max_iters: int,
+                  cg_max_iters: int,
+                  ) -> Tuple[np.ndarray, int, float]:
+    """Internal function of `newton_balance()`. Balances the active seed"""
+    # Start from the seed scaled to the target total
+    log_r = np.full(len(row_targets), 0.5 * np.log(row_targets.sum() / seed.sum()))
+    log_c = np.full(len(col_targets), log_r[0])
+    state = _newton_state(seed, log_r, log_c, row_targets, col_targets, n_vals)
+
+    iter_num = 0
+    while not state.rmse < tol and iter_num < max_iters:
+        iter_num += 1
+        step = _newton_step(
+            state.mat, state.row_res, state.col_res, row_targets, col_targets, cg_max_iters
+        )
+        new_state = _newton_line_search(seed, state, step, row_targets, col_targets, n_vals)
+
+        # Can't make any more progress
+        if not new_state.rmse < state.rmse:
+            break
+        state = new_state
+
+    return state.mat, iter_num, state.rmse
+
+
+def newton_balance(seed_vals: np.ndarray,
+                   row_targets: np.ndarray,
+                   col_targets: np.ndarray,
+                   tol: float = 1e-9,
+                   max_iters: int = 100,
+                   cg_max_iters: int = 50,
+                   warning: bool = True,
+                   ) -> Tuple[np.ndarray, int, float]:
+    """
+    Balances seed_vals to the targets using Newton's method
+
+    Finds the same kind of solution as `doubly_constrained_furness()`, a
+    factor per row and per column of `seed_vals`, but solves for the log
+    of those factors with Newton's method rather than alternately
+    scaling rows and columns. Each Newton step is solved approximately
+    using a diagonally preconditioned conjugate gradient.
+
+    Newton converges in far fewer iterations on badly conditioned seeds,
+    where the furness can take hundreds of iterations. However, each
+    iteration costs several passes over the matrix, so the furness is
+    usually quicker on well conditioned seeds.
+
+    Parameters
+    ----------
+    seed_vals:
+        Initial values for the balancing. Must be of shape
+        (len(n_rows), len(n_cols)). All values must be non-negative.
+
+    row_targets:
+        The target values for the sum of each row.
+        i.e np.sum(matrix, axis=1)
+
+    col_targets:
+        The target values for the sum of each column
+        i.e np.sum(matrix, axis=0)
+        Should have the same total as row_targets.
+
+    tol:
+        The maximum difference between the achieved and the target values
+        to tolerate before exiting early. Calculated the same way as in
+        `doubly_constrained_furness()`.
+
+    max_iters:
+        The maximum number of Newton iterations to complete before exiting.
+
+    cg_max_iters:
+        The maximum number of conjugate gradient iterations to use when
+        solving each Newton step.
+
+    warning:
+        Whether to print a warning or not when the tol cannot be met before
+        max_iters.
+
+    Returns
+    -------
+    balanced_matrix:
+        The final balanced matrix
+
+    completed_iters:
+        The number of completed iterations before exiting
+
+    achieved_rmse:
+        The Root Mean Squared Error difference achieved before exiting
+
+    Raises
+    ------
+    ValueError:
+        If the shape of seed_vals does not match the targets, or if
+        seed_vals contains any negative values.
+
+    See Also
+    --------
+    `doubly_constrained_furness()`
+    """
+    # Error check
+    if seed_vals.shape != (len(row_targets), len(col_targets)):
+        raise ValueError(
+            "The shape of the seed values given does not match the row "
+            "and col targets. Seed_vals are shape %s. Expected shape (%d, %d)."
+            % (str(seed_vals.shape), len(row_targets), len(col_targets))
+        )
+
+    if np.any(seed_vals < 0):
+        raise ValueError("Cannot balance a seed matrix containing negative values.")
+
+    # Init
+    seed_vals = np.asarray(seed_vals, dtype=float)
+    row_targets = np.asarray(row_targets, dtype=float)
+    col_targets = np.asarray(col_targets, dtype=float)
+
+    # Can return early if all 0 - probably shouldn't happen!
+    if row_targets.sum() == 0 or col_targets.sum() == 0:
+        warnings.warn("Newton balance given targets of 0. Returning all 0's")
+        return np.zeros(seed_vals.shape), 0, np.inf
+
+    # Rows and cols that can't be scaled, or target 0, are left out of
+    # the solve and zeroed at the end
+    active_rows = (seed_vals.sum(axis=1) > 0) & (row_targets > 0)
+    active_cols = (seed_vals.sum(axis=0) > 0) & (col_targets > 0)
+    balanced_mat = np.zeros(seed_vals.shape)
+    iter_num = 0
+
+    # Nothing can be scaled if there are no active rows or cols
+    if active_rows.any() and active_cols.any():
+        mat, iter_num, _ = _newton_solve(
+            seed=seed_vals[np.ix_(active_rows, active_cols)],
+            row_targets=row_targets[active_rows],
+            col_targets=col_targets[active_cols],
+            n_vals=len(row_targets),
+            tol=tol,
+            max_iters=max_iters,
+            cg_max_iters=cg_max_iters,
+        )
+
+        # Put the active rows and cols back into the full matrix
+        balanced_mat[np.ix_(active_rows, active_cols)] = mat
+
+    # Measure against the full targets, so any that can't be met count
+    cur_rmse = _newton_state(
+        seed=balanced_mat,
+        log_r=np.zeros(len(row_targets)),
+        log_c=np.zeros(len(col_targets)),
+        row_targets=row_targets,
+        col_targets=col_targets,
+        n_vals=len(row_targets),
+    ).rmse
+    early_exit = cur_rmse < tol
+
+    # Warn the user if we couldn't converge
+    if not early_exit and warning:
+        print("WARNING! The Newton balance could not meet its tolerance "
+              "within %d iterations, while achieving an RMSE difference of "
+              "%f. The values returned may not be accurate."
+              % (max_iters, cur_rmse))
+
+    return balanced_mat, iter_num, cur_rmse
 
 
 def _distribute_pa_internal(productions,
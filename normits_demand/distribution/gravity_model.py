@@ -10,9 +10,8 @@ import time
 import copy
 import queue
 import warnings
-import operator
-import functools
 import threading
+import functools
 import contextlib
 import dataclasses
 
@@ -44,6 +43,7 @@ from normits_demand.validation import checks
 from normits_demand.distribution import furness
 from normits_demand.cost import utils as cost_utils
 from normits_demand.concurrency import multithreading
+from normits_demand.concurrency import multiprocessing
 from normits_demand.concurrency import communication
 
 
@@ -104,6 +104,14 @@ class SharedArrays:
     jacobian_out: Dict[str, communication.SharedNumpyArrayHelper]
 
 
+class _StopCalibration(Exception):
+    """Raised to end `optimize.least_squares` once a calibration is good enough"""
+
+    def __init__(self, cost_args: List[float]):
+        super().__init__()
+        self.cost_args = cost_args
+
+
 class FurnessThreadBase(abc.ABC, multithreading.ReturnOrErrorThread):
     """Base class for running a threaded furness
 
@@ -113,6 +121,9 @@ class FurnessThreadBase(abc.ABC, multithreading.ReturnOrErrorThread):
     """
     # TODO(BT): Add functionality to allow this to be manually terminated too.
 
+    # Average number of cells in a run before areas are split by slicing
+    _min_run_length = 16
+
     def __init__(self,
                  area_mats: Dict[Any, np.ndarray],
                  furness_tol: float,
@@ -153,6 +164,73 @@ class FurnessThreadBase(abc.ABC, multithreading.ReturnOrErrorThread):
         self.warning = warning
         self.calib_area_keys = area_mats.keys()
 
+        # Flat cell indices of each area, used to split furnessed matrices.
+        # Areas are often made of long runs of cells (e.g. whole rows),
+        # which are cheaper to copy as slices than by fancy indexing
+        self._area_idx = {k: np.flatnonzero(v) for k, v in area_mats.items()}
+        self._area_runs = {k: self._contiguous_runs(v) for k, v in self._area_idx.items()}
+
+        # Reused between furnesses to sum the partial seed matrices
+        self._seed_accumulator: Optional[np.ndarray] = None
+
+    @staticmethod
+    def _contiguous_runs(idx: np.ndarray) -> Optional[List[Tuple[int, int]]]:
+        """Converts sorted flat indices into (start, stop) slices
+
+        Returns None if the runs are too short, on average, for slicing
+        to be quicker than fancy indexing.
+        """
+        if len(idx) == 0:
+            return list()
+
+        breaks = np.flatnonzero(np.diff(idx) != 1) + 1
+        if (len(breaks) + 1) * FurnessThreadBase._min_run_length > len(idx):
+            return None
+
+        starts = idx[np.concatenate([[0], breaks])]
+        stops = idx[np.concatenate([breaks - 1, [len(idx) - 1]])] + 1
+        return list(zip(starts.tolist(), stops.tolist()))
+
+    def _split_area(self, mat: np.ndarray, area_id: Any) -> np.ndarray:
+        """Extracts area_id's cells from mat, zeroing all other cells
+
+        Equivalent to `mat * self.area_mats[area_id]`, but only reads and
+        writes the cells within the area.
+        """
+        area_mat = np.zeros(mat.shape, dtype=mat.dtype)
+        area_flat = area_mat.ravel()
+        mat_flat = mat.ravel()
+
+        runs = self._area_runs[area_id]
+        if runs is None:
+            idx = self._area_idx[area_id]
+            area_flat[idx] = mat_flat[idx]
+        else:
+            for start, stop in runs:
+                area_flat[start:stop] = mat_flat[start:stop]
+        return area_mat
+
+    def _sum_seed_mats(self, seed_mats: Iterable[np.ndarray]) -> np.ndarray:
+        """Sums the partial seed matrices into a single matrix
+
+        Accumulates in place into a buffer that is reused between calls,
+        rather than allocating a new matrix every furness. The returned
+        matrix is overwritten by the next call, so it must not be kept.
+        The furness copies its seed values, so can be passed it directly.
+        """
+        seed_mats = iter(seed_mats)
+        first_mat = next(seed_mats)
+
+        seed_mat = self._seed_accumulator
+        if seed_mat is None or seed_mat.shape != first_mat.shape:
+            seed_mat = np.empty(first_mat.shape, dtype=float)
+            self._seed_accumulator = seed_mat
+
+        np.copyto(seed_mat, first_mat)
+        for mat in seed_mats:
+            np.add(seed_mat, mat, out=seed_mat)
+        return seed_mat
+
     @abc.abstractmethod
     def run_furness(self):
         """Gets data and runs the furness, returning results
@@ -188,6 +266,8 @@ class GravityModelBase(abc.ABC):
     _avg_cost_col = 'ave_km'        # Should be more generic
     _target_cost_distribution_cols = ['min', 'max', 'trips'] + [_avg_cost_col]
     _least_squares_method = 'trf'
+    _log_buffer_size = 25           # Rows to hold before writing to log
+    _reuse_last_gravity_run = False  # Skip a final run at the last run's params
 
     def __init__(self,
                  cost_function: cost.CostFunction,
@@ -195,6 +275,7 @@ class GravityModelBase(abc.ABC):
                  target_cost_distribution: pd.DataFrame,
                  running_log_path: os.PathLike,
                  cost_min_max_buf: float = 0.1,
+                 dtype: np.dtype = np.float64,
                  ):
         # Validate attributes
         target_cost_distribution = pd_utils.reindex_cols(
@@ -221,17 +302,33 @@ class GravityModelBase(abc.ABC):
         # Set attributes
         self.cost_function = cost_function
         self.cost_min_max_buf = cost_min_max_buf
-        self.cost_matrix = cost_matrix
+        self.dtype = dtype
+        # Seed and furnessed matrices take the layout of the costs. Keep it
+        # C-contiguous so self._cost_binding.sum() ravels them without a copy
+        self.cost_matrix = np.ascontiguousarray(cost_matrix, dtype=dtype)
         self.target_cost_distribution = self._update_tcd(target_cost_distribution)
         self.tcd_bin_edges = self._get_tcd_bin_edges(target_cost_distribution)
         self.running_log_path = running_log_path
 
+        # The cost matrix doesn't change, so only bin it once
+        self._cost_binding = cost_utils.CostBinding.from_bin_edges(
+            cost_matrix=self.cost_matrix,
+            bin_edges=self.tcd_bin_edges,
+        )
+
         # Running attributes
         self._loop_num: int = -1
         self._loop_start_time: float = -1.0
         self._loop_end_time: float = -1.0
         self._jacobian_mats: Dict[str, np.ndarray] = dict()
-        self._perceived_factors: np.ndarray = np.ones_like(self.cost_matrix)
+        self._target_band_share: np.ndarray = self.target_band_share
+        self._log_buffer: List[Dict[str, Any]] = list()
+        self._perceived_factors: np.ndarray = np.ones(self.cost_matrix.shape, dtype=dtype)
+        self._perceived_factors_set: bool = False
+        self._perceived_cost: Optional[np.ndarray] = None
+        self._perceived_band_binding: Optional[cost_utils.CostBinding] = None
+        self._stop_convergence: Optional[float] = None
+        self._last_gravity_args: Optional[np.ndarray] = None
 
         # Additional attributes
         self.initial_cost_params: Dict[str, Any] = dict()
@@ -251,23 +348,22 @@ class GravityModelBase(abc.ABC):
     def _update_tcd(tcd: pd.DataFrame) -> pd.DataFrame:
         """Extrapolates data where needed"""
         # Add in ave_km where needed
-        tcd['ave_km'] = np.where(
-            (tcd['ave_km'] == 0) | np.isnan(tcd['ave_km']),
-            tcd['min'],
-            tcd['ave_km'],
-        )
+        ave_km = tcd['ave_km'].to_numpy(dtype=float, copy=True)
+        missing = (ave_km == 0) | np.isnan(ave_km)
+        np.copyto(ave_km, tcd['min'].to_numpy(dtype=float), where=missing)
+        tcd['ave_km'] = ave_km
 
         # Generate the band shares using the given data
-        tcd['band_share'] = tcd['trips'].copy()
-        tcd['band_share'] /= tcd['band_share'].values.sum()
+        trips = tcd['trips'].to_numpy(dtype=float)
+        tcd['band_share'] = trips / trips.sum()
 
         return tcd
 
     @staticmethod
-    def _get_tcd_bin_edges(target_cost_distribution: pd.DataFrame) -> List[float]:
-        min_bounds = target_cost_distribution['min'].tolist()
-        max_bounds = target_cost_distribution['max'].tolist()
-        return [min_bounds[0]] + max_bounds
+    def _get_tcd_bin_edges(target_cost_distribution: pd.DataFrame) -> np.ndarray:
+        min_bounds = target_cost_distribution['min'].to_numpy()
+        max_bounds = target_cost_distribution['max'].to_numpy()
+        return np.concatenate([min_bounds[:1], max_bounds]).astype(float)
 
     def _initialise_calibrate_params(self) -> None:
         """Sets running params to their default values for a run"""
@@ -275,7 +371,12 @@ class GravityModelBase(abc.ABC):
         self._loop_start_time = timing.current_milli_time()
         self.initial_cost_params = dict()
         self.initial_convergence = 0
-        self._perceived_factors = np.ones_like(self.cost_matrix)
+        self._perceived_factors = np.ones(self.cost_matrix.shape, dtype=self.dtype)
+        self._perceived_factors_set = False
+        self._last_gravity_args = None
+
+        # Target doesn't change during a run, avoid pandas on the hot path
+        self._target_band_share = self.target_band_share
 
     def _cost_params_to_kwargs(self, args: List[Any]) -> Dict[str, Any]:
         """Converts a list or args into kwargs that self.cost_function expects"""
@@ -292,8 +393,7 @@ class GravityModelBase(abc.ABC):
         """Order params into a list that self.cost_function expects"""
         ordered_params = [0] * len(self.cost_function.kw_order)
         for name, value in params.items():
-            index = self.cost_function.kw_order.index(name)
-            ordered_params[index] = value
+            ordered_params[self.cost_function.kw_index[name]] = value
 
         return ordered_params
 
@@ -311,21 +411,34 @@ class GravityModelBase(abc.ABC):
 
         return min_vals, max_vals
 
-    def _cost_distribution(self,
-                           matrix: np.ndarray,
-                           tcd_bin_edges: List[float],
-                           ) -> np.ndarray:
-        """Returns the distribution of matrix across self.tcd_bin_edges"""
+    def _least_squares_method_and_bounds(self) -> Tuple[str, Tuple[Any, Any]]:
+        """Picks the `optimize.least_squares` method and matching bounds
+
+        When none of the cost params are bounded, the faster 'lm' method
+        is used. 'lm' doesn't accept bounds and needs at least as many
+        bands as cost params. Otherwise self._least_squares_method is used.
+        """
+        min_vals, max_vals = self._order_bounds()
+        unbounded = np.all(np.isneginf(min_vals)) and np.all(np.isposinf(max_vals))
+        enough_bands = len(self.target_cost_distribution) >= len(min_vals)
+
+        if unbounded and enough_bands:
+            return 'lm', (-np.inf, np.inf)
+        return self._least_squares_method, (min_vals, max_vals)
+
+    def _cost_distribution(self, matrix: np.ndarray) -> np.ndarray:
+        """Returns the normalised distribution of matrix across self.tcd_bin_edges"""
         _, normalised = cost_utils.normalised_cost_distribution(
             matrix=matrix,
             cost_matrix=self.cost_matrix,
-            bin_edges=tcd_bin_edges,
+            cost_binding=self._cost_binding,
         )
         return normalised
 
     def _guess_init_params(self,
                            cost_args: List[float],
-                           target_cost_distribution: pd.DataFrame,
+                           avg_cost_vals: np.ndarray,
+                           target_band_share: np.ndarray,
                            ):
         """Internal function of _estimate_init_params()
 
@@ -335,15 +448,12 @@ class GravityModelBase(abc.ABC):
         # Convert the cost function args back into kwargs
         cost_kwargs = self._cost_params_to_kwargs(cost_args)
 
-        # Used to optionally increase the cost of long distance trips
-        avg_cost_vals = target_cost_distribution[self._avg_cost_col].values
-
         # Estimate what the cost function will do to the costs - on average
         estimated_cost_vals = self.cost_function.calculate(avg_cost_vals, **cost_kwargs)
         estimated_band_shares = estimated_cost_vals / estimated_cost_vals.sum()
 
         # return the residuals to the target
-        return target_cost_distribution['band_share'].values - estimated_band_shares
+        return target_band_share - estimated_band_shares
 
     def _estimate_init_params(self,
                               init_params: Dict[str, Any],
@@ -356,12 +466,24 @@ class GravityModelBase(abc.ABC):
         very coarse grained estimation, but can be used to guess around about
         where the best init params are.
         """
+        # Extract the target once, rather than on every guess
+        guess_kwargs = {
+            # Used to optionally increase the cost of long distance trips
+            'avg_cost_vals': np.ascontiguousarray(
+                target_cost_distribution[self._avg_cost_col].to_numpy(dtype=float)
+            ),
+            'target_band_share': np.ascontiguousarray(
+                target_cost_distribution['band_share'].to_numpy(dtype=float)
+            ),
+        }
+
+        method, bounds = self._least_squares_method_and_bounds()
         result = optimize.least_squares(
             fun=self._guess_init_params,
             x0=self._order_init_params(init_params),
-            method=self._least_squares_method,
-            bounds=self._order_bounds(),
-            kwargs={'target_cost_distribution': target_cost_distribution},
+            method=method,
+            bounds=bounds,
+            kwargs=guess_kwargs,
         )
         init_params = self._cost_params_to_kwargs(result.x)
 
@@ -383,7 +505,7 @@ class GravityModelBase(abc.ABC):
         This function updates the _perceived_factors class variable.
         """
         # Init
-        target_band_share = self.target_cost_distribution['band_share'].values
+        target_band_share = self._target_band_share
 
         # Calculate the adjustment per band in target band share.
         # Adjustment is clipped between 0.5 and 2 to limit affect
@@ -395,35 +517,42 @@ class GravityModelBase(abc.ABC):
         ) ** 0.5
         perc_factors = np.clip(perc_factors, 0.5, 2)
 
-        # Initialise loop
-        perc_factors_mat = np.ones_like(self.cost_matrix)
-        min_vals = self.target_cost_distribution['min']
-        max_vals = self.target_cost_distribution['max']
-
-        # Convert into factors for the cost matrix
-        for min_val, max_val, factor in zip(min_vals, max_vals, perc_factors):
-            # Get proportion of all trips that are in this band
-            distance_mask = (
-                (self.cost_matrix >= min_val)
-                & (self.cost_matrix < max_val)
+        # Bin the cost matrix into the target bands, once per calibrator
+        if self._perceived_band_binding is None:
+            self._perceived_band_binding = cost_utils.CostBinding.from_bounds(
+                cost_matrix=self.cost_matrix,
+                min_bounds=self.target_cost_distribution['min'].to_numpy(),
+                max_bounds=self.target_cost_distribution['max'].to_numpy(),
             )
 
-            perc_factors_mat = np.multiply(
-                perc_factors_mat,
-                factor,
-                where=distance_mask,
-                out=perc_factors_mat,
-            )
+        # Convert into factors for the cost matrix.
+        # Cells outside of all bands are left with a factor of 1
+        band_factors = np.append(perc_factors, 1).astype(self.dtype, copy=False)
+        perc_factors_mat = band_factors[self._perceived_band_binding.bin_index]
 
         # Assign to class attribute
-        self._perceived_factors = perc_factors_mat
+        self._perceived_factors = perc_factors_mat.reshape(self.cost_matrix.shape)
+        self._perceived_factors_set = True
+        self._last_gravity_args = None
 
     def _apply_perceived_factors(self, cost_matrix: np.ndarray) -> np.ndarray:
-        return cost_matrix * self._perceived_factors
+        """Applies the perceived factors to cost_matrix
+
+        Until _calculate_perceived_factors() has been called the factors
+        are all 1, so cost_matrix is returned as is. Otherwise, the
+        perceived costs are written into a buffer that is reused between
+        calls. The returned array should be treated as read only.
+        """
+        if not self._perceived_factors_set:
+            return cost_matrix
+
+        if self._perceived_cost is None or self._perceived_cost.shape != cost_matrix.shape:
+            self._perceived_cost = np.empty(cost_matrix.shape, dtype=self.dtype)
+
+        return np.multiply(cost_matrix, self._perceived_factors, out=self._perceived_cost)
 
     def _gravity_function(self,
                           cost_args: List[float],
-                          diff_step: float,
                           ):
         """Returns residuals to target cost distribution
 
@@ -439,6 +568,9 @@ class GravityModelBase(abc.ABC):
             self.achieved_residuals
             self.achieved_distribution
             self.optimal_cost_params
+
+        If `self._stop_convergence` is set and the achieved convergence
+        meets it, `_StopCalibration` is raised to end the search.
         """
         # Convert the cost function args back into kwargs
         cost_kwargs = self._cost_params_to_kwargs(cost_args)
@@ -449,32 +581,19 @@ class GravityModelBase(abc.ABC):
         # Calculate initial matrix through cost function
         init_matrix = self.cost_function.calculate(cost_matrix, **cost_kwargs)
 
-        # Do some prep for jacobian calculations
-        # TODO(BT): Move this into the Jacobian function. We don't need it here
-        #  and it's just using it memory before we need to. Could single loop it
-        #  too, so that only one extra cost matrix is needed. NOT n_cost_params
-        self._jacobian_mats = {'base': init_matrix.copy()}
-        for cost_param in self.cost_function.kw_order:
-            # Adjust cost slightly
-            adj_cost_kwargs = cost_kwargs.copy()
-            adj_cost_kwargs[cost_param] += adj_cost_kwargs[cost_param] * diff_step
-
-            # Calculate adjusted cost
-            adj_cost = self.cost_function.calculate(cost_matrix, **adj_cost_kwargs)
-
-            self._jacobian_mats[cost_param] = adj_cost
-
         # Furness trips to trip ends
         matrix, iters, rmse = self.gravity_furness(seed_matrix=init_matrix)
 
-        # Store for the jacobian calculations
-        self._jacobian_mats['final'] = matrix.copy()
+        # Store for the jacobian calculations. The furness leaves its seed
+        # untouched and neither matrix is modified after this, so there's
+        # no need to copy them
+        self._jacobian_mats = {'base': init_matrix, 'final': matrix}
 
         # Convert matrix into an achieved distribution curve
-        achieved_band_shares = self._cost_distribution(matrix, self.tcd_bin_edges)
+        achieved_band_shares = self._cost_distribution(matrix)
 
         # Evaluate this run
-        target_band_shares = self.target_cost_distribution['band_share'].values
+        target_band_shares = self._target_band_share
         convergence = math_utils.curve_convergence(target_band_shares, achieved_band_shares)
         achieved_residuals = target_band_shares - achieved_band_shares
 
@@ -495,14 +614,7 @@ class GravityModelBase(abc.ABC):
         })
 
         # Append this iteration to log file
-        if self.running_log_path is not None:
-            file_ops.safe_dataframe_to_csv(
-                pd.DataFrame(log_dict, index=[0]),
-                self.running_log_path,
-                mode='a',
-                header=(not os.path.exists(self.running_log_path)),
-                index=False,
-            )
+        self._write_log(log_dict)
 
         # Update loop params and return the achieved band shares
         self._loop_num += 1
@@ -514,6 +626,7 @@ class GravityModelBase(abc.ABC):
         self.achieved_convergence = convergence
         self.achieved_residuals = achieved_residuals
         self.achieved_distribution = matrix
+        self._last_gravity_args = np.array(cost_args, dtype=float)
 
         # Store the initial values to log later
         if self.initial_cost_params is None:
@@ -521,8 +634,35 @@ class GravityModelBase(abc.ABC):
         if self.initial_convergence is None:
             self.initial_convergence = convergence
 
+        # Nothing to gain from further iterations, end the search early
+        if self._stop_convergence is not None and convergence >= self._stop_convergence:
+            raise _StopCalibration(list(cost_args))
+
         return achieved_residuals
 
+    def _write_log(self, log_dict: Dict[str, Any]) -> None:
+        """Buffers a row for the running log, writing out when buffer is full"""
+        if self.running_log_path is None:
+            return
+
+        self._log_buffer.append(log_dict)
+        if len(self._log_buffer) >= self._log_buffer_size:
+            self._flush_log()
+
+    def _flush_log(self) -> None:
+        """Appends any buffered rows to the running log"""
+        if self.running_log_path is None or len(self._log_buffer) == 0:
+            return
+
+        file_ops.safe_dataframe_to_csv(
+            pd.DataFrame(self._log_buffer),
+            self.running_log_path,
+            mode='a',
+            header=(not os.path.exists(self.running_log_path)),
+            index=False,
+        )
+        self._log_buffer = list()
+
     def _jacobian_function(
             self,
             cost_args: List[float],
@@ -536,19 +676,28 @@ class GravityModelBase(abc.ABC):
         in the cost parameters would do to final furnessed matrix. This is
         then formatted into a Jacobian for optimize.least_squares to use.
 
+        The slightly adjusted cost matrices are only calculated here, as
+        `optimize.least_squares` evaluates _gravity_function more often
+        than the Jacobian.
+
         Used by the `optimize.least_squares` function.
         """
         # Initialise the output
-        n_bands = len(self.target_cost_distribution['band_share'].values)
+        n_bands = len(self._target_band_share)
         n_cost_params = len(cost_args)
         jacobian = np.zeros((n_bands, n_cost_params))
 
         # Convert the cost function args back into kwargs
         cost_kwargs = self._cost_params_to_kwargs(cost_args)
 
+        # Calculate the cost with each cost param adjusted slightly
+        adj_costs = self._adjusted_costs(cost_kwargs, diff_step)
+
         # Estimate what the furness does to the matrix
+        final_mat = self._jacobian_mats['final']
+        final_total = final_mat.sum()
         furness_factor = np.divide(
-            self._jacobian_mats['final'],
+            final_mat,
             self._jacobian_mats['base'],
             where=self._jacobian_mats['base'] != 0,
             out=np.zeros_like(self._jacobian_mats['base']),
@@ -559,30 +708,29 @@ class GravityModelBase(abc.ABC):
         estimated_mats = dict.fromkeys(self.cost_function.kw_order)
         for cost_param in self.cost_function.kw_order:
             # Estimate what the furness would have done
-            furness_mat = self._jacobian_mats[cost_param] * furness_factor
-            if furness_mat.sum() == 0:
+            furness_mat = adj_costs[cost_param] * furness_factor
+            furness_total = furness_mat.sum()
+            if furness_total == 0:
                 raise ValueError("estimated furness matrix total is 0")
-            adj_weights = furness_mat / furness_mat.sum()
-            adj_final = self._jacobian_mats['final'].sum() * adj_weights
+
+            # Scale to the final total in place
+            furness_mat *= final_total / furness_total
 
             # Place in dictionary to send to Jacobian
-            estimated_mats[cost_param] = adj_final
+            estimated_mats[cost_param] = furness_mat
 
         # Control estimated matrices to final matrix
         controlled_mats = self.jacobian_furness(
             seed_matrices=estimated_mats,
-            row_targets=self._jacobian_mats['final'].sum(axis=1),
-            col_targets=self._jacobian_mats['final'].sum(axis=0),
+            row_targets=final_mat.sum(axis=1),
+            col_targets=final_mat.sum(axis=0),
             ignore_result=ignore_result,
         )
 
         # Calculate the Jacobian
         for i, cost_param in enumerate(self.cost_function.kw_order):
             # Turn into bands
-            achieved_band_shares = self._cost_distribution(
-                matrix=controlled_mats[cost_param],
-                tcd_bin_edges=self.tcd_bin_edges,
-            )
+            achieved_band_shares = self._cost_distribution(controlled_mats[cost_param])
 
             # Calculate the Jacobian for this cost param
             jacobian_residuals = self.achieved_band_share - achieved_band_shares
@@ -594,6 +742,57 @@ class GravityModelBase(abc.ABC):
 
         return jacobian
 
+    def _least_squares(self,
+                       x0: List[Any],
+                       ls_kwargs: Dict[str, Any],
+                       ) -> optimize.OptimizeResult:
+        """Runs `optimize.least_squares`, allowing an early stop
+
+        If the search is ended early by `_StopCalibration`, a result
+        holding the cost params that met `self._stop_convergence` is
+        returned instead.
+        """
+        try:
+            return optimize.least_squares(x0=x0, **ls_kwargs)
+        except _StopCalibration as stop:
+            return optimize.OptimizeResult(x=np.array(stop.cost_args))
+
+    def _adjusted_costs(self,
+                        cost_kwargs: Dict[str, Any],
+                        diff_step: float,
+                        ) -> Dict[str, np.ndarray]:
+        """Calculates the cost with each cost param adjusted by diff_step
+
+        If the cost function defines its partial derivatives, the adjusted
+        costs are extrapolated from the base matrix stored by the previous
+        call to self._gravity_function. Otherwise the cost function is
+        evaluated again with each adjusted param.
+
+        Returns a dictionary of {cost_param: adjusted_cost}.
+        """
+        cost_matrix = self._apply_perceived_factors(self.cost_matrix)
+
+        if self.cost_function.jacobian_function is not None:
+            base_mat = self._jacobian_mats['base']
+            derivatives = self.cost_function.calculate_jacobian(cost_matrix, **cost_kwargs)
+
+            adj_costs = dict.fromkeys(self.cost_function.kw_order)
+            for cost_param in self.cost_function.kw_order:
+                adj_cost = derivatives[cost_param]
+                adj_cost *= cost_kwargs[cost_param] * diff_step
+                adj_cost += base_mat
+                adj_costs[cost_param] = adj_cost
+            return adj_costs
+
+        adj_cost_kwargs_list = list()
+        for cost_param in self.cost_function.kw_order:
+            adj_cost_kwargs = cost_kwargs.copy()
+            adj_cost_kwargs[cost_param] += adj_cost_kwargs[cost_param] * diff_step
+            adj_cost_kwargs_list.append(adj_cost_kwargs)
+
+        adj_costs = self.cost_function.calculate_batch(cost_matrix, adj_cost_kwargs_list)
+        return dict(zip(self.cost_function.kw_order, adj_costs))
+
     def _calibrate(self,
                    init_params: Dict[str, Any],
                    calibrate_params: bool = True,
@@ -603,80 +802,96 @@ class GravityModelBase(abc.ABC):
                    grav_max_iters: int = 100,
                    failure_tol: float = 0,
                    verbose: int = 0,
+                   stop_convergence: Optional[float] = None,
                    ) -> None:
         """Internal function of calibrate.
 
         Runs the gravity model, and calibrates the optimal cost parameters
         if calibrate params is set to True. Will do a final run of the
         gravity_function with the optimal parameter found before return.
+        If stop_convergence is given, calibration stops as soon as a run
+        of the gravity model achieves it.
         """
-        # Initialise running params
-        self._initialise_calibrate_params()
-
-        # Calculate the optimal cost parameters if we're calibrating
-        if calibrate_params is True:
-            # Build the kwargs, we need them a few times
-            ls_kwargs = {
-                "fun": self._gravity_function,
-                "method": self._least_squares_method,
-                "bounds": self._order_bounds(),
-                "jac": self._jacobian_function,
-                "verbose": verbose,
-                "ftol": ftol,
-                "xtol": xtol,
-                "max_nfev": grav_max_iters,
-                "kwargs": {'diff_step': diff_step},
-            }
-
-            # Can sometimes fail with infeasible arguments, workaround
-            result: Optional = None
-
-            try:
-                ordered_init_params = self._order_init_params(init_params)
-                result = optimize.least_squares(x0=ordered_init_params, **ls_kwargs)
-            except ValueError as err:
-                if "infeasible" in str(err):
+        # Logs are buffered, make sure they are always written out
+        try:
+            # Initialise running params
+            self._initialise_calibrate_params()
+
+            # Calculate the optimal cost parameters if we're calibrating
+            if calibrate_params is True:
+                # Build the kwargs, we need them a few times
+                method, bounds = self._least_squares_method_and_bounds()
+                ls_kwargs = {
+                    "fun": self._gravity_function,
+                    "method": method,
+                    "bounds": bounds,
+                    "jac": functools.partial(self._jacobian_function, diff_step=diff_step),
+                    "verbose": verbose,
+                    "ftol": ftol,
+                    "xtol": xtol,
+                    "max_nfev": grav_max_iters,
+                }
+
+                # Can sometimes fail with infeasible arguments, workaround
+                result: Optional = None
+
+                # Only stop early while searching
+                self._stop_convergence = stop_convergence
+
+                try:
+                    ordered_init_params = self._order_init_params(init_params)
+                    result = self._least_squares(ordered_init_params, ls_kwargs)
+                except ValueError as err:
+                    if "infeasible" in str(err):
+                        LOG.info(
+                            "Got the following error while trying to run "
+                            "`optimize.least_squares()`. Will try again with the "
+                            "`default_params`"
+                        )
+                    else:
+                        raise err
+
+                # If performance was terrible, try again with default params
+                failed = self.achieved_convergence <= failure_tol
+                if result is not None and failed:
                     LOG.info(
-                        "Got the following error while trying to run "
-                        "`optimize.least_squares()`. Will try again with the "
-                        "`default_params`"
+                        "Performance wasn't great with the given `init_params`. "
+                        f"Achieved '{self.achieved_convergence}', and the `failure_tol` "
+                        f"is set to {failure_tol}. Trying again with the "
+                        f"`default_params`"
                     )
-                else:
-                    raise err
-
-            # If performance was terrible, try again with default params
-            failed = self.achieved_convergence <= failure_tol
-            if result is not None and failed:
-                LOG.info(
-                    "Performance wasn't great with the given `init_params`. "
-                    f"Achieved '{self.achieved_convergence}', and the `failure_tol` "
-                    f"is set to {failure_tol}. Trying again with the "
-                    f"`default_params`"
-                )
-
-            if result is None:
-                result = optimize.least_squares(
-                    x0=self._order_init_params(self.cost_function.default_params),
-                    **ls_kwargs,
-                )
 
-            # Make sure we had a successful run
-            if result is not None:
-                optimal_params = result.x
-            else:
-                raise nd.NormitsDemandError(
-                    "No result has been set. Check the internal logic! This "
-                    "shouldn't be possible."
-                )
+                if result is None:
+                    result = self._least_squares(
+                        self._order_init_params(self.cost_function.default_params),
+                        ls_kwargs,
+                    )
 
-            # BACKLOG: Try random init_params as a final option
+                # Make sure we had a successful run
+                if result is not None:
+                    optimal_params = result.x
+                else:
+                    raise nd.NormitsDemandError(
+                        "No result has been set. Check the internal logic! This "
+                        "shouldn't be possible."
+                    )
 
-        else:
-            optimal_params = self._order_init_params(init_params)
+                # BACKLOG: Try random init_params as a final option
 
-        # Run an optimal version of the gravity
-        self.optimal_cost_params = self._cost_params_to_kwargs(optimal_params)
-        self._gravity_function(optimal_params, diff_step=diff_step)
+            else:
+                optimal_params = self._order_init_params(init_params)
+
+            # Run an optimal version of the gravity.
+            # The achieved attributes are already set if it was the last run
+            self._stop_convergence = None
+            self.optimal_cost_params = self._cost_params_to_kwargs(optimal_params)
+            last_run = self._last_gravity_args
+            repeat_run = last_run is not None and np.array_equal(last_run, optimal_params)
+            if not (self._reuse_last_gravity_run and repeat_run):
+                self._gravity_function(optimal_params)
+        finally:
+            self._stop_convergence = None
+            self._flush_log()
 
     @abc.abstractmethod
     def gravity_furness(
@@ -754,6 +969,10 @@ class GravityModelBase(abc.ABC):
 class GravityModelCalibrator(GravityModelBase):
     # TODO(BT): Write GravityModelCalibrator docs
 
+    _balance_methods = ['furness', 'newton']
+    _reuse_last_gravity_run = True
+    _perceived_factors_tol = 1e-3   # Skip recalibrating if all factors are this close to 1
+
     def __init__(self,
                  row_targets: np.ndarray,
                  col_targets: np.ndarray,
@@ -765,31 +984,63 @@ class GravityModelCalibrator(GravityModelBase):
                  furness_tol: float,
                  running_log_path: os.PathLike,
                  use_perceived_factors: bool = True,
+                 dtype: np.dtype = np.float64,
+                 balance_method: str = 'furness',
                  ):
         # TODO(BT): Write GravityModelCalibrator __init__ docs
+        # dtype sets the precision of the cost, seed and furnessed
+        # matrices. np.float32 halves the memory moved by the furness,
+        # but furness_tol needs loosening to suit the lower precision.
+        # balance_method chooses between furness.doubly_constrained_furness
+        # ('furness') and furness.newton_balance ('newton'). furness_max_iters
+        # only limits the furness, newton_balance keeps its own default.
+        if balance_method not in self._balance_methods:
+            raise ValueError(
+                "balance_method must be one of %s. Got '%s'."
+                % (self._balance_methods, balance_method)
+            )
+
         super().__init__(
             cost_function=cost_function,
             cost_matrix=cost_matrix,
             target_cost_distribution=target_cost_distribution,
             running_log_path=running_log_path,
+            dtype=dtype,
         )
 
         # Set attributes
-        self.row_targets = row_targets
-        self.col_targets = col_targets
+        self.row_targets = np.asarray(row_targets, dtype=dtype)
+        self.col_targets = np.asarray(col_targets, dtype=dtype)
         self.furness_max_iters = furness_max_iters
         self.furness_tol = furness_tol
         self.use_perceived_factors = use_perceived_factors
+        self.balance_method = balance_method
 
         self.target_convergence = target_convergence
 
+        # Furness factors from the last call, used to warm start the next
+        self._furness_row_factors = None
+        self._furness_col_factors = None
+
+    def _initialise_calibrate_params(self) -> None:
+        """Sets running params to their default values for a run"""
+        super()._initialise_calibrate_params()
+        self._furness_row_factors = None
+        self._furness_col_factors = None
+
     def gravity_furness(self,
                         seed_matrix: np.ndarray,
                         ) -> Tuple[np.ndarray, int, float]:
         """Runs a doubly constrained furness on the seed matrix
 
-        Wrapper around furness.doubly_constrained_furness, using class
-        attributes to set up the function call.
+        Wrapper around furness.doubly_constrained_furness_with_factors,
+        using class attributes to set up the function call. Successive
+        seed matrices in a calibration run differ only slightly, so the
+        furness is warm started with the factors from the previous call.
+        If self.balance_method is 'newton', furness.newton_balance is
+        used instead, with its own default max_iters. Each Newton iteration
+        costs far more than a furness iteration, so self.furness_max_iters
+        is not used.
 
         Parameters
         ----------
@@ -807,14 +1058,36 @@ class GravityModelCalibrator(GravityModelBase):
         achieved_rmse:
             The Root Mean Squared Error difference achieved before exiting
         """
-        return furness.doubly_constrained_furness(
-            seed_vals=seed_matrix,
-            row_targets=self.row_targets,
-            col_targets=self.col_targets,
-            tol=self.furness_tol,
-            max_iters=self.furness_max_iters,
+        if self.balance_method == 'newton':
+            return furness.newton_balance(
+                seed_vals=seed_matrix,
+                row_targets=self.row_targets,
+                col_targets=self.col_targets,
+                tol=self.furness_tol,
+            )
+
+        furnessed_mat, iters, rmse, row_factors, col_factors = (
+            furness.doubly_constrained_furness_with_factors(
+                seed_vals=seed_matrix,
+                row_targets=self.row_targets,
+                col_targets=self.col_targets,
+                tol=self.furness_tol,
+                max_iters=self.furness_max_iters,
+                init_row_factors=self._furness_row_factors,
+                init_col_factors=self._furness_col_factors,
+            )
         )
 
+        # Only keep factors that are safe to start from next time
+        if np.all(np.isfinite(row_factors)) and np.all(np.isfinite(col_factors)):
+            self._furness_row_factors = row_factors
+            self._furness_col_factors = col_factors
+        else:
+            self._furness_row_factors = None
+            self._furness_col_factors = None
+
+        return furnessed_mat, iters, rmse
+
     def jacobian_furness(self,
                          seed_matrices: Dict[str, np.ndarray],
                          row_targets: np.ndarray,
@@ -883,7 +1156,9 @@ class GravityModelCalibrator(GravityModelBase):
         """Finds the optimal parameters for self.cost_function
 
         Optimal parameters are found using `scipy.optimize.least_squares`
-        to fit the distributed row/col targets to self.target_tld. Once
+        to fit the distributed row/col targets to self.target_tld. The
+        search stops early once an iteration meets self.target_convergence,
+        or beats it by enough to skip perceived factors. Once
         the optimal parameters are found, the gravity model is run one last
         time to check the self.target_convergence has been met. This also
         populates a number of attributes with values from the optimal run:
@@ -975,6 +1250,14 @@ class GravityModelCalibrator(GravityModelBase):
                 target_cost_distribution=self.target_cost_distribution,
             )
 
+        # Perceived factors are only skipped once upper_limit is beaten
+        upper_limit = self.target_convergence + 0.03
+        lower_limit = self.target_convergence - 0.15
+        if self.use_perceived_factors:
+            stop_convergence = upper_limit
+        else:
+            stop_convergence = self.target_convergence
+
         # Figure out the optimal cost params
         self._calibrate(
             init_params=init_params,
@@ -985,6 +1268,7 @@ class GravityModelCalibrator(GravityModelBase):
             grav_max_iters=grav_max_iters,
             failure_tol=failure_tol,
             verbose=verbose,
+            stop_convergence=stop_convergence,
         )
 
         # Just return if not using perceived factors
@@ -992,9 +1276,6 @@ class GravityModelCalibrator(GravityModelBase):
             return self.optimal_cost_params
 
         # ## APPLY PERCEIVED FACTORS IF WE CAN ## #
-        upper_limit = self.target_convergence + 0.03
-        lower_limit = self.target_convergence - 0.15
-
         # Just return if upper limit has been beaten
         if self.achieved_convergence > upper_limit:
             return self.optimal_cost_params
@@ -1014,6 +1295,11 @@ class GravityModelCalibrator(GravityModelBase):
         # If here, it's safe to use perceived factors
         self._calculate_perceived_factors()
 
+        # Recalibrating won't change anything if the factors barely do
+        max_deviation = np.max(np.abs(self._perceived_factors - 1))
+        if max_deviation < self._perceived_factors_tol:
+            return self.optimal_cost_params
+
         # Calibrate again, using the perceived factors
         self._calibrate(
             init_params=self.optimal_cost_params.copy(),
@@ -1023,6 +1309,7 @@ class GravityModelCalibrator(GravityModelBase):
             xtol=xtol,
             grav_max_iters=grav_max_iters,
             verbose=verbose,
+            stop_convergence=self.target_convergence,
         )
 
         if self.achieved_convergence < self.target_convergence:
@@ -1507,8 +1794,8 @@ class FurnessThreadInterfaceSharedArrays(FurnessThreadInterfaceBase):
         # Add the cached matrix data to the shared arrays
         for jac_key, array_in in self.jacobian_in_array.items():
             array_in.apply_local_data(
-                data=copy.copy(self._jacobian_array_cache[jac_key][thread_id]),
-                operation=operator.add,
+                data=self._jacobian_array_cache[jac_key][thread_id],
+                operation=np.add,
             )
 
         # Send the cached queue data - informs array has data
@@ -1769,7 +2056,7 @@ class GravityFurnessThreadQueues(FurnessThreadBase):
         """
         # ## GET SEED MAT DATA ## #
         seed_mat_dict = multithreading.get_data_from_queue_dict(self.getter_qs)
-        seed_mat = functools.reduce(operator.add, seed_mat_dict.values())
+        seed_mat = self._sum_seed_mats(seed_mat_dict.values())
 
         # ## FURNESS ## #
         furnessed_mat, iters, rmse = furness.doubly_constrained_furness(
@@ -1785,7 +2072,7 @@ class GravityFurnessThreadQueues(FurnessThreadBase):
         # Split back out into areas and return
         for area_id in self.calib_area_keys:
             data = FurnessResults(
-                mat=furnessed_mat * self.area_mats[area_id],
+                mat=self._split_area(furnessed_mat, area_id),
                 completed_iters=iters,
                 achieved_rmse=rmse,
             )
@@ -1894,8 +2181,8 @@ class JacobianFurnessThreadSharedArrays(FurnessThreadBase):
             ignore_list.append(request.ignore_result)
 
         # Combine individual items
-        row_targets = functools.reduce(operator.add, row_targets_list)
-        col_targets = functools.reduce(operator.add, col_targets_list)
+        row_targets = np.add.reduce(row_targets_list)
+        col_targets = np.add.reduce(col_targets_list)
         all_ignore = all(ignore_list)
 
         return seed_mats, row_targets, col_targets, all_ignore
@@ -2025,9 +2312,9 @@ class JacobianFurnessThreadQueues(FurnessThreadBase):
             ignore_threads[thread_id] = request.ignore_result
 
         # Combine individual items
-        seed_mat = functools.reduce(operator.add, seed_mat_list)
-        row_targets = functools.reduce(operator.add, row_targets_list)
-        col_targets = functools.reduce(operator.add, col_targets_list)
+        seed_mat = self._sum_seed_mats(seed_mat_list)
+        row_targets = np.add.reduce(row_targets_list)
+        col_targets = np.add.reduce(col_targets_list)
 
         return seed_mat, row_targets, col_targets, ignore_threads
 
@@ -2060,7 +2347,7 @@ class JacobianFurnessThreadQueues(FurnessThreadBase):
             # Split back out into areas and return
             for area_id in self.calib_area_keys:
                 data = FurnessResults(
-                    mat=furnessed_mat * self.area_mats[area_id],
+                    mat=self._split_area(furnessed_mat, area_id),
                     completed_iters=iters,
                     achieved_rmse=rmse,
                 )
@@ -2098,6 +2385,7 @@ class SingleTLDCalibratorThreadBase(multithreading.ReturnOrErrorThread, GravityM
                  grav_max_iters: int = 100,
                  verbose: int = 0,
                  thread_name: str = None,
+                 dtype: np.dtype = np.float64,
                  **kwargs,
                  ):
         # Call parent classes
@@ -2115,6 +2403,7 @@ class SingleTLDCalibratorThreadBase(multithreading.ReturnOrErrorThread, GravityM
             cost_matrix=cost_matrix,
             target_cost_distribution=target_cost_distribution,
             running_log_path=running_log_path,
+            dtype=dtype,
         )
 
         # Assign other attributes
@@ -2187,8 +2476,8 @@ class SingleTLDCalibratorThreadBase(multithreading.ReturnOrErrorThread, GravityM
 
             self._gravity_function(
                 cost_args=self._order_cost_params(self.optimal_cost_params),
-                diff_step=self.diff_step,
             )
+        self._flush_log()
 
         return self.optimal_cost_params
 
@@ -2320,7 +2609,7 @@ class SingleTLDCalibratorThreadSharedArrays(SingleTLDCalibratorThreadBase):
 
         # ## SEND ## #
         # Add the data to the shared array - and mark queue
-        self.gravity_putter_array.apply_local_data(seed_matrix, operator.add)
+        self.gravity_putter_array.apply_local_data(seed_matrix, np.add)
         self.gravity_putter_q.put(1)
 
         # ## RECEIVE ## #
@@ -2391,7 +2680,7 @@ class SingleTLDCalibratorThreadSharedArrays(SingleTLDCalibratorThreadBase):
         for cost_param, seed_matrix in seed_matrices.items():
             self.jacobian_putter_array[cost_param].apply_local_data(
                 data=seed_matrix,
-                operation=operator.add,
+                operation=np.add,
             )
 
         # Create a request and place on the queue
@@ -2619,8 +2908,11 @@ class MultiAreaGravityModelCalibrator:
                  running_log_path: os.PathLike,
                  use_perceived_factors: bool = True,
                  memory_optimised: bool = True,
+                 dtype: np.dtype = np.float64,
                  ):
         # TODO(BT): Write MultiAreaGravityModelCalibrator __init__ docs
+        # dtype sets the precision of the cost, seed and furnessed
+        # matrices, as in GravityModelCalibrator.
         # Set up logging
         if running_log_path is not None:
             dir_name, _ = os.path.split(running_log_path)
@@ -2639,10 +2931,13 @@ class MultiAreaGravityModelCalibrator:
                 )
 
         # Set attributes
-        self.row_targets = row_targets
-        self.col_targets = col_targets
+        self.dtype = dtype
+        self.row_targets = np.asarray(row_targets, dtype=dtype)
+        self.col_targets = np.asarray(col_targets, dtype=dtype)
         self.cost_function = cost_function
-        self.cost_matrix = cost_matrix
+        # Seed and area matrices take the layout of the costs. Keep it
+        # C-contiguous so each area's CostBinding.sum() ravels without a copy
+        self.cost_matrix = np.ascontiguousarray(cost_matrix, dtype=dtype)
         self.furness_max_iters = furness_max_iters
         self.furness_tol = furness_tol
         self.use_perceived_factors = use_perceived_factors
@@ -2652,7 +2947,7 @@ class MultiAreaGravityModelCalibrator:
         self.target_convergence = target_convergence
 
         # Ensure the calibration stuff was passed in correctly
-        self.calibration_matrix = calibration_matrix
+        self.calibration_matrix = np.ascontiguousarray(calibration_matrix)
         calib_areas = list(np.unique(calibration_matrix))
         self.calib_areas = du.list_safe_remove(calib_areas, [self._ignore_calib_area_value])
 
@@ -2670,10 +2965,22 @@ class MultiAreaGravityModelCalibrator:
                 % (self.calib_areas, calibration_naming.keys())
             )
 
+        # Boolean mask of each area's cells, only built once per calibrator
+        self._area_mats = {
+            area_id: self.calibration_matrix == area_id for area_id in self.calib_areas
+        }
+
         self.calibration_naming = calibration_naming
         self.target_cost_distributions = self._update_tcds(target_cost_distributions)
         self.tcd_bin_edges = self._get_tcd_bin_edges(target_cost_distributions)
 
+        # Cells outside of an area are zeroed out of its matrix, so the full
+        # cost matrix can be binned once per area and reused
+        self._cost_bindings = {
+            area_id: cost_utils.CostBinding.from_bin_edges(self.cost_matrix, bin_edges)
+            for area_id, bin_edges in self.tcd_bin_edges.items()
+        }
+
         # Additional attributes
         self.initial_cost_params = dict.fromkeys(self.calib_areas)
         self.initial_convergence = dict.fromkeys(self.calib_areas)
@@ -2704,8 +3011,8 @@ class MultiAreaGravityModelCalibrator:
     @staticmethod
     def _get_tcd_bin_edges(
         target_cost_distributions: Dict[Any, pd.DataFrame],
-    ) -> Dict[Any, pd.DataFrame]:
-        """Gets the edges of each TCD band as a list"""
+    ) -> Dict[Any, np.ndarray]:
+        """Gets the edges of each TCD band as an array"""
         # Init
         bin_edges = dict.fromkeys(target_cost_distributions.keys())
 
@@ -2730,8 +3037,7 @@ class MultiAreaGravityModelCalibrator:
         """Order params into a list that self.cost_function expects"""
         ordered_params = [0] * len(self.cost_function.kw_order)
         for name, value in params.items():
-            index = self.cost_function.kw_order.index(name)
-            ordered_params[index] = value
+            ordered_params[self.cost_function.kw_index[name]] = value
 
         return ordered_params
 
@@ -2764,10 +3070,9 @@ class MultiAreaGravityModelCalibrator:
         all_complete_event = threading.Event()
 
         # Generate the area mats and complete events for each thread
-        area_mats = dict.fromkeys(self.calib_areas)
+        area_mats = self._area_mats
         complete_events = dict.fromkeys(self.calib_areas)
         for area_id in self.calib_areas:
-            area_mats[area_id] = self.calibration_matrix == area_id
             complete_events[area_id] = threading.Event()
 
         # Initialise the interface between gravity and furnesses
@@ -2859,10 +3164,9 @@ class MultiAreaGravityModelCalibrator:
         all_complete_event = threading.Event()
 
         # Generate the area mats and complete events for each thread
-        area_mats = dict.fromkeys(self.calib_areas)
+        area_mats = self._area_mats
         complete_events = dict.fromkeys(self.calib_areas)
         for area_id in self.calib_areas:
-            area_mats[area_id] = self.calibration_matrix == area_id
             complete_events[area_id] = threading.Event()
 
         # Initialise the interface between gravity and furnesses
@@ -2987,7 +3291,7 @@ class MultiAreaGravityModelCalibrator:
             those passed in to cost_param_dict.
         """
         # Init
-        seed_matrix = np.zeros_like(self.cost_matrix, dtype=float)
+        seed_matrix = np.zeros_like(self.cost_matrix, dtype=self.dtype)
 
         # Check the given keys are valid
         given_keys = set(cost_param_dict.keys())
@@ -3004,8 +3308,7 @@ class MultiAreaGravityModelCalibrator:
         # Build the seed matrix
         for area_id, cost_params in cost_param_dict.items():
             # Extract the relevant cost
-            area_bool = self.calibration_matrix == area_id
-            area_cost = self.cost_matrix * area_bool
+            area_cost = self.cost_matrix * self._area_mats[area_id]
 
             # Calculate the seed matrix
             if perceived_factors is not None:
@@ -3025,15 +3328,13 @@ class MultiAreaGravityModelCalibrator:
         results = dict.fromkeys(cost_param_dict.keys())
         for area_id in results:
             # Extract this area
-            area_bool = self.calibration_matrix == area_id
-            area_matrix = furnessed_matrix * area_bool
-            area_cost = self.cost_matrix * area_bool
+            area_matrix = furnessed_matrix * self._area_mats[area_id]
 
             # Convert matrix into an achieved distribution curve
             _, achieved_band_shares = cost_utils.normalised_cost_distribution(
                 matrix=area_matrix,
-                cost_matrix=area_cost,
-                bin_edges=self.tcd_bin_edges[area_id],
+                cost_matrix=self.cost_matrix,
+                cost_binding=self._cost_bindings[area_id],
             )
 
             # Evaluate this run
@@ -3126,6 +3427,7 @@ class MultiAreaGravityModelCalibrator:
                     xtol=xtol,
                     grav_max_iters=grav_max_iters,
                     verbose=verbose,
+                    dtype=self.dtype,
                 )
                 calibrator_threads[area_id].start()
 
@@ -3197,6 +3499,7 @@ class MultiAreaGravityModelCalibrator:
                 xtol=xtol,
                 grav_max_iters=grav_max_iters,
                 verbose=verbose,
+                dtype=self.dtype,
             )
             calibrator_threads[area_id].start()
 
@@ -3372,6 +3675,9 @@ def gravity_model(row_targets: np.ndarray,
                   costs: np.ndarray,
                   furness_max_iters: int,
                   furness_tol: float,
+                  out: Optional[np.ndarray] = None,
+                  dtype: np.dtype = np.float64,
+                  symmetric_costs: bool = False,
                   **cost_params
                   ):
     """
@@ -3401,6 +3707,9 @@ def gravity_model(row_targets: np.ndarray,
         A matrix of the base costs to use. This will be passed into
         cost_function alongside cost_params. Usually this will need to be
         the same shape as (len(row_targets), len(col_targets)).
+        `costs`, `row_targets` and `col_targets` are copied into
+        C-contiguous arrays of `dtype` if they aren't already. Callers
+        running many gravity models should convert them once beforehand.
 
     furness_max_iters:
         The maximum number of iterations for the furness to complete before
@@ -3411,6 +3720,26 @@ def gravity_model(row_targets: np.ndarray,
         and the generated matrix. The smaller the tolerance the closer to the
         targets the return matrix will be.
 
+    out:
+        A float array, the same shape as `costs`, to calculate the
+        distributed matrix in. Passing the same array to repeated calls
+        avoids allocating a new matrix each time, but overwrites the
+        previous result. If left as None, a new matrix is allocated.
+
+    dtype:
+        The precision to calculate the distributed matrix in. `costs`,
+        `row_targets` and `col_targets` are cast to this. np.float32 halves
+        the memory moved by the cost function and furness, but
+        `furness_tol` needs loosening to suit the lower precision, and
+        cost function outputs smaller than float32 can represent become 0.
+
+    symmetric_costs:
+        Whether `costs` is symmetric, such as when the rows and columns
+        are the same zone system and costs are the same in both directions.
+        If True, the seed matrix is calculated with
+        `cost_function.calculate_symmetric()`, roughly halving the cost
+        function work. `costs` is not checked for symmetry.
+
     cost_params:
         Any additional parameters that should be passed through to the cost
         function.
@@ -3419,7 +3748,7 @@ def gravity_model(row_targets: np.ndarray,
     -------
     distributed_matrix:
         A matrix of the row/col targets distributed into a matrix of shape
-        (len(row_targets), len(col_targets))
+        (len(row_targets), len(col_targets)). Calculated in `out`, if given.
 
     completed_iters:
         The number of iterations completed by the doubly constrained furness
@@ -3434,31 +3763,305 @@ def gravity_model(row_targets: np.ndarray,
     TypeError:
         If some of the cost_params are not valid cost parameters, or not all
         cost parameters have been given.
+
+    ValueError:
+        If the cost_params are outside of the cost function's range, or
+        produce non-finite values in the seed matrix.
+
+    See Also
+    --------
+    `gravity_model_with_factors()`
     """
-    # Validate additional arguments passed in
-    equal, extra, missing = du.compare_sets(
-        set(cost_params.keys()),
-        set(cost_function.param_names),
+    matrix, iters, rmse, *_ = gravity_model_with_factors(
+        row_targets=row_targets,
+        col_targets=col_targets,
+        cost_function=cost_function,
+        costs=costs,
+        furness_max_iters=furness_max_iters,
+        furness_tol=furness_tol,
+        out=out,
+        dtype=dtype,
+        symmetric_costs=symmetric_costs,
+        **cost_params,
     )
+    return matrix, iters, rmse
 
-    if not equal:
-        raise TypeError(
-            "gravity_model() got one or more unexpected keyword arguments.\n"
-            "Received the following extra arguments: %s\n"
-            "While missing arguments: %s"
-            % (extra, missing)
-        )
+
+def gravity_model_with_factors(
+    row_targets: np.ndarray,
+    col_targets: np.ndarray,
+    cost_function: cost.CostFunction,
+    costs: np.ndarray,
+    furness_max_iters: int,
+    furness_tol: float,
+    out: Optional[np.ndarray] = None,
+    dtype: np.dtype = np.float64,
+    symmetric_costs: bool = False,
+    init_row_factors: Optional[np.ndarray] = None,
+    init_col_factors: Optional[np.ndarray] = None,
+    **cost_params
+):
+    """
+    Runs a gravity model, returning the furness factors applied
+
+    The factors can be given back as `init_row_factors` and
+    `init_col_factors` to warm start the furness of a later call. When
+    sweeping or calibrating cost_params, consecutive calls usually need
+    similar factors, so a warm start cuts the furness iterations needed
+    to meet `furness_tol`.
+
+    Parameters
+    ----------
+    row_targets:
+        The targets for the rows to sum to. These are usually Productions
+        in Trip Ends.
+
+    col_targets:
+        The targets for the columns to sum to. These are usually Attractions
+        in Trip Ends.
+
+    cost_function:
+        A cost function class defining how to calculate the seed matrix based
+        on the given cost. cost_params will be passed directly into this
+        function.
+
+    costs:
+        A matrix of the base costs to use. This will be passed into
+        cost_function alongside cost_params. Usually this will need to be
+        the same shape as (len(row_targets), len(col_targets)).
+        See `gravity_model()` for how inputs are converted.
+
+    furness_max_iters:
+        The maximum number of iterations for the furness to complete before
+        giving up and outputting what it has managed to achieve.
+
+    furness_tol:
+        The R2 difference to try and achieve between the row/col targets
+        and the generated matrix. The smaller the tolerance the closer to the
+        targets the return matrix will be.
+
+    out:
+        A float array, the same shape as `costs`, to calculate the
+        distributed matrix in. Passing the same array to repeated calls
+        avoids allocating a new matrix each time, but overwrites the
+        previous result. If left as None, a new matrix is allocated.
+
+    dtype:
+        The precision to calculate the distributed matrix in. See
+        `gravity_model()`.
+
+    symmetric_costs:
+        Whether `costs` is symmetric. See `gravity_model()`.
+
+    init_row_factors:
+        Factors to apply to each row of the seed matrix before starting
+        the furness. Usually the `row_factors` returned by a previous call.
+        If left as None, no initial row factors are applied.
+
+    init_col_factors:
+        Factors to apply to each column of the seed matrix before starting
+        the furness. Usually the `col_factors` returned by a previous call.
+        If left as None, no initial column factors are applied.
+
+    cost_params:
+        Any additional parameters that should be passed through to the cost
+        function.
+
+    Returns
+    -------
+    distributed_matrix:
+        A matrix of the row/col targets distributed into a matrix of shape
+        (len(row_targets), len(col_targets)). Calculated in `out`, if given.
+
+    completed_iters:
+        The number of iterations completed by the doubly constrained furness
+        before exiting
+
+    achieved_rmse:
+        The Root Mean Squared Error achieved by the doubly constrained furness
+        before exiting
+
+    row_factors:
+        The total factor applied to each row of the seed matrix, including
+        `init_row_factors`.
+
+    col_factors:
+        The total factor applied to each column of the seed matrix,
+        including `init_col_factors`.
+
+    Raises
+    ------
+    TypeError:
+        If some of the cost_params are not valid cost parameters, or not all
+        cost parameters have been given.
+
+    ValueError:
+        If the cost_params are outside of the cost function's range, or
+        produce non-finite values in the seed matrix.
+    """
+    # Validate additional arguments passed in
+    _check_cost_params(cost_function, cost_params)
+
+    # C-contiguous, in the right precision. No-ops when already so
+    costs = np.ascontiguousarray(costs, dtype=dtype)
+    row_targets = np.ascontiguousarray(row_targets, dtype=dtype)
+    col_targets = np.ascontiguousarray(col_targets, dtype=dtype)
+    if out is None:
+        out = np.empty(costs.shape, dtype=dtype)
 
     # Calculate initial matrix through cost function
-    init_matrix = cost_function.calculate(costs, **cost_params)
+    if symmetric_costs:
+        init_matrix = cost_function.calculate_symmetric(costs, out=out, **cost_params)
+    else:
+        init_matrix = cost_function.calculate(costs, out=out, **cost_params)
+    _check_seed_matrix(init_matrix, cost_params)
 
     # Furness trips to trip ends
-    matrix, iters, rmse = furness.doubly_constrained_furness(
+    # init_matrix isn't used again, so furness it in place
+    return furness.doubly_constrained_furness_with_factors(
         seed_vals=init_matrix,
         row_targets=row_targets,
         col_targets=col_targets,
         tol=furness_tol,
         max_iters=furness_max_iters,
+        init_row_factors=init_row_factors,
+        init_col_factors=init_col_factors,
+        inplace=True,
     )
 
-    return matrix, iters, rmse
+
+def gravity_model_batch(row_targets: np.ndarray,
+                        col_targets: np.ndarray,
+                        cost_function: cost.CostFunction,
+                        costs: np.ndarray,
+                        furness_max_iters: int,
+                        furness_tol: float,
+                        cost_params_list: List[Dict[str, Any]],
+                        dtype: np.dtype = np.float64,
+                        process_count: int = 0,
+                        ) -> List[Tuple[np.ndarray, int, float]]:
+    """
+    Runs a gravity model for each set of cost params in cost_params_list
+
+    Gives the same results as calling `gravity_model()` once for each set
+    of cost params. The seed matrices are calculated together using
+    `cost_function.calculate_batch()`, sharing any work that does not
+    depend on the cost params, such as the log of `costs`.
+
+    Parameters
+    ----------
+    row_targets:
+        The targets for the rows to sum to. These are usually Productions
+        in Trip Ends.
+
+    col_targets:
+        The targets for the columns to sum to. These are usually Attractions
+        in Trip Ends.
+
+    cost_function:
+        A cost function class defining how to calculate the seed matrices
+        based on the given cost.
+
+    costs:
+        A matrix of the base costs to use. Usually this will need to be
+        the same shape as (len(row_targets), len(col_targets)).
+        See `gravity_model()` for how inputs are converted.
+
+    furness_max_iters:
+        The maximum number of iterations for each furness to complete before
+        giving up and outputting what it has managed to achieve.
+
+    furness_tol:
+        The R2 difference to try and achieve between the row/col targets
+        and each generated matrix.
+
+    cost_params_list:
+        A list of cost function parameter dictionaries. Each should be in
+        the same format as the cost_params passed to `gravity_model()`.
+
+    dtype:
+        The precision to calculate the distributed matrices in. See
+        `gravity_model()`.
+
+    process_count:
+        The number of processes to use when running the furnesses. See
+        `concurrency.multiprocess()` to see what the values mean. Defaults
+        to 0, running each furness in this process.
+
+    Returns
+    -------
+    results:
+        A list of (distributed_matrix, completed_iters, achieved_rmse)
+        tuples, one for each set of params in `cost_params_list`, in the
+        same order. See `gravity_model()` for details of each.
+
+    Raises
+    ------
+    TypeError:
+        If some of the cost params are not valid cost parameters, or not
+        all cost parameters have been given, in any set of cost params.
+
+    ValueError:
+        If any set of cost params is outside of the cost function's range,
+        or produces non-finite values in its seed matrix.
+    """
+    # Validate additional arguments passed in
+    for cost_params in cost_params_list:
+        _check_cost_params(cost_function, cost_params)
+
+    # C-contiguous, in the right precision. No-ops when already so
+    costs = np.ascontiguousarray(costs, dtype=dtype)
+    row_targets = np.ascontiguousarray(row_targets, dtype=dtype)
+    col_targets = np.ascontiguousarray(col_targets, dtype=dtype)
+
+    # Calculate initial matrices through cost function
+    init_matrices = cost_function.calculate_batch(costs, cost_params_list)
+    for init_matrix, cost_params in zip(init_matrices, cost_params_list):
+        _check_seed_matrix(init_matrix, cost_params)
+
+    # Furness trips to trip ends
+    # init_matrices aren't used again, so furness them in place
+    kwarg_list = list()
+    for init_matrix in init_matrices:
+        kwarg_list.append({
+            'seed_vals': init_matrix.astype(dtype, copy=False),
+            'row_targets': row_targets,
+            'col_targets': col_targets,
+            'tol': furness_tol,
+            'max_iters': furness_max_iters,
+            'inplace': True,
+        })
+
+    return multiprocessing.multiprocess(
+        fn=furness.doubly_constrained_furness,
+        kwargs=kwarg_list,
+        process_count=process_count,
+        in_order=True,
+    )
+
+
+def _check_cost_params(cost_function: cost.CostFunction,
+                       cost_params: Dict[str, Any],
+                       ) -> None:
+    """Raises a TypeError if cost_params aren't cost_function's params"""
+    param_names = cost_params.keys()
+    if param_names != cost_function.param_names_set:
+        extra = param_names - cost_function.param_names_set
+        missing = cost_function.param_names_set - param_names
+        raise TypeError(
+            "gravity_model() got one or more unexpected keyword arguments.\n"
+            "Received the following extra arguments: %s\n"
+            "While missing arguments: %s"
+            % (extra, missing)
+        )
+
+
+def _check_seed_matrix(seed_matrix: np.ndarray, cost_params: Dict[str, Any]) -> None:
+    """Raises a ValueError if seed_matrix can't be furnessed"""
+    # A single inf or NaN spreads through the whole furness, wasting
+    # every iteration up to furness_max_iters
+    if not np.isfinite(seed_matrix).all():
+        raise ValueError(
+            "The cost function produced non-finite values in the seed "
+            "matrix with the cost params: %s" % cost_params
+        )
@@ -3488,7 +3488,7 @@ def _recombine_internal_external_internal(
 ) -> None:
     # Read in the matrices and compile
     partial_mats = [file_ops.read_df(x, index_col=0, find_similar=True) for x in in_paths]
-    full_mat = functools.reduce(lambda x, y: x.values + y.values, partial_mats)
+    full_mat = functools.reduce(np.add, (x.to_numpy() for x in partial_mats))
 
     # Store back in a df
     full_mat = pd.DataFrame(
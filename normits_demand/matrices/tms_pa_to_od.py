@@ -5,6 +5,7 @@ Created on Wed Mar  4 11:40:10 2020
 @author: cruella
 """
 import os
+import pathlib
 import warnings
 
 import pandas as pd
@@ -93,18 +94,12 @@ def path_config(file_drive,
                                      model_name,
                                      'Model Zone Lookups')
 
-    # Set production path, leave slash on
-    production_path = os.path.join(model_path, 'Production Outputs')
-    production_path += os.path.sep
-
     # Set production path
-    production_path = (model_path +
-                       'Production Outputs/')
-
-    p_import_path = (production_path +
-                     'hb_productions_' +
-                     model_name.lower() +
-                     '.csv')
+    production_path = os.path.join(model_path, 'Production Outputs')
+    p_import_path = os.path.join(
+        production_path,
+        f'hb_productions_{model_name.lower()}.csv',
+    )
     print('p_import_path', p_import_path)
 
     # Raise user warning if no productions by this name
@@ -112,12 +107,9 @@ def path_config(file_drive,
         warnings.warn('No productions in folder.' +
                       'Check path or run production model')
 
-    # Create project folders
+    # Set project folders
     distribution_path = os.path.join(model_path, 'Distribution Outputs')
-    nup.create_folder(distribution_path, chDir=False)
-
     fusion_path = os.path.join(model_path, 'Fusion Outputs')
-    nup.create_folder(fusion_path, chDir=False)
 
     summary_matrix_import = os.path.join(distribution_path, '24hr PA Distributions')
 
@@ -130,32 +122,32 @@ def path_config(file_drive,
         external_import = None
 
     synth_pa_export = os.path.join(distribution_path, 'PA Matrices')
-    nup.create_folder(synth_pa_export, chDir=False)
-
     synth_pa_export_24 = os.path.join(distribution_path, 'PA Matrices 24hr')
-    nup.create_folder(synth_pa_export_24, chDir=False)
-
     synth_od_export = os.path.join(distribution_path, 'OD Matrices')
-    nup.create_folder(synth_od_export, chDir=False)
-
     non_dist_pa_export = os.path.join(distribution_path, 'PA Matrices Non Dist')
-    nup.create_folder(non_dist_pa_export, chDir=False)
-
     non_dist_od_export = os.path.join(distribution_path, 'OD Matrices Non Dist')
-    nup.create_folder(non_dist_od_export, chDir=False)
 
     # Set fusion efs_exports
     fusion_summary_import = os.path.join(fusion_path, '24hr Fusion PA Distributions')
 
     fusion_pa_export = os.path.join(fusion_path, 'Fusion PA Matrices')
-    nup.create_folder(fusion_pa_export, chDir=False)
-
     fusion_pa_export_24 = os.path.join(fusion_path, 'Fusion PA Matrices 24hr')
-    nup.create_folder(fusion_pa_export_24, chDir=False)
-
     fusion_od_export = os.path.join(fusion_path, 'Fusion OD Matrices')
-    nup.create_folder(fusion_od_export, chDir=False)
-    
+
+    # Create project folders. Parents are created too, and existing
+    # folders are fine, so no separate exists check is needed
+    export_folders = [
+        synth_pa_export,
+        synth_pa_export_24,
+        synth_od_export,
+        non_dist_pa_export,
+        non_dist_od_export,
+        fusion_pa_export,
+        fusion_pa_export_24,
+        fusion_od_export,
+    ]
+    for folder in export_folders:
+        pathlib.Path(folder).mkdir(parents=True, exist_ok=True)
 
     if internal_input == 'synthetic':
         internal_import = summary_matrix_import
@@ -659,6 +651,7 @@ def build_od(file_drive = _default_file_drive,
                                       purpose_subset=None)
 
     dir_contents = os.listdir(i_paths['pa'])
+    zone_col = f'{model_name.lower()}_zone_id'
 
     export_subset = init_params.copy()
     export_subset = export_subset[export_subset['m'].isin(export_modes)]
@@ -712,7 +705,7 @@ def build_od(file_drive = _default_file_drive,
         frh_dist = {}
         for tp, path in tp_names.items():
             frh_dist.update({tp:pd.read_csv(i_paths['pa'] + '/' + path).drop(
-                    (model_name.lower() + '_zone_id'),
+                    zone_col,
                     axis=1)})
 
         # To build each toh matrix
@@ -785,8 +778,7 @@ def build_od(file_drive = _default_file_drive,
             # TODO: Should use import params
             output_from = pd.DataFrame(output_from).reset_index()
             output_from['index'] = output_from['index']+1
-            output_from = output_from.rename(columns={
-                    'index':(model_name.lower() + '_zone_id')})
+            output_from = output_from.rename(columns={'index': zone_col})
     
             output_to = pd.DataFrame(output_to).reset_index()
             output_to['index'] = output_to['index'] + 1
@@ -799,8 +791,7 @@ def build_od(file_drive = _default_file_drive,
 
             output_to.columns = left_headings
 
-            output_to = output_to.rename(columns={
-                    'index':(model_name.lower() + '_zone_id')})
+            output_to = output_to.rename(columns={'index': zone_col})
     
             print('Exporting ' + output_from_name)
             print('& ' + output_to_name)
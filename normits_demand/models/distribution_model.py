@@ -19,9 +19,10 @@ import functools
 from typing import Any
 from typing import List
 from typing import Dict
+from typing import Tuple
 
 # Third Party
-import tqdm
+import numpy as np
 import pandas as pd
 
 # Local Imports
@@ -55,6 +56,10 @@ class DistributionModel(DistributionModelExportPaths):
 
     _translated_dir_name = 'translated'
 
+    # Precision of the matrices translated for compilation. Halves the
+    # memory used by the translation compared to float64
+    _compile_translation_dtype = np.float32
+
     _running_report_fname = 'running_parameters.txt'
     _log_fname = "Distribution_Model_log.log"
 
@@ -145,6 +150,14 @@ class DistributionModel(DistributionModelExportPaths):
         # TODO(BT): Validate this is correct type
         self.arg_builder = arg_builder
 
+        # Zone translations and filenames are only built once per model
+        self._translations = dict()
+        self._filenames = dict()
+
+        # Steps already checked or done since the models last ran
+        self._pa_recombined_this_run = False
+        self._translated_this_run = dict()
+
         # Create a logger
         logger_name = f"{nd.get_package_logger_name()}.{self.__class__.__name__}"
         log_file_path = os.path.join(self.export_home, self._log_fname)
@@ -253,6 +266,7 @@ class DistributionModel(DistributionModelExportPaths):
         #  depend on one another
         start_time = timing.current_milli_time()
         self._logger.info("Starting a new run of TMS")
+        self._reset_run_checks()
 
         # Determine which models to run
         if run_all:
@@ -299,8 +313,14 @@ class DistributionModel(DistributionModelExportPaths):
         time_taken = timing.time_taken(start_time, end_time)
         self._logger.info("Distribution Model run complete! Took %s", time_taken)
 
+    def _reset_run_checks(self) -> None:
+        """Forget which matrices have been checked, as they may be out of date"""
+        self._pa_recombined_this_run = False
+        self._translated_this_run = dict()
+
     def run_upper_model(self):
         """Run the upper model"""
+        self._reset_run_checks()
         self._logger.info("Building arguments for the Upper Model")
         kwargs = self.arg_builder.build_upper_model_arguments(
             cache_dir=self.cache_paths.upper_trip_ends,
@@ -324,6 +344,7 @@ class DistributionModel(DistributionModelExportPaths):
 
     def run_lower_model(self):
         """Run the lower model"""
+        self._reset_run_checks()
         if self.lower_model_method is None:
             self._logger.info(
                 "Cannot run Lower Model as no method has been given to run "
@@ -428,7 +449,11 @@ class DistributionModel(DistributionModelExportPaths):
         dir_path: pathlib.Path = None,
         **file_kwargs,
     ) -> List[pathlib.Path]:
-        """Builds a list of filenames using class attributes as defaults"""
+        """Builds a list of filenames using class attributes as defaults
+
+        The segmentation doesn't change, so lists are only built once for
+        each set of arguments. A new copy of the list is returned each time.
+        """
         # Set defaults
         trip_origin = self.trip_origin if trip_origin is None else trip_origin
         year = str(self.year) if year is None else str(year)
@@ -436,22 +461,40 @@ class DistributionModel(DistributionModelExportPaths):
         # Attach default args to kwargs
         file_kwargs = dict(file_kwargs, trip_origin=trip_origin, year=year, file_desc=file_desc,)
 
+        key = (dir_path, tuple(sorted(file_kwargs.items())))
+        if key not in self._filenames:
+            self._filenames[key] = self._build_filenames_internal(dir_path, **file_kwargs)
+        return list(self._filenames[key])
+
+    def _build_filenames_internal(
+        self,
+        dir_path: pathlib.Path = None,
+        **file_kwargs,
+    ) -> List[pathlib.Path]:
+        """Internal function of self._build_filenames()"""
+        # Only the segment params change, so build the template once
+        template = self.running_segmentation.generate_template_file_name(**file_kwargs)
+
         # Build the list of filenames
         paths = list()
         for segment_params in self.running_segmentation:
-            out_path = pathlib.Path(self.running_segmentation.generate_file_name(
+            out_path = pathlib.Path(self.running_segmentation.generate_file_name_from_template(
+                template=template,
                 segment_params=segment_params,
-                **file_kwargs,
             ))
             if dir_path is not None:
                 out_path = dir_path / out_path
 
-            paths.append(pathlib.Path(out_path))
+            paths.append(out_path)
 
         return paths
 
     def _maybe_recombine_pa_matrices(self) -> None:
         """Combine pa matrices if it hasn't been done yet"""
+        # Nothing can have changed if already checked this run
+        if self._pa_recombined_this_run:
+            return
+
         # Init
         file_kwargs = {
             "file_desc": self._pa_matrix_desc,
@@ -480,6 +523,7 @@ class DistributionModel(DistributionModelExportPaths):
         # Only recombine if cache is older than original files
         if file_ops.is_old_cache(original=in_paths, cache=out_paths):
             self._recombine_pa_matrices()
+        self._pa_recombined_this_run = True
 
     def _recombine_pa_matrices(self):
         # ## GET THE FULL PA MATRICES ## #
@@ -499,6 +543,7 @@ class DistributionModel(DistributionModelExportPaths):
                 year=str(self.year),
                 file_desc=self._pa_matrix_desc,
                 rounding=constants.DEFAULT_ROUNDING,
+                process_count=self.process_count,
             )
         else:
             self._logger.info("Copying over Upper Tier Matrices")
@@ -510,8 +555,29 @@ class DistributionModel(DistributionModelExportPaths):
                 year=str(self.year),
                 file_desc=self._pa_matrix_desc,
                 compressed=True,
+                process_count=self.process_count,
             )
 
+    def _get_pop_emp_translations(
+        self,
+        from_zoning_system: nd.ZoningSystem,
+        to_zoning_system: nd.ZoningSystem,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the translations, building them only if not done already
+
+        Returns the population and employment weighted translations from
+        from_zoning_system.translate(). Building the translations means
+        reading and pivoting the translation definitions, so the results
+        are kept for any later calls.
+        """
+        key = (from_zoning_system.name, to_zoning_system.name)
+        if key not in self._translations:
+            self._translations[key] = tuple(
+                from_zoning_system.translate(to_zoning_system, weighting=x)
+                for x in ('population', 'employment')
+            )
+        return self._translations[key]
+
     def _maybe_translate_matrices_for_compile(self,
                                               matrices_path: pathlib.Path,
                                               matrices_desc: str,
@@ -535,8 +601,23 @@ class DistributionModel(DistributionModelExportPaths):
             If nothing needs converting, this path is the same as
             matrices_path.
         """
+        # Only check each set of matrices once per run
+        key = (matrices_path, matrices_desc)
+        if key not in self._translated_this_run:
+            out_path = self._maybe_translate_matrices_for_compile_internal(
+                matrices_path=matrices_path,
+                matrices_desc=matrices_desc,
+            )
+            self._translated_this_run[key] = out_path
+        return self._translated_this_run[key]
+
+    def _maybe_translate_matrices_for_compile_internal(
+        self,
+        matrices_path: pathlib.Path,
+        matrices_desc: str,
+    ) -> pathlib.Path:
+        """Internal function of self._maybe_translate_matrices_for_compile()"""
         # Init
-        translation_weight_col = 'weight'
         filename_kwargs = {
             "trip_origin": self.trip_origin,
             "year": str(self.year),
@@ -558,49 +639,46 @@ class DistributionModel(DistributionModelExportPaths):
         file_ops.create_folder(out_dir)
 
         # Check if translation needs doing
-        fnames = self._build_filenames(**filename_kwargs)
-        in_paths = [matrices_path / x for x in fnames]
-        out_paths = [out_dir / x for x in fnames]
+        in_paths = self._build_filenames(dir_path=matrices_path, **filename_kwargs)
+        out_paths = self._build_filenames(dir_path=out_dir, **filename_kwargs)
 
         # Just return path if cache is younger than original files
         if not file_ops.is_old_cache(original=in_paths, cache=out_paths):
             return out_dir
 
         # Get the translations
-        pop_trans, emp_trans = translation.get_long_pop_emp_translations(
+        pop_trans, emp_trans = self._get_pop_emp_translations(
             from_zoning_system=current_zoning,
             to_zoning_system=self.compile_zoning_system,
-            weight_col_name=translation_weight_col
         )
 
-        desc = "Translating matrices for compilation"
-        total = len(self.running_segmentation)
-        for segment_params in tqdm.tqdm(self.running_segmentation, desc=desc, total=total):
-            # Read in DF
-            fname = self.running_segmentation.generate_file_name(
-                segment_params=segment_params,
-                **filename_kwargs
-            )
-            path = os.path.join(matrices_path, fname)
-            df = file_ops.read_df(path, index_col=0)
-
-            # Make sure index and columns are the same type
-            df.columns = df.columns.astype(df.index.dtype)
-
-            # Translate
-            df = translation.pandas_matrix_zone_translation(
-                matrix=df,
-                row_translation=pop_trans,
-                col_translation=emp_trans,
-                from_zone_col=current_zoning.col_name,
-                to_zone_col=self.compile_zoning_system.col_name,
-                factors_col=translation_weight_col,
-                from_unique_zones=current_zoning.unique_zones,
-                to_unique_zones=self.compile_zoning_system.unique_zones,
-            )
+        # Each segment is independent, translate them in parallel
+        unchanging_kwargs = {
+            "row_translation": pop_trans,
+            "col_translation": emp_trans,
+            "from_unique_zones": current_zoning.unique_zones,
+            "to_unique_zones": self.compile_zoning_system.unique_zones,
+            "translation_dtype": self._compile_translation_dtype,
+        }
+
+        kwarg_list = list()
+        for in_path, out_path in zip(in_paths, out_paths):
+            kwargs = unchanging_kwargs.copy()
+            kwargs["in_path"] = in_path
+            kwargs["out_path"] = out_path
+            kwarg_list.append(kwargs)
+
+        pbar_kwargs = {
+            "desc": "Translating matrices for compilation",
+            "unit": "matrices",
+        }
 
-            # Write new matrix out
-            file_ops.write_df(df, os.path.join(out_dir, fname))
+        multiprocessing.multiprocess(
+            fn=_translate_matrix_for_compile,
+            kwargs=kwarg_list,
+            process_count=self.process_count,
+            pbar_kwargs=pbar_kwargs,
+        )
 
         return out_dir
 
@@ -717,9 +795,6 @@ class DistributionModel(DistributionModelExportPaths):
         # Make sure we have full OD matrices before running
         self._maybe_recombine_od_matrices()
 
-        print("Combined")
-        exit()
-
         # TODO: OD to and OD from to add (for directional OD) OR just compile to OD?
         #  OD report arguments
         input_fname_template = self.running_segmentation.generate_template_file_name(
@@ -728,7 +803,6 @@ class DistributionModel(DistributionModelExportPaths):
             year=str(self.year),
             csv=True
         )
-        print(input_fname_template)
         cost_matrices = self.arg_builder.build_od_report_arguments(
             self.compile_zoning_system,
         )
@@ -931,3 +1005,46 @@ class DistributionModel(DistributionModelExportPaths):
                 f"I don't know how to compile mode {self.running_mode.value} "
                 "into an assignment model format :("
             )
+
+
+def _translate_matrix_for_compile(in_path: pathlib.Path,
+                                  out_path: pathlib.Path,
+                                  from_unique_zones: np.ndarray,
+                                  to_unique_zones: np.ndarray,
+                                  **translation_kwargs,
+                                  ) -> None:
+    """Translates the matrix at in_path, writing it out to out_path
+
+    Internal function of DistributionModel._maybe_translate_matrices_for_compile().
+    translation_kwargs are passed straight into
+    translation.numpy_matrix_zone_translation(), so the translations
+    must already be square, in the order of from_unique_zones and
+    to_unique_zones.
+    """
+    # Read in DF
+    df = file_ops.read_df(in_path, index_col=0)
+
+    # Make sure index and columns are the same type
+    df.columns = df.columns.astype(df.index.dtype)
+
+    # Make sure all zones are in the matrix, in order
+    translation.warn_unmatched_matrix_zones(df, from_unique_zones)
+    df = df.reindex(
+        index=from_unique_zones,
+        columns=from_unique_zones,
+        fill_value=0,
+    )
+
+    # Translate
+    translated = translation.numpy_matrix_zone_translation(
+        matrix=df.values,
+        **translation_kwargs,
+    )
+    df = pd.DataFrame(
+        data=translated,
+        index=to_unique_zones,
+        columns=to_unique_zones,
+    )
+
+    # Write new matrix out
+    file_ops.write_df(df, out_path)
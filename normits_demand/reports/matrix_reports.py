@@ -16,6 +16,7 @@ import pathlib
 from typing import Any
 from typing import Dict
 from typing import Tuple
+from typing import Iterator
 
 # Third Party
 import numpy as np
@@ -32,6 +33,7 @@ from normits_demand import core as nd_core
 from normits_demand.utils import file_ops
 from normits_demand.utils import translation
 from normits_demand.utils import pandas_utils as pd_utils
+from normits_demand.concurrency import multithreading
 from normits_demand.cost import utils as cost_utils
 from normits_demand.reports import templates
 # pylint: enable=import-error
@@ -142,6 +144,7 @@ def matrix_sector_summary(
     index_col_name: str = "sector_row",
     columns_col_name: str = "sector_column",
     val_col_name: str = "val",
+    sector_translation: np.ndarray = None,
 ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
     """Generate sector summaries of given matrix
 
@@ -168,6 +171,12 @@ def matrix_sector_summary(
     val_col_name:
         The name to give to the value column in the return `long_sector_matrix`.
 
+    sector_translation:
+        The translation from `matrix_zoning_system` into sector zoning, as
+        returned by `matrix_zoning_system.translate()`. If left as None, it
+        is built from the translation definitions. Pass this in when
+        summarising many matrices to avoid building it each time.
+
     Returns
     -------
     sector_matrix:
@@ -181,12 +190,28 @@ def matrix_sector_summary(
         The intrazonal trips of the given matrix summed into sector zoning
         (output as tripends)
     """
-    # Translate into sector zoning
+    # Init
     sector_zoning = nd_core.get_zoning_system("ca_sector_2020")
-    sector_matrix = translation.translate_matrix_zoning(
-        matrix=matrix,
-        from_zoning_system=matrix_zoning_system,
-        to_zoning_system=sector_zoning,
+    if sector_translation is None:
+        sector_translation = matrix_zoning_system.translate(sector_zoning)
+
+    # Make sure all zones are in the matrix, in order
+    matrix.columns = matrix.columns.astype(matrix_zoning_system.unique_zones.dtype)
+    translation.warn_unmatched_matrix_zones(matrix, matrix_zoning_system.unique_zones)
+    matrix = matrix.reindex(
+        index=matrix_zoning_system.unique_zones,
+        columns=matrix_zoning_system.unique_zones,
+        fill_value=0,
+    )
+
+    # Translate into sector zoning
+    sector_matrix = pd.DataFrame(
+        data=translation.numpy_matrix_zone_translation(
+            matrix=matrix.values,
+            translation=sector_translation,
+        ),
+        index=sector_zoning.unique_zones,
+        columns=sector_zoning.unique_zones,
     )
 
     # ## CREATE A LONG VERSION, WITH SEGMENTS ATTACHED ## #
@@ -198,22 +223,16 @@ def matrix_sector_summary(
     )
 
     # ## INTRAZONALS at Sector Level ##
-    df_intra = np.diagonal(matrix)
-    df_intra = pd.DataFrame(
-        df_intra,
-        index=matrix_zoning_system.unique_zones,
-        columns=['val']
+    sector_intra = translation.numpy_vector_zone_translation(
+        vector=np.diagonal(matrix.values),
+        translation=sector_translation,
+        check_totals=True,
     )
-
-    # Build sector intrazonal totals
-    sector_df_intra = translation.translate_vector_zoning(
-        vector=df_intra,
-        from_zoning_system=matrix_zoning_system,
-        to_zoning_system=sector_zoning
+    sector_df_intra = pd.DataFrame(
+        sector_intra,
+        index=sector_zoning.unique_zones,
+        columns=['val']
     )
-    
-    # Check for MyPy
-    assert isinstance(sector_df_intra, pd.DataFrame)
 
     # Add in segment cols
     for key, val in segment_params.items():
@@ -376,6 +395,61 @@ def generate_excel_sector_report(
     )
 
 
+def _iterate_segment_matrices(
+    matrix_dir: pathlib.Path,
+    matrix_segmentation: nd_core.SegmentationLevel,
+    matrix_fname_template: str,
+) -> Iterator[Tuple[Dict[str, Any], str, pd.DataFrame]]:
+    """Yields the matrix for each segment, in segmentation order
+
+    The next matrix is read in a background thread while the current one
+    is being used, so reading from disk overlaps with the summaries.
+
+    Yields
+    ------
+    segment_params:
+        The segment params of the matrix.
+
+    segment_fname:
+        The filename of the matrix, generated from matrix_fname_template.
+
+    matrix:
+        The matrix read in from matrix_dir.
+    """
+
+    def start_read(segment_params: Dict[str, Any]):
+        segment_fname = matrix_segmentation.generate_file_name_from_template(
+            template=matrix_fname_template,
+            segment_params=segment_params,
+        )
+        thread = file_ops.read_df_threaded(
+            matrix_dir / segment_fname,
+            find_similar=True,
+            index_col=0,
+        )
+        return segment_params, segment_fname, thread
+
+    next_read = None
+    for segment_params in matrix_segmentation:
+        this_read, next_read = next_read, start_read(segment_params)
+        if this_read is not None:
+            yield _finish_read(*this_read)
+
+    if next_read is not None:
+        yield _finish_read(*next_read)
+
+
+def _finish_read(
+    segment_params: Dict[str, Any],
+    segment_fname: str,
+    thread: file_ops.ReadDfThread,
+) -> Tuple[Dict[str, Any], str, pd.DataFrame]:
+    """Waits for a `_iterate_segment_matrices()` read to finish"""
+    matrix = multithreading.wait_for_thread_return_or_error([thread])[0]
+    matrix.columns = matrix.columns.astype(matrix.index.dtype)
+    return segment_params, segment_fname, matrix
+
+
 def generate_matrix_reports(
     matrix_dir: pathlib.Path,
     report_dir: pathlib.Path,
@@ -463,6 +537,10 @@ def generate_matrix_reports(
     file_ops.create_folder(sector_matrix_dir)
     file_ops.create_folder(trip_end_report_dir)
 
+    # Build the sector translation once for all segments
+    sector_zoning = nd_core.get_zoning_system("ca_sector_2020")
+    sector_translation = matrix_zoning_system.translate(sector_zoning)
+
     # ## READ IN EACH MATRIX AND SUMMARISE ## #
     trip_end_rows = list()
     trip_end_cols = list()
@@ -470,17 +548,18 @@ def generate_matrix_reports(
     sector_intras_full = list()
     cost_dist_list = list()
 
+    segment_matrices = _iterate_segment_matrices(
+        matrix_dir=matrix_dir,
+        matrix_segmentation=matrix_segmentation,
+        matrix_fname_template=matrix_fname_template,
+    )
+
     desc = "Generating PA Reports"
-    for segment_params in tqdm.tqdm(matrix_segmentation, desc=desc):
+    total = len(matrix_segmentation)
+    for segment_params, segment_fname, matrix in tqdm.tqdm(
+        segment_matrices, desc=desc, total=total
+    ):
         # ## TRIP END SUMMARY ## #
-        segment_fname = matrix_segmentation.generate_file_name_from_template(
-            template=matrix_fname_template,
-            segment_params=segment_params,
-        )
-        path = matrix_dir / segment_fname
-        matrix = file_ops.read_df(path, find_similar=True, index_col=0)
-        matrix.columns = matrix.columns.astype(matrix.index.dtype)
-
         # Summarise into trip ends
         # TODO(PW): Add ie to excel template
         row_summary, col_summary = matrix_to_trip_ends(
@@ -498,6 +577,7 @@ def generate_matrix_reports(
             index_col_name=row_name,
             columns_col_name=col_name,
             val_col_name=val_col_name,
+            sector_translation=sector_translation,
         )
         long_sector_matrices.append(long_sector_matrix)
         sector_intras_full.append(sector_df_intra)
@@ -67,6 +67,27 @@ class WriteDfThread(multithreading.ReturnOrErrorThread):
         write_df(self.df, self.path, **self.kwargs)
 
 
+class ReadDfThread(multithreading.ReturnOrErrorThread):
+    """Simple Thread for reading from disk using a thread"""
+
+    def __init__(self, path: nd.PathLike, **kwargs) -> None:
+        multithreading.ReturnOrErrorThread.__init__(self)
+        self.path = path
+        self.kwargs = kwargs
+
+    def run_target(self) -> pd.DataFrame:
+        """Reads in the dataframe, returning it as the thread return_val
+
+        Overrides parent to run this on thread start.
+
+        Returns
+        -------
+        df:
+            The read in df at self.path.
+        """
+        return read_df(self.path, **self.kwargs)
+
+
 def remove_suffixes(path: pathlib.Path) -> pathlib.Path:
     """Removes all suffixes from path
 
@@ -419,6 +440,29 @@ def write_df_threaded(*args, **kwargs) -> WriteDfThread:
     return thread
 
 
+def read_df_threaded(*args, **kwargs) -> ReadDfThread:
+    """
+    Reads in the dataframe at path in a thread. Decompresses the df if needed.
+
+    Parameters
+    ----------
+    path:
+        The full path to the dataframe to read in
+
+    **kwargs:
+        Any arguments to pass to `read_df()`.
+
+    Returns
+    -------
+    thread:
+        The started thread. The read in df will be in `thread.return_val`
+        once the thread has finished.
+    """
+    thread = ReadDfThread(*args, **kwargs)
+    thread.start()
+    return thread
+
+
 def filename_in_list(
     filename: nd.PathLike,
     lst: List[nd.PathLike],
@@ -675,6 +719,24 @@ def _copy_files_internal(
     )
 
 
+def _link_or_copy_file(
+    src: os.PathLike,
+    dst: os.PathLike,
+) -> None:
+    """Hard link dst to src, copying instead if a link can't be made"""
+    if os.path.lexists(dst):
+        # Already the same file, removing dst would delete src too
+        if os.path.samefile(src, dst):
+            return
+        os.remove(dst)
+
+    try:
+        os.link(src, dst)
+    except OSError:
+        # Different file systems, or links aren't supported
+        shutil.copyfile(src, dst)
+
+
 def copy_and_rename_files(
     files: Sequence[Tuple[os.PathLike, os.PathLike]],
     process_count: int = consts.PROCESS_COUNT,
@@ -890,6 +952,7 @@ def copy_segment_files(
     dst_dir: nd.PathLike,
     segmentation: nd.SegmentationLevel,
     process_count: int = consts.PROCESS_COUNT,
+    hardlink: bool = False,
     **filename_kwargs,
 ) -> None:
     """Copy segment files from src_dir to dst_dir
@@ -910,6 +973,10 @@ def copy_segment_files(
         The number of processes to use when copying files. By default, uses
         the module default process count.
 
+    hardlink:
+        Whether to hard link the files instead of copying them. See
+        `copy_files()`.
+
     filename_kwargs:
         Any further kwargs to pass into `segmentation.generate_file_name()`
 
@@ -932,6 +999,7 @@ def copy_segment_files(
         dst_dir=dst_dir,
         filenames=filenames,
         process_count=process_count,
+        hardlink=hardlink,
     )
 
 
@@ -1013,6 +1081,7 @@ def copy_files(
     dst_dir: nd.PathLike,
     filenames: List[str],
     process_count: int = consts.PROCESS_COUNT,
+    hardlink: bool = False,
 ) -> None:
     """Copy files from src_dir to dst_dir
 
@@ -1034,6 +1103,14 @@ def copy_files(
         The number of processes to use when copying files. By default, uses
         the module default process count.
 
+    hardlink:
+        Whether to hard link the files in `dst_dir` to the files in
+        `src_dir` instead of copying them. Linking writes no data, but
+        the linked files share their contents, so any later change to a
+        file in place changes both. Only use when neither copy will be
+        written to again. Falls back to copying any file that can't be
+        linked, e.g. across file systems.
+
     Returns
     -------
     None
@@ -1049,7 +1126,7 @@ def copy_files(
         )
 
     multiprocessing.multiprocess(
-        fn=du.copy_and_rename,
+        fn=_link_or_copy_file if hardlink else du.copy_and_rename,
         kwargs=kwarg_list,
         process_count=process_count,
         pbar_kwargs={"disable": False},
@@ -1387,6 +1464,69 @@ def _convert_to_path_list(
     return [x for x in to_convert.iterdir() if x.is_file()]
 
 
+def collect_mtimes(dir_path: PathLike) -> dict[str, float]:
+    """Get the modified time of every file in a directory
+
+    Uses a single `os.scandir()` over the directory, rather than checking
+    each file path in turn.
+
+    Parameters
+    ----------
+    dir_path:
+        The directory to check.
+
+    Returns
+    -------
+    mtimes:
+        A dictionary of {filename: modified_time} for every file in
+        dir_path. If dir_path does not exist, an empty dictionary is
+        returned.
+    """
+    try:
+        with os.scandir(dir_path) as entries:
+            return {e.name: e.stat().st_mtime for e in entries if e.is_file()}
+    except (FileNotFoundError, NotADirectoryError):
+        return dict()
+
+
+def _get_modified_times(
+    to_check: Union[pathlib.Path, Iterable[pathlib.Path]],
+    missing_ok: bool,
+) -> List[float]:
+    """Get the modified times of files, with one scan per directory
+
+    Internal function of is_old_cache(). Accepts the same paths as
+    _convert_to_path_list(). If missing_ok is False, a FileNotFoundError is
+    raised for any path that does not exist, otherwise it is skipped.
+    """
+    if not isinstance(to_check, list):
+        to_check = [to_check]
+
+    dir_mtimes: dict[pathlib.Path, dict[str, float]] = dict()
+    mtimes = list()
+    for path in to_check:
+        if isinstance(path, list):
+            mtimes += _get_modified_times(path, missing_ok)
+            continue
+
+        if not isinstance(path, pathlib.Path):
+            raise ValueError(f"Expected a pathlib.Path. Got {type(path)}")
+
+        # Files are looked up in a scan of their parent directory
+        if path.parent not in dir_mtimes:
+            dir_mtimes[path.parent] = collect_mtimes(path.parent)
+        file_mtimes = dir_mtimes[path.parent]
+
+        if path.name in file_mtimes:
+            mtimes.append(file_mtimes[path.name])
+        elif path.is_dir():
+            mtimes += collect_mtimes(path).values()
+        elif not missing_ok:
+            raise FileNotFoundError(f"No such file or directory: '{path}'")
+
+    return mtimes
+
+
 def is_old_cache(
     original: Union[pathlib.Path, Iterable[pathlib.Path]],
     cache: Union[pathlib.Path, Iterable[pathlib.Path]],
@@ -1394,10 +1534,11 @@ def is_old_cache(
 ) -> bool:
     """Check if the newest original file is newer than the oldest cache.
 
-    Loops though all files in `original` files (checks with `Path.isfile()`)
-    and get the latest modified time of the newest file. Then gets the oldest
-    modified time of the oldest file in `cache`. Only returns True if
-    the oldest cache is still older than the newest original file.
+    Loops though all files in `original` files and get the latest modified
+    time of the newest file. Then gets the oldest modified time of the
+    oldest file in `cache`. Only returns True if the oldest cache is still
+    older than the newest original file. Modified times are read with a
+    single `os.scandir()` of each directory, see `collect_mtimes()`.
 
     Parameters
     ----------
@@ -1423,11 +1564,14 @@ def is_old_cache(
     if ignore_cache:
         return False
 
-    # Make sure we've just got lists if paths
-    original = _convert_to_path_list(original)
-    cache = _convert_to_path_list(cache)
+    # Each directory is only scanned once, however many files are in it
+    original_mtimes = _get_modified_times(original, missing_ok=False)
+    cache_mtimes = _get_modified_times(cache, missing_ok=True)
 
-    return get_oldest_modified_time(cache) < get_latest_modified_time(original)
+    # Matches get_latest_modified_time() and get_oldest_modified_time()
+    latest_original = max(original_mtimes) if original_mtimes else np.inf
+    oldest_cache = min(cache_mtimes) if cache_mtimes else -1
+    return oldest_cache < latest_original
 
 
 def iterate_files(
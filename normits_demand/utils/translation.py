@@ -21,6 +21,7 @@ from typing import Union
 # Third Party
 import numpy as np
 import pandas as pd
+from scipy import sparse
 
 # Local Imports
 import normits_demand as nd
@@ -261,28 +262,19 @@ def numpy_matrix_zone_translation(matrix: np.array,
     col_translation = col_translation.astype(translation_dtype)
 
     # ## DO THE TRANSLATION ## #
-    # Get the input and output shapes
-    n_in, n_out = row_translation.shape
-
     # We might run out of memory doing it this way...
     not_enough_memory = False
 
     try:
-        # Translate rows
-        mult_shape = (n_in, n_in, n_out)
-        a = np.broadcast_to(np.expand_dims(matrix, axis=2), mult_shape)
-        trans_a = np.broadcast_to(np.expand_dims(row_translation, axis=1), mult_shape)
-        temp = a * trans_a
-
-        # mat is transposed, but we need it this way
-        rows_done = temp.sum(axis=0)
-
-        # Translate cols
-        mult_shape = (n_in, n_out, n_out)
-        b = np.broadcast_to(np.expand_dims(rows_done, axis=2), mult_shape)
-        trans_b = np.broadcast_to(np.expand_dims(col_translation, axis=1), mult_shape)
-        temp = b * trans_b
-        translated_matrix = temp.sum(axis=0)
+        # The translation is row_translation.T @ matrix @ col_translation.
+        # Translations usually have 1 or 2 non-zero factors per zone, so
+        # sparse products avoid multiplying through all the zeros
+        row_sparse = sparse.csr_matrix(row_translation)
+        col_sparse = sparse.csr_matrix(col_translation)
+
+        # Translate rows, then cols
+        rows_done = row_sparse.T @ matrix
+        translated_matrix = np.ascontiguousarray((col_sparse.T @ rows_done.T).T)
     except MemoryError:
         not_enough_memory = True
 
@@ -440,6 +432,50 @@ def numpy_vector_zone_translation(vector: np.array,
     return out_vector
 
 
+def warn_unmatched_matrix_zones(matrix: pd.DataFrame,
+                                unique_zones: List[Any],
+                                ) -> None:
+    """Warns about matrix zones that don't match unique_zones
+
+    Use before reindexing `matrix` to `unique_zones`, which would
+    otherwise silently drop any additional zones and infill any missing
+    ones.
+
+    Parameters
+    ----------
+    matrix:
+        The matrix to check. Both the index and columns are checked.
+
+    unique_zones:
+        A list of all the unique zones the matrix should contain.
+
+    Returns
+    -------
+    None
+    """
+    unique_zones = set(unique_zones)
+    for name, zones in (("index", matrix.index), ("columns", matrix.columns)):
+        zones = set(zones.to_list())
+
+        extra_zones = zones - unique_zones
+        if len(extra_zones) > 0:
+            warnings.warn(
+                "There are some zones in matrix.%s that have not been "
+                "defined in unique_zones. These zones will be dropped!\n"
+                "Additional zones count: %s"
+                % (name, len(extra_zones))
+            )
+
+        missing_zones = unique_zones - zones
+        if len(missing_zones) > 0:
+            warnings.warn(
+                "There are some zones in unique_zones that are missing from "
+                "matrix.%s. These zones will be infilled!\n"
+                "Missing zones count: %s"
+                % (name, len(missing_zones))
+            )
+
+
 def pandas_matrix_zone_translation(matrix: pd.DataFrame,
                                    from_zone_col: str,
                                    to_zone_col: str,
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+    Module containing tests for the cost functions module, tests
+    are setup to use pytest.
+"""
+
+##### IMPORTS #####
+# Standard imports
+
+# Third party imports
+import numpy as np
+import pytest
+
+# Local imports
+from normits_demand.cost import cost_functions
+
+
+##### CLASSES #####
+class TestCalculateBatch:
+    """Tests for the `CostFunction.calculate_batch` method. """
+
+    COST = np.array([[0, 1.5, 3], [4.5, 5, 7.5], [10, 25, 2]])
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "built_in, params_list",
+        [
+            (
+                cost_functions.BuiltInCostFunction.LOG_NORMAL,
+                [{"sigma": 1, "mu": 2}, {"sigma": 0.5, "mu": 2}, {"sigma": 1, "mu": 3.5}],
+            ),
+            (
+                cost_functions.BuiltInCostFunction.TANNER,
+                [{"alpha": 1, "beta": -0.5}, {"alpha": -1.5, "beta": 0.2}],
+            ),
+        ],
+    )
+    def test_matches_calculate(built_in, params_list):
+        """Test batch results are identical to individual calculations. """
+        cost_function = built_in.get_cost_function()
+        results = cost_function.calculate_batch(TestCalculateBatch.COST, params_list)
+
+        assert len(results) == len(params_list)
+        for params, result in zip(params_list, results):
+            expected = cost_function.calculate(TestCalculateBatch.COST, **params)
+            np.testing.assert_array_equal(result, expected)
+
+    def test_invalid_params(self):
+        """Test out of range params are rejected before calculating. """
+        cost_function = cost_functions.BuiltInCostFunction.LOG_NORMAL.get_cost_function()
+        with pytest.raises(ValueError):
+            cost_function.calculate_batch(self.COST, [{"sigma": 1, "mu": 2}, {"sigma": 10, "mu": 2}])
+
+
+class TestCalculateJacobian:
+    """Tests for the `CostFunction.calculate_jacobian` method. """
+
+    COST = np.array([[0, 1.5, 3], [4.5, 5, 7.5], [10, 25, 2]])
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "built_in, params",
+        [
+            (cost_functions.BuiltInCostFunction.LOG_NORMAL, {"sigma": 0.8, "mu": 2.5}),
+            (cost_functions.BuiltInCostFunction.TANNER, {"alpha": 1.2, "beta": -0.3}),
+        ],
+    )
+    def test_matches_finite_difference(built_in, params):
+        """Test derivatives match a central finite difference. """
+        cost_function = built_in.get_cost_function()
+        derivatives = cost_function.calculate_jacobian(TestCalculateJacobian.COST, **params)
+
+        step = 1e-6
+        for name in cost_function.kw_order:
+            upper = {**params, name: params[name] + step}
+            lower = {**params, name: params[name] - step}
+            expected = (
+                cost_function.calculate(TestCalculateJacobian.COST, **upper)
+                - cost_function.calculate(TestCalculateJacobian.COST, **lower)
+            ) / (2 * step)
+            np.testing.assert_allclose(derivatives[name], expected, rtol=1e-6, atol=1e-8)
+
+    def test_no_jacobian_function(self):
+        """Test an error is raised when no derivatives are defined. """
+        cost_function = cost_functions.CostFunction(
+            name="exponential",
+            params={"beta": [0, 1]},
+            function=lambda base_cost, beta, min_return_val=0: np.exp(-beta * base_cost),
+        )
+        with pytest.raises(ValueError):
+            cost_function.calculate_jacobian(self.COST, beta=0.5)
+
+
+class TestCalculateOut:
+    """Tests for the `out` argument of `CostFunction.calculate`. """
+
+    COST = np.array([[0, 1.5, 3], [4.5, 5, 7.5], [10, 25, 2]])
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "built_in, params",
+        [
+            (cost_functions.BuiltInCostFunction.LOG_NORMAL, {"sigma": 0.8, "mu": 2.5}),
+            (cost_functions.BuiltInCostFunction.TANNER, {"alpha": 1.2, "beta": -0.3}),
+        ],
+    )
+    def test_matches_calculate(built_in, params):
+        """Test results written into `out` match a new array. """
+        cost_function = built_in.get_cost_function()
+        expected = cost_function.calculate(TestCalculateOut.COST, **params)
+
+        # Fill with rubbish to make sure every value is overwritten
+        out = np.full(TestCalculateOut.COST.shape, np.nan)
+        result = cost_function.calculate(TestCalculateOut.COST, out=out, **params)
+
+        assert result is out
+        np.testing.assert_array_equal(result, expected)
+
+    def test_float32_costs(self):
+        """Test float32 costs give float64 results, unless `out` is float32. """
+        cost_function = cost_functions.BuiltInCostFunction.LOG_NORMAL.get_cost_function()
+        params = {"sigma": 0.8, "mu": 2.5}
+        expected = cost_function.calculate(self.COST, **params)
+
+        cost = self.COST.astype(np.float32)
+        result = cost_function.calculate(cost, **params)
+        assert result.dtype == np.float64
+        np.testing.assert_allclose(result, expected, rtol=1e-6)
+
+        out = np.empty(cost.shape, dtype=np.float32)
+        result = cost_function.calculate(cost, out=out, **params)
+        assert result is out
+        np.testing.assert_allclose(result, expected, rtol=1e-6, atol=1e-30)
+
+    def test_function_without_out(self):
+        """Test output is copied into `out` for functions without one. """
+        cost_function = cost_functions.CostFunction(
+            name="exponential",
+            params={"beta": [0, 1]},
+            function=lambda base_cost, beta, min_return_val=0: np.exp(-beta * base_cost),
+        )
+        out = np.empty(self.COST.shape)
+        result = cost_function.calculate(self.COST, out=out, beta=0.5)
+
+        assert result is out
+        np.testing.assert_array_equal(result, np.exp(-0.5 * self.COST))
+
+
+class TestCalculateSymmetric:
+    """Tests for the `CostFunction.calculate_symmetric` method. """
+
+    COST = np.array([[1, 1.5, 3, 0], [1.5, 5, 7.5, 2], [3, 7.5, 2, 25], [0, 2, 25, 4]])
+
+    @staticmethod
+    @pytest.mark.parametrize("block_size", [1, 3, 256])
+    @pytest.mark.parametrize(
+        "built_in, params",
+        [
+            (cost_functions.BuiltInCostFunction.LOG_NORMAL, {"sigma": 0.8, "mu": 2.5}),
+            (cost_functions.BuiltInCostFunction.TANNER, {"alpha": 1.2, "beta": -0.3}),
+        ],
+    )
+    def test_matches_calculate(built_in, params, block_size):
+        """Test results are identical to calculating every cell. """
+        cost_function = built_in.get_cost_function()
+        expected = cost_function.calculate(TestCalculateSymmetric.COST, **params)
+        result = cost_function.calculate_symmetric(
+            TestCalculateSymmetric.COST, block_size=block_size, **params
+        )
+        np.testing.assert_array_equal(result, expected)
+
+    def test_function_without_out(self):
+        """Test functions without an `out` argument give the same results. """
+        cost_function = cost_functions.CostFunction(
+            name="exponential",
+            params={"beta": [0, 1]},
+            function=lambda base_cost, beta, min_return_val=0: np.exp(-beta * base_cost),
+        )
+        result = cost_function.calculate_symmetric(self.COST, block_size=3, beta=0.5)
+        np.testing.assert_array_equal(result, np.exp(-0.5 * self.COST))
+
+    def test_not_square(self):
+        """Test an error is raised for a non-square cost matrix. """
+        cost_function = cost_functions.BuiltInCostFunction.TANNER.get_cost_function()
+        with pytest.raises(ValueError):
+            cost_function.calculate_symmetric(self.COST[:3], alpha=1, beta=-0.5)
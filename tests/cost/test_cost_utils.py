@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""
+    Module containing tests for the cost utils module, tests
+    are setup to use pytest.
+"""
+
+##### IMPORTS #####
+# Standard imports
+
+# Third party imports
+import numpy as np
+import pandas as pd
+import pytest
+
+# Local imports
+from normits_demand.cost import utils as cost_utils
+
+
+##### CLASSES #####
+class TestCellsInBounds:
+    """Tests for the `cells_in_bounds` function. """
+
+    COST = np.array([[0, 1.5, 3], [4.5, 5, 7.5], [10, np.inf, 2]])
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "min_bounds, max_bounds, expected",
+        [
+            ([0, 2, 5], [2, 5, 10], [2, 3, 2]),
+            ([1, 2, 5], [2, 4, 8], [1, 2, 2]),
+            ([-5, 20], [0, 30], [0, 0]),
+        ],
+    )
+    def test_counts(min_bounds, max_bounds, expected):
+        """Test cells are counted into the correct half-open bands. """
+        result = cost_utils.cells_in_bounds(
+            min_bounds=np.array(min_bounds),
+            max_bounds=np.array(max_bounds),
+            cost=TestCellsInBounds.COST,
+        )
+        np.testing.assert_array_equal(result, expected)
+
+
+class TestCalculateAverageCostInBounds:
+    """Tests for the `calculate_average_cost_in_bounds` function. """
+
+    COST = np.array([[0, 1.5, 3], [4.5, 5, 7.5], [10, np.inf, 2]])
+    TRIPS = np.array([[2, 2, 1], [3, 0, 0], [5, 1, 1]])
+
+    def test_averages(self):
+        """Test averages are trip weighted, falling back to the band minimum. """
+        result = cost_utils.calculate_average_cost_in_bounds(
+            min_bounds=np.array([0, 2, 5]),
+            max_bounds=np.array([2, 5, 10]),
+            cost_matrix=self.COST,
+            trips=self.TRIPS,
+        )
+        np.testing.assert_allclose(result, [0.75, (3 + 13.5 + 2) / 5, 5])
+
+
+class TestCostDistribution:
+    """Tests for the `cost_distribution` function. """
+
+    @staticmethod
+    @pytest.mark.parametrize("bin_edges", [[0, 2, 5, 10], [1, 3, 7.5], [0, 0.5, 50]])
+    def test_matches_histogram(bin_edges):
+        """Test the distribution matches `numpy.histogram`, including edge values. """
+        rng = np.random.default_rng(0)
+        cost = rng.integers(0, 12, size=(20, 20)).astype(float)
+        cost[0, 0] = np.inf
+        matrix = rng.random((20, 20))
+
+        expected, _ = np.histogram(cost, bins=bin_edges, weights=matrix)
+        result = cost_utils.cost_distribution(matrix, cost, bin_edges=bin_edges)
+        np.testing.assert_allclose(result, expected)
+
+    @staticmethod
+    def test_bounds():
+        """Test min and max bounds can be given in place of bin edges. """
+        cost = np.array([[1, 2], [3, 4]])
+        matrix = np.array([[1, 2], [3, 4]])
+        result = cost_utils.cost_distribution(
+            matrix, cost, min_bounds=[0, 2], max_bounds=[2, 4]
+        )
+        np.testing.assert_allclose(result, [1, 9])
+
+
+class TestBinnedSum:
+    """Tests for the `cost_bin_index` and `binned_sum` functions. """
+
+    @staticmethod
+    def test_matches_cost_distribution():
+        """Test a cached bin index gives the same result as `cost_distribution`. """
+        rng = np.random.default_rng(1)
+        cost = rng.random((10, 10)) * 12 - 1
+        bin_edges = np.array([0, 1, 5, 10])
+        bin_index = cost_utils.cost_bin_index(cost, bin_edges)
+
+        for _ in range(3):
+            matrix = rng.random((10, 10))
+            np.testing.assert_allclose(
+                cost_utils.binned_sum(bin_index, matrix, n_bins=3),
+                cost_utils.cost_distribution(matrix, cost, bin_edges=bin_edges),
+            )
+
+
+class TestCostBinding:
+    """Tests for the `CostBinding` class. """
+
+    COST = np.array([[0, 1.5, 3], [4.5, 5, 7.5], [10, np.inf, 2]])
+    TRIPS = np.array([[2, 2, 1], [3, 0, 0], [5, 1, 1]])
+    MIN_BOUNDS = np.array([0, 2, 5])
+    MAX_BOUNDS = np.array([2, 5, 10])
+
+    def test_reuse_bounds(self):
+        """Test a binding gives the same results as calculating from bounds. """
+        binding = cost_utils.CostBinding.from_bounds(
+            self.COST, self.MIN_BOUNDS, self.MAX_BOUNDS
+        )
+        args = (self.MIN_BOUNDS, self.MAX_BOUNDS, self.COST)
+
+        np.testing.assert_array_equal(
+            cost_utils.cells_in_bounds(*args, cost_binding=binding),
+            cost_utils.cells_in_bounds(*args),
+        )
+        np.testing.assert_allclose(
+            cost_utils.calculate_average_cost_in_bounds(
+                *args, self.TRIPS, cost_binding=binding
+            ),
+            cost_utils.calculate_average_cost_in_bounds(*args, self.TRIPS),
+        )
+
+    def test_bin_edges_last_edge(self):
+        """Test binning on bin edges includes the final edge, like `numpy.histogram`. """
+        binding = cost_utils.CostBinding.from_bin_edges(self.COST, [0, 2, 5, 10])
+        np.testing.assert_array_equal(binding.count(), [2, 3, 3])
+        np.testing.assert_allclose(
+            cost_utils.cost_distribution(self.TRIPS, self.COST, cost_binding=binding),
+            [4, 5, 5],
+        )
+
+
+class TestCostBinIndex:
+    """Tests for the `cost_bin_index` function. """
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "bin_edges",
+        [np.arange(0, 25.6, 0.1), np.linspace(-5, 300, 200), np.geomspace(1, 300, 100)],
+    )
+    def test_matches_searchsorted(bin_edges):
+        """Test evenly and unevenly spaced bins match `numpy.histogram` binning. """
+        rng = np.random.default_rng(2)
+        cost = np.concatenate([
+            rng.random(5000) * 320 - 10,
+            bin_edges,
+            [np.nan, np.inf, -np.inf],
+        ])
+        matrix = np.ones_like(cost)
+
+        expected, _ = np.histogram(cost[np.isfinite(cost)], bins=bin_edges)
+        bin_index = cost_utils.cost_bin_index(cost, bin_edges)
+        result = cost_utils.binned_sum(bin_index, matrix, n_bins=len(bin_edges) - 1)
+        np.testing.assert_array_equal(result, expected)
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "bin_edges",
+        [
+            np.array([0, 1, 2, 3, 5, 10, 15, 25, 35, 50, 100, 200, np.inf]) * 1.609344,
+            np.array([-np.inf, 0, 5, 5, 20]),
+            np.geomspace(1, 300, 32),
+        ],
+    )
+    def test_few_edges(bin_edges):
+        """Test comparing against a few edges matches searching them. """
+        rng = np.random.default_rng(3)
+        cost = np.concatenate([
+            rng.random(5000) * 320 - 10,
+            bin_edges,
+            [np.nan, np.inf, -np.inf],
+        ])
+        n_bins = len(bin_edges) - 1
+
+        expected = np.searchsorted(bin_edges, cost, side="right") - 1
+        expected[cost == bin_edges[-1]] = n_bins - 1
+        expected[expected < 0] = n_bins
+        np.testing.assert_array_equal(cost_utils.cost_bin_index(cost, bin_edges), expected)
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "bin_edges", [[0, 1, 5, 10, 25, 50], np.arange(0, 61, 0.5)],
+    )
+    def test_multiple_chunks(monkeypatch, bin_edges):
+        """Test matrices larger than a single chunk are binned correctly. """
+        monkeypatch.setattr(cost_utils, "_BIN_INDEX_CHUNK_SIZE", 1000)
+        rng = np.random.default_rng(3)
+        cost = rng.random((95, 95)) * 60
+        assert cost.size > 2 * cost_utils._BIN_INDEX_CHUNK_SIZE
+
+        expected, _ = np.histogram(cost, bins=bin_edges)
+        result = cost_utils.CostBinding.from_bin_edges(cost, bin_edges).count()
+        np.testing.assert_array_equal(result, expected)
+
+
+class TestIzInfillCosts:
+    """Tests for the `iz_infill_costs` function. """
+
+    COST = pd.DataFrame(
+        [[0, 4, 0], [6, 9, 3], [8, np.inf, 7]],
+        index=[1, 2, 3],
+        columns=[1, 2, 3],
+    )
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "min_axis, expected_diagonal", [(1, [2, 1.5, 4]), (0, [3, 2, 1.5])]
+    )
+    def test_infill(min_axis, expected_diagonal):
+        """Test the diagonal is infilled and other zeros and infs are left as 0. """
+        expected = TestIzInfillCosts.COST.copy().replace(np.inf, 0).astype(float)
+        np.fill_diagonal(expected.values, expected_diagonal)
+
+        result = cost_utils.iz_infill_costs(TestIzInfillCosts.COST, 0.5, min_axis=min_axis)
+        pd.testing.assert_frame_equal(result, expected)
+        assert TestIzInfillCosts.COST.iloc[0, 0] == 0
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+    Module containing tests for the furness module, tests
+    are setup to use pytest.
+"""
+
+##### IMPORTS #####
+# Standard imports
+
+# Third party imports
+import numpy as np
+import pytest
+
+# Local imports
+from normits_demand.distribution import furness
+
+
+##### FUNCTIONS #####
+def _problem(n_zones: int = 20, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    seed_vals = rng.random((n_zones, n_zones)) ** 4
+    row_targets = rng.random(n_zones) * 100 + 1
+    col_targets = rng.random(n_zones) * 100 + 1
+    col_targets *= row_targets.sum() / col_targets.sum()
+    return seed_vals, row_targets, col_targets
+
+
+##### CLASSES #####
+class TestDoublyConstrainedFurness:
+    """Tests for the `doubly_constrained_furness` function. """
+
+    def test_inplace(self):
+        """Test furnessing in place matches a copy and reuses the seed. """
+        seed_vals, row_targets, col_targets = _problem()
+        expected, exp_iters, exp_rmse = furness.doubly_constrained_furness(
+            seed_vals, row_targets, col_targets,
+        )
+        result, iters, rmse = furness.doubly_constrained_furness(
+            seed_vals, row_targets, col_targets, inplace=True,
+        )
+
+        assert result is seed_vals
+        assert (iters, rmse) == (exp_iters, exp_rmse)
+        np.testing.assert_array_equal(result, expected)
+
+    @pytest.mark.parametrize("inplace", [False, True])
+    def test_zero_targets(self, inplace):
+        """Test targets of 0 give 0's, in the seed when furnessing in place. """
+        seed_vals, row_targets, col_targets = _problem()
+        with pytest.warns(UserWarning):
+            result, *_ = furness.doubly_constrained_furness(
+                seed_vals, np.zeros_like(row_targets), col_targets, inplace=inplace,
+            )
+
+        assert (result is seed_vals) == inplace
+        np.testing.assert_array_equal(result, 0)
+
+    def test_nan_inplace(self):
+        """Test a NaN furness still returns the seed when furnessing in place. """
+        seed_vals, row_targets, col_targets = _problem()
+        seed_vals[0, 0] = np.nan
+        result, _, rmse = furness.doubly_constrained_furness(
+            seed_vals, row_targets, col_targets, inplace=True,
+        )
+
+        assert result is seed_vals
+        assert rmse == np.inf
+        np.testing.assert_array_equal(result, 0)
+
+
+class TestNewtonBalance:
+    """Tests for the `newton_balance` function. """
+
+    def test_matches_furness(self):
+        """Test the balanced matrix matches a converged furness. """
+        seed_vals, row_targets, col_targets = _problem()
+        expected, *_ = furness.doubly_constrained_furness(
+            seed_vals, row_targets, col_targets, tol=1e-12, max_iters=10000,
+        )
+        balanced, _, rmse = furness.newton_balance(
+            seed_vals, row_targets, col_targets, tol=1e-9,
+        )
+
+        assert rmse < 1e-9
+        np.testing.assert_allclose(balanced, expected, rtol=1e-6, atol=1e-9)
+
+    def test_zero_rows(self):
+        """Test rows with a target of 0 are zeroed in the output. """
+        seed_vals, row_targets, col_targets = _problem()
+        row_targets[3] = 0
+        col_targets *= row_targets.sum() / col_targets.sum()
+        balanced, _, rmse = furness.newton_balance(seed_vals, row_targets, col_targets)
+
+        assert rmse < 1e-9
+        np.testing.assert_array_equal(balanced[3], 0)
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "seed_vals, targets",
+        [
+            (np.zeros((3, 3)), np.ones(3)),
+            (np.array([[0, 0, 0], [0, 1, 1], [0, 1, 1.0]]), np.array([1, 1.5, 1.5])),
+        ],
+    )
+    def test_unreachable_targets(seed_vals, targets):
+        """Test targets of rows and cols with a seed of 0 count towards the rmse. """
+        _, _, expected_rmse = furness.doubly_constrained_furness(
+            seed_vals, targets, targets, warning=False,
+        )
+        balanced, _, rmse = furness.newton_balance(
+            seed_vals, targets, targets, warning=False,
+        )
+
+        assert rmse == pytest.approx(expected_rmse)
+        np.testing.assert_array_equal(balanced[0], 0)
+        np.testing.assert_array_equal(balanced[:, 0], 0)
+
+    def test_negative_seed(self):
+        """Test an error is raised for negative seed values. """
+        seed_vals, row_targets, col_targets = _problem()
+        seed_vals[0, 0] = -1
+        with pytest.raises(ValueError):
+            furness.newton_balance(seed_vals, row_targets, col_targets)
@@ -0,0 +1,375 @@
+# -*- coding: utf-8 -*-
+"""
+    Module containing tests for the gravity model module, tests
+    are setup to use pytest.
+"""
+
+##### IMPORTS #####
+# Standard imports
+
+# Third party imports
+import numpy as np
+import pandas as pd
+import pytest
+
+# Local imports
+from normits_demand.cost import cost_functions
+from normits_demand.cost import utils as cost_utils
+from normits_demand.distribution import furness
+from normits_demand.distribution import gravity_model
+from normits_demand.utils import math_utils
+
+
+##### FUNCTIONS #####
+def _problem(n_zones: int = 20, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    xy = rng.random((n_zones, 2)) * 100
+    costs = np.sqrt(((xy[:, np.newaxis, :] - xy[np.newaxis, :, :]) ** 2).sum(-1))
+    np.fill_diagonal(costs, 1)
+    row_targets = rng.random(n_zones) * 100 + 10
+    col_targets = rng.random(n_zones) * 100 + 10
+    col_targets *= row_targets.sum() / col_targets.sum()
+    return costs, row_targets, col_targets
+
+
+def _calibrator_kwargs(**kwargs):
+    """Build GravityModelCalibrator inputs for a known set of cost params. """
+    costs, row_targets, col_targets = _problem(n_zones=40)
+    cost_function = cost_functions.BuiltInCostFunction.LOG_NORMAL.get_cost_function()
+    seed = cost_function.calculate(costs, sigma=0.8, mu=3.0)
+    matrix, *_ = furness.doubly_constrained_furness(
+        seed, row_targets, col_targets, tol=1e-9, max_iters=2000
+    )
+
+    edges = [0, 5, 10, 20, 30, 50, 75, 100, 150]
+    target_cost_distribution = pd.DataFrame({"min": edges[:-1], "max": edges[1:]})
+    target_cost_distribution["trips"] = cost_utils.cost_distribution(
+        matrix, costs, bin_edges=edges
+    )
+    target_cost_distribution["ave_km"] = cost_utils.calculate_average_cost_in_bounds(
+        target_cost_distribution["min"].values,
+        target_cost_distribution["max"].values,
+        costs,
+        matrix,
+    )
+
+    calibrator_kwargs = dict(
+        row_targets=row_targets,
+        col_targets=col_targets,
+        cost_function=cost_function,
+        cost_matrix=costs,
+        target_cost_distribution=target_cost_distribution,
+        target_convergence=0.95,
+        furness_max_iters=2000,
+        furness_tol=1e-6,
+        running_log_path=None,
+    )
+    calibrator_kwargs.update(kwargs)
+    return calibrator_kwargs
+
+
+##### CLASSES #####
+class TestGravityModel:
+    """Tests for the `gravity_model` function. """
+
+    COST_FUNCTION = cost_functions.BuiltInCostFunction.LOG_NORMAL.get_cost_function()
+    PARAMS = {"sigma": 0.8, "mu": 3.0}
+
+    def test_meets_targets(self):
+        """Test the distributed matrix sums to the row and col targets. """
+        costs, row_targets, col_targets = _problem()
+        matrix, _, rmse = gravity_model.gravity_model(
+            row_targets=row_targets,
+            col_targets=col_targets,
+            cost_function=self.COST_FUNCTION,
+            costs=costs,
+            furness_max_iters=2000,
+            furness_tol=1e-9,
+            **self.PARAMS,
+        )
+
+        assert rmse < 1e-9
+        np.testing.assert_allclose(matrix.sum(axis=1), row_targets)
+        np.testing.assert_allclose(matrix.sum(axis=0), col_targets)
+
+    def test_out(self):
+        """Test the distributed matrix is calculated in a given array. """
+        costs, row_targets, col_targets = _problem()
+        kwargs = dict(
+            row_targets=row_targets,
+            col_targets=col_targets,
+            cost_function=self.COST_FUNCTION,
+            costs=costs,
+            furness_max_iters=2000,
+            furness_tol=1e-9,
+            **self.PARAMS,
+        )
+        expected, *_ = gravity_model.gravity_model(**kwargs)
+        out = np.empty_like(costs)
+        matrix, *_ = gravity_model.gravity_model(out=out, **kwargs)
+
+        assert matrix is out
+        np.testing.assert_array_equal(matrix, expected)
+
+    def test_out_zero_targets(self):
+        """Test targets of 0 still fill, and return, a given array. """
+        costs, row_targets, col_targets = _problem()
+        out = np.full(costs.shape, np.nan, dtype=np.float32)
+        with pytest.warns(UserWarning):
+            matrix, *_ = gravity_model.gravity_model(
+                row_targets=np.zeros_like(row_targets),
+                col_targets=np.zeros_like(col_targets),
+                cost_function=self.COST_FUNCTION,
+                costs=costs,
+                furness_max_iters=2000,
+                furness_tol=1e-9,
+                out=out,
+                dtype=np.float32,
+                **self.PARAMS,
+            )
+
+        assert matrix is out
+        assert matrix.dtype == np.float32
+        np.testing.assert_array_equal(matrix, 0)
+
+    def test_float32(self):
+        """Test a float32 distribution is close to the float64 one. """
+        costs, row_targets, col_targets = _problem()
+        kwargs = dict(
+            row_targets=row_targets,
+            col_targets=col_targets,
+            cost_function=self.COST_FUNCTION,
+            costs=costs,
+            furness_max_iters=2000,
+            furness_tol=1e-4,
+            **self.PARAMS,
+        )
+        expected, *_ = gravity_model.gravity_model(**kwargs)
+        matrix, *_ = gravity_model.gravity_model(dtype=np.float32, **kwargs)
+
+        assert matrix.dtype == np.float32
+        np.testing.assert_allclose(matrix, expected, rtol=1e-4, atol=1e-6)
+
+    def test_symmetric_costs(self):
+        """Test symmetric costs give the same result as the full calculation. """
+        costs, row_targets, col_targets = _problem()
+        kwargs = dict(
+            row_targets=row_targets,
+            col_targets=col_targets,
+            cost_function=self.COST_FUNCTION,
+            costs=costs,
+            furness_max_iters=2000,
+            furness_tol=1e-9,
+            **self.PARAMS,
+        )
+        expected, *_ = gravity_model.gravity_model(**kwargs)
+        matrix, *_ = gravity_model.gravity_model(symmetric_costs=True, **kwargs)
+        np.testing.assert_array_equal(matrix, expected)
+
+    @pytest.mark.parametrize(
+        "cost_params", [{"sigma": 0.8}, {"sigma": 0.8, "mu": 3.0, "beta": 1}],
+    )
+    def test_invalid_params(self, cost_params):
+        """Test an error is raised for missing or extra cost params. """
+        costs, row_targets, col_targets = _problem()
+        with pytest.raises(TypeError):
+            gravity_model.gravity_model(
+                row_targets=row_targets,
+                col_targets=col_targets,
+                cost_function=self.COST_FUNCTION,
+                costs=costs,
+                furness_max_iters=2000,
+                furness_tol=1e-9,
+                **cost_params,
+            )
+
+
+class TestGravityModelWithFactors:
+    """Tests for the `gravity_model_with_factors` function. """
+
+    COST_FUNCTION = cost_functions.BuiltInCostFunction.LOG_NORMAL.get_cost_function()
+
+    def test_warm_start(self):
+        """Test warm starting from nearby params needs fewer iterations. """
+        costs, row_targets, col_targets = _problem()
+        kwargs = dict(
+            row_targets=row_targets,
+            col_targets=col_targets,
+            cost_function=self.COST_FUNCTION,
+            costs=costs,
+            furness_max_iters=2000,
+            furness_tol=1e-9,
+        )
+        *_, row_factors, col_factors = gravity_model.gravity_model_with_factors(
+            sigma=0.8, mu=3.0, **kwargs,
+        )
+        expected, cold_iters, _ = gravity_model.gravity_model(sigma=0.81, mu=3.0, **kwargs)
+        matrix, warm_iters, rmse, *_ = gravity_model.gravity_model_with_factors(
+            sigma=0.81,
+            mu=3.0,
+            init_row_factors=row_factors,
+            init_col_factors=col_factors,
+            **kwargs,
+        )
+
+        assert rmse < 1e-9
+        assert warm_iters < cold_iters
+        np.testing.assert_allclose(matrix, expected, rtol=1e-6)
+
+
+class TestGravityModelBatch:
+    """Tests for the `gravity_model_batch` function. """
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "built_in, params_list",
+        [
+            (
+                cost_functions.BuiltInCostFunction.LOG_NORMAL,
+                [{"sigma": 0.8, "mu": 3.0}, {"sigma": 1.2, "mu": 2.5}],
+            ),
+            (
+                cost_functions.BuiltInCostFunction.TANNER,
+                [{"alpha": 1, "beta": -0.5}, {"alpha": -1.5, "beta": -0.1}],
+            ),
+        ],
+    )
+    def test_matches_gravity_model(built_in, params_list):
+        """Test batch results are identical to individual gravity models. """
+        costs, row_targets, col_targets = _problem()
+        kwargs = dict(
+            row_targets=row_targets,
+            col_targets=col_targets,
+            cost_function=built_in.get_cost_function(),
+            costs=costs,
+            furness_max_iters=2000,
+            furness_tol=1e-9,
+        )
+        results = gravity_model.gravity_model_batch(cost_params_list=params_list, **kwargs)
+
+        assert len(results) == len(params_list)
+        for params, (matrix, iters, rmse) in zip(params_list, results):
+            expected, exp_iters, exp_rmse = gravity_model.gravity_model(**kwargs, **params)
+            assert (iters, rmse) == (exp_iters, exp_rmse)
+            np.testing.assert_array_equal(matrix, expected)
+
+    def test_invalid_params(self):
+        """Test an error is raised if any set of cost params is invalid. """
+        costs, row_targets, col_targets = _problem()
+        with pytest.raises(TypeError):
+            gravity_model.gravity_model_batch(
+                row_targets=row_targets,
+                col_targets=col_targets,
+                cost_function=cost_functions.BuiltInCostFunction.LOG_NORMAL.get_cost_function(),
+                costs=costs,
+                furness_max_iters=2000,
+                furness_tol=1e-9,
+                cost_params_list=[{"sigma": 0.8, "mu": 3.0}, {"sigma": 0.8}],
+            )
+
+
+class TestGravityModelSeedChecks:
+    """Tests for the seed matrix checks in `gravity_model`. """
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "built_in, cost_params, cost_factor",
+        [
+            (cost_functions.BuiltInCostFunction.TANNER, {"alpha": 5, "beta": 5}, 10),
+            (cost_functions.BuiltInCostFunction.LOG_NORMAL, {"sigma": np.nan, "mu": 3.0}, 1),
+        ],
+    )
+    def test_bad_seed(built_in, cost_params, cost_factor):
+        """Test an error is raised before furnessing a non-finite seed. """
+        costs, row_targets, col_targets = _problem()
+        with pytest.raises(ValueError):
+            gravity_model.gravity_model(
+                row_targets=row_targets,
+                col_targets=col_targets,
+                cost_function=built_in.get_cost_function(),
+                costs=costs * cost_factor,
+                furness_max_iters=2000,
+                furness_tol=1e-9,
+                **cost_params,
+            )
+
+
+class TestGravityModelInputs:
+    """Tests for the input conversion in `gravity_model`. """
+
+    def test_non_contiguous(self):
+        """Test non-contiguous inputs give the same results as contiguous. """
+        costs, row_targets, col_targets = _problem()
+        kwargs = dict(
+            cost_function=cost_functions.BuiltInCostFunction.LOG_NORMAL.get_cost_function(),
+            furness_max_iters=2000,
+            furness_tol=1e-9,
+            sigma=0.8,
+            mu=3.0,
+        )
+        expected, *_ = gravity_model.gravity_model(
+            row_targets=row_targets, col_targets=col_targets, costs=costs, **kwargs
+        )
+
+        # Strided views of larger arrays holding the same values
+        wide_costs = np.zeros((costs.shape[0], costs.shape[1] * 2))
+        wide_costs[:, ::2] = costs
+        wide_targets = np.zeros((2, len(row_targets) * 2))
+        wide_targets[0, ::2] = row_targets
+        wide_targets[1, ::2] = col_targets
+        matrix, *_ = gravity_model.gravity_model(
+            row_targets=wide_targets[0, ::2],
+            col_targets=wide_targets[1, ::2],
+            costs=wide_costs[:, ::2],
+            **kwargs,
+        )
+        np.testing.assert_array_equal(matrix, expected)
+
+
+class TestGravityModelCalibrator:
+    """Tests for the `GravityModelCalibrator` class. """
+
+    INIT_PARAMS = {"sigma": 1, "mu": 2}
+
+    def test_newton_balance(self):
+        """Test calibrating with newton balancing meets the targets. """
+        kwargs = _calibrator_kwargs(balance_method="newton")
+        calibrator = gravity_model.GravityModelCalibrator(**kwargs)
+        calibrator.calibrate(self.INIT_PARAMS)
+
+        matrix = calibrator.achieved_distribution
+        assert calibrator.achieved_convergence >= calibrator.target_convergence
+        np.testing.assert_allclose(matrix.sum(axis=1), kwargs["row_targets"], rtol=1e-4)
+        np.testing.assert_allclose(matrix.sum(axis=0), kwargs["col_targets"], rtol=1e-4)
+
+    def test_stop_convergence(self):
+        """Test calibration stops early once the target convergence is met. """
+        kwargs = _calibrator_kwargs(use_perceived_factors=False)
+        full = gravity_model.GravityModelCalibrator(**kwargs)
+        full._calibrate(self.INIT_PARAMS)
+        calibrator = gravity_model.GravityModelCalibrator(**kwargs)
+        optimal_params = calibrator.calibrate(self.INIT_PARAMS)
+
+        assert calibrator._loop_num < full._loop_num
+        assert calibrator.achieved_convergence >= calibrator.target_convergence
+
+        # Achieved values must come from a run of the optimal params
+        matrix, *_ = gravity_model.gravity_model(
+            row_targets=kwargs["row_targets"],
+            col_targets=kwargs["col_targets"],
+            cost_function=kwargs["cost_function"],
+            costs=kwargs["cost_matrix"],
+            furness_max_iters=kwargs["furness_max_iters"],
+            furness_tol=kwargs["furness_tol"],
+            **optimal_params,
+        )
+        np.testing.assert_allclose(calibrator.achieved_distribution, matrix, rtol=1e-5)
+        assert calibrator.achieved_convergence == math_utils.curve_convergence(
+            calibrator.target_band_share,
+            calibrator._cost_distribution(calibrator.achieved_distribution),
+        )
+
+    def test_invalid_balance_method(self):
+        """Test an error is raised for an unknown balance_method. """
+        with pytest.raises(ValueError):
+            gravity_model.GravityModelCalibrator(**_calibrator_kwargs(balance_method="bad"))
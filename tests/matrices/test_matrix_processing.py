@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+    Module containing tests for the matrix processing module, tests
+    are setup to use pytest.
+"""
+
+##### IMPORTS #####
+# Standard imports
+from pathlib import Path
+
+# Third party imports
+import numpy as np
+import pandas as pd
+
+# Local imports
+from normits_demand.matrices import matrix_processing
+
+
+##### CLASSES #####
+class TestRecombineInternalExternal:
+    """Tests for combining partial matrices from file. """
+
+    @staticmethod
+    def _write(path: Path, values: np.ndarray) -> Path:
+        zones = list(range(1, len(values) + 1))
+        pd.DataFrame(values, index=zones, columns=zones).to_csv(path)
+        return path
+
+    def test_sums_all_matrices(self, tmp_path: Path):
+        """Test every input matrix is added into the output. """
+        mats = [np.arange(9.0).reshape(3, 3) * (i + 1) for i in range(3)]
+        in_paths = [self._write(tmp_path / f"in_{i}.csv", m) for i, m in enumerate(mats)]
+
+        matrix_processing._recombine_internal_external_internal(
+            in_paths=in_paths,
+            output_path=tmp_path / "out.csv",
+            output_suffix=".csv",
+        )
+
+        result = pd.read_csv(tmp_path / "out.csv", index_col=0)
+        np.testing.assert_array_equal(result.to_numpy(), sum(mats))
+        assert list(result.index) == [1, 2, 3]
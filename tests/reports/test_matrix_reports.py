@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+    Module containing tests for the matrix reports module, tests
+    are setup to use pytest.
+"""
+
+##### IMPORTS #####
+# Standard imports
+from pathlib import Path
+
+# Third party imports
+import numpy as np
+import pandas as pd
+import pytest
+
+# Local imports
+import normits_demand as nd
+from normits_demand.reports import matrix_reports
+from normits_demand.concurrency import multithreading
+
+
+##### CLASSES #####
+class TestIterateSegmentMatrices:
+    """Tests for reading the segment matrices ahead of use. """
+
+    TEMPLATE = "pa_{segment_params}.csv"
+
+    @pytest.fixture(name="segmentation")
+    def fixture_segmentation(self):
+        """Segmentation to write the matrices for. """
+        return nd.get_segmentation_level("hb_p_m")
+
+    def test_segment_order(self, tmp_path: Path, segmentation):
+        """Test each segment's matrix is returned, in segmentation order. """
+        zones = [1, 2, 3]
+        for i, segment_params in enumerate(segmentation):
+            fname = segmentation.generate_file_name_from_template(
+                template=self.TEMPLATE, segment_params=segment_params,
+            )
+            matrix = pd.DataFrame(np.full((3, 3), i), index=zones, columns=zones)
+            matrix.to_csv(tmp_path / fname)
+
+        results = list(matrix_reports._iterate_segment_matrices(
+            matrix_dir=tmp_path,
+            matrix_segmentation=segmentation,
+            matrix_fname_template=self.TEMPLATE,
+        ))
+
+        assert [x[0] for x in results] == list(segmentation)
+        for i, (segment_params, fname, matrix) in enumerate(results):
+            assert fname == segmentation.generate_file_name_from_template(
+                template=self.TEMPLATE, segment_params=segment_params,
+            )
+            assert (matrix.to_numpy() == i).all()
+            assert list(matrix.columns) == zones
+
+    def test_missing_file(self, tmp_path: Path, segmentation):
+        """Test read errors are raised in the calling thread. """
+        with pytest.raises(multithreading.MultithreadingError):
+            list(matrix_reports._iterate_segment_matrices(
+                matrix_dir=tmp_path,
+                matrix_segmentation=segmentation,
+                matrix_fname_template=self.TEMPLATE,
+            ))
+
+
+class TestMatrixSectorSummary:
+    """Tests for the `matrix_sector_summary` function. """
+
+    @pytest.fixture(name="zoning_system", scope="class")
+    def fixture_zoning_system(self):
+        """Zoning system of the matrix to summarise. """
+        return nd.get_zoning_system("lad_2020")
+
+    @pytest.fixture(name="matrix", scope="class")
+    def fixture_matrix(self, zoning_system):
+        """Random matrix, only in zones that fully translate into sectors. """
+        sector_translation = zoning_system.translate(nd.get_zoning_system("ca_sector_2020"))
+        keep = np.isclose(sector_translation.sum(axis=1), 1)
+        zones = zoning_system.unique_zones
+        values = np.random.default_rng(42).random((len(zones), len(zones)))
+        return pd.DataFrame(values * np.outer(keep, keep), index=zones, columns=zones)
+
+    def test_totals(self, matrix, zoning_system):
+        """Test sector totals and intrazonals match the matrix. """
+        sector_matrix, long_sector_matrix, sector_intra = matrix_reports.matrix_sector_summary(
+            matrix=matrix.copy(),
+            segment_params={"p": 1, "m": 3},
+            matrix_zoning_system=zoning_system,
+        )
+        np.testing.assert_allclose(sector_matrix.to_numpy().sum(), matrix.to_numpy().sum())
+        np.testing.assert_allclose(long_sector_matrix["val"].sum(), matrix.to_numpy().sum())
+        np.testing.assert_allclose(sector_intra["val"].sum(), np.trace(matrix.to_numpy()))
+        assert list(sector_intra.columns) == ["sector_row", "p", "m", "val"]
+
+    def test_unknown_zones(self, matrix, zoning_system):
+        """Test a warning is given for zones outside of the zoning system. """
+        matrix = matrix.rename(index={matrix.index[0]: -1}, columns={matrix.columns[0]: -1})
+        with pytest.warns(UserWarning, match="dropped"):
+            matrix_reports.matrix_sector_summary(
+                matrix=matrix,
+                segment_params={"p": 1, "m": 3},
+                matrix_zoning_system=zoning_system,
+            )
+
+    def test_given_translation(self, matrix, zoning_system):
+        """Test passing in the translation gives the same summaries. """
+        kwargs = {
+            "segment_params": {"p": 1, "m": 3},
+            "matrix_zoning_system": zoning_system,
+        }
+        sector_translation = zoning_system.translate(nd.get_zoning_system("ca_sector_2020"))
+        expected = matrix_reports.matrix_sector_summary(matrix=matrix.copy(), **kwargs)
+        results = matrix_reports.matrix_sector_summary(
+            matrix=matrix.copy(), sector_translation=sector_translation, **kwargs
+        )
+        for result, exp in zip(results, expected):
+            pd.testing.assert_frame_equal(result, exp)
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+    Module containing tests for the file_ops module, tests
+    are setup to use pytest.
+"""
+
+##### IMPORTS #####
+# Standard imports
+import os
+from pathlib import Path
+
+# Third party imports
+import pytest
+
+# Local imports
+from normits_demand.utils import file_ops
+
+
+##### FUNCTIONS #####
+def _touch(path: Path, mtime: float) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("")
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+##### CLASSES #####
+class TestIsOldCache:
+    """Tests for the `is_old_cache` function. """
+
+    @staticmethod
+    def _files(tmp_path: Path, original_mtime: float, cache_mtime: float):
+        original = [_touch(tmp_path / "in" / f"{i}.csv", original_mtime + i) for i in range(3)]
+        cache = [_touch(tmp_path / "out" / f"{i}.csv", cache_mtime + i) for i in range(3)]
+        return original, cache
+
+    def test_old_cache(self, tmp_path: Path):
+        """Test a cache older than the originals is old. """
+        original, cache = self._files(tmp_path, original_mtime=2000, cache_mtime=1000)
+        assert file_ops.is_old_cache(original=original, cache=cache)
+
+    def test_new_cache(self, tmp_path: Path):
+        """Test a cache newer than the originals is not old. """
+        original, cache = self._files(tmp_path, original_mtime=1000, cache_mtime=2000)
+        assert not file_ops.is_old_cache(original=original, cache=cache)
+
+    def test_directories(self, tmp_path: Path):
+        """Test directories are checked using all the files in them. """
+        self._files(tmp_path, original_mtime=1000, cache_mtime=2000)
+        _touch(tmp_path / "in" / "new.csv", 5000)
+        assert file_ops.is_old_cache(original=tmp_path / "in", cache=tmp_path / "out")
+        assert file_ops.is_old_cache(original=[tmp_path / "in"], cache=[tmp_path / "out"])
+        assert not file_ops.is_old_cache(original=tmp_path / "in" / "0.csv", cache=tmp_path / "out")
+
+    def test_missing_cache(self, tmp_path: Path):
+        """Test missing cache files are ignored, and no cache is old. """
+        original, cache = self._files(tmp_path, original_mtime=1000, cache_mtime=2000)
+        assert not file_ops.is_old_cache(original=original, cache=cache + [tmp_path / "x.csv"])
+        assert file_ops.is_old_cache(original=original, cache=[tmp_path / "x.csv"])
+
+    def test_missing_original(self, tmp_path: Path):
+        """Test an error is raised for missing original files. """
+        original, cache = self._files(tmp_path, original_mtime=1000, cache_mtime=2000)
+        with pytest.raises(FileNotFoundError):
+            file_ops.is_old_cache(original=original + [tmp_path / "x.csv"], cache=cache)
+
+
+class TestCopyFiles:
+    """Tests for the `copy_files` function. """
+
+    @staticmethod
+    def _files(tmp_path: Path):
+        filenames = [f"{i}.csv" for i in range(3)]
+        for i, fname in enumerate(filenames):
+            _touch(tmp_path / "src" / fname, 1000).write_text(f"file {i}")
+        (tmp_path / "dst").mkdir()
+        return filenames
+
+    @pytest.mark.parametrize("hardlink", [False, True])
+    def test_copies(self, tmp_path: Path, hardlink: bool):
+        """Test files are copied, or linked, with the same contents. """
+        filenames = self._files(tmp_path)
+        file_ops.copy_files(
+            src_dir=tmp_path / "src",
+            dst_dir=tmp_path / "dst",
+            filenames=filenames,
+            process_count=0,
+            hardlink=hardlink,
+        )
+
+        for i, fname in enumerate(filenames):
+            src, dst = tmp_path / "src" / fname, tmp_path / "dst" / fname
+            assert dst.read_text() == f"file {i}"
+            assert os.path.samefile(src, dst) == hardlink
+
+    def test_hardlink_replaces(self, tmp_path: Path):
+        """Test linking replaces any existing files. """
+        filenames = self._files(tmp_path)
+        (tmp_path / "dst" / filenames[0]).write_text("old")
+        file_ops.copy_files(
+            src_dir=tmp_path / "src",
+            dst_dir=tmp_path / "dst",
+            filenames=filenames,
+            process_count=0,
+            hardlink=True,
+        )
+        assert (tmp_path / "dst" / filenames[0]).read_text() == "file 0"
+
+    @pytest.mark.parametrize("relink", [False, True])
+    def test_hardlink_same_file(self, tmp_path: Path, relink: bool):
+        """Test linking a file to itself, or to an existing link, keeps it. """
+        filenames = self._files(tmp_path)
+        dst_dir = tmp_path / ("dst" if relink else "src")
+        for _ in range(1 + relink):
+            file_ops.copy_files(
+                src_dir=tmp_path / "src",
+                dst_dir=dst_dir,
+                filenames=filenames,
+                process_count=0,
+                hardlink=True,
+            )
+
+        for i, fname in enumerate(filenames):
+            assert (tmp_path / "src" / fname).read_text() == f"file {i}"
+            assert os.path.samefile(tmp_path / "src" / fname, dst_dir / fname)
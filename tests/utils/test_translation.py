@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+    Module containing tests for the translation module, tests
+    are setup to use pytest.
+"""
+
+##### IMPORTS #####
+# Standard imports
+
+# Third party imports
+import numpy as np
+import pandas as pd
+import pytest
+
+# Local imports
+from normits_demand.utils import translation
+
+
+##### CLASSES #####
+class TestNumpyMatrixZoneTranslation:
+    """Tests for the `numpy_matrix_zone_translation` function. """
+
+    MATRIX = np.array([[1.0, 2, 3], [4, 5, 6], [7, 8, 9]])
+    # Zone 1 -> A, zone 2 split between A and B, zone 3 -> B
+    TRANSLATION = np.array([[1.0, 0], [0.25, 0.75], [0, 1]])
+
+    def test_known_values(self):
+        """Test a split zone translation against hand calculated values. """
+        result = translation.numpy_matrix_zone_translation(
+            self.MATRIX, translation=self.TRANSLATION, check_totals=True,
+        )
+        expected = np.array([[2.8125, 6.9375], [12.9375, 22.3125]])
+        np.testing.assert_allclose(result, expected)
+
+    def test_matches_dense(self):
+        """Test results match the dense matrix product. """
+        rng = np.random.default_rng(42)
+        matrix = rng.random((20, 20))
+        row_translation = rng.random((20, 6)) * (rng.random((20, 6)) < 0.3)
+        col_translation = rng.random((20, 6)) * (rng.random((20, 6)) < 0.3)
+        result = translation.numpy_matrix_zone_translation(
+            matrix, row_translation=row_translation, col_translation=col_translation,
+        )
+        np.testing.assert_allclose(result, row_translation.T @ matrix @ col_translation)
+
+
+class TestWarnUnmatchedMatrixZones:
+    """Tests for the `warn_unmatched_matrix_zones` function. """
+
+    def test_matching(self, recwarn):
+        """Test nothing is raised when all the zones match. """
+        matrix = pd.DataFrame(np.ones((3, 3)), index=[1, 2, 3], columns=[1, 2, 3])
+        translation.warn_unmatched_matrix_zones(matrix, [1, 2, 3])
+        assert len(recwarn) == 0
+
+    @pytest.mark.parametrize(
+        "unique_zones, match", [([1, 2], "dropped"), ([1, 2, 3, 4], "infilled")],
+    )
+    def test_unmatched(self, unique_zones, match):
+        """Test additional and missing zones are warned about. """
+        matrix = pd.DataFrame(np.ones((3, 3)), index=[1, 2, 3], columns=[1, 2, 3])
+        with pytest.warns(UserWarning, match=match):
+            translation.warn_unmatched_matrix_zones(matrix, unique_zones)